@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
 from api.services import generator
 from api.services.generation_status import get_status
 from api.services.actions import move_player, trigger_character_activation_condition
@@ -8,6 +9,7 @@ from api.schemas.requests import GenerationRequest, ActionRequest, ActionType, C
 from api.schemas.responses import ActionResponse, FollowUpAction, FollowUpActionType
 from fastapi.responses import StreamingResponse
 from api.services.narrative_streamer import generate_narrative_stream
+from api.utils.encoding import encode_response, encode_stream
 router = APIRouter()
 
 @router.post("/generate", response_model=GenerationStatusModel)
@@ -22,26 +24,47 @@ def generation_status():
     return generator.get_generation_status()
 
 @router.get("/state/full")
-def get_full_state():
+def get_full_state(request: Request):
+    # Reads are served from committed snapshots, so they are allowed while generating.
+    # JSON or msgpack (Accept), optionally zstd/gzip compressed (Accept-Encoding).
     status = get_status().status
 
-    if status == "running":
-        raise HTTPException(status_code=409, detail="Game state is still being generated")
     if status == "error":
         raise HTTPException(status_code=500, detail="Generation failed. No valid game state available")
     
-    return game_state.get_full_game_state()
+    return encode_response(request, game_state.get_full_game_state())
+
+@router.get("/state/full/stream")
+def stream_full_state(
+    request: Request,
+    page_size: int = Query(500, ge=1, le=10_000, description="Maximum number of entities per chunk"),
+    checkpoint_id: Optional[str] = Query(None, description="Checkpoint of an interrupted download to resume"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last chunk received"),
+):
+    """
+    The full state as a stream of chunks (map, characters, events), all of the same
+    snapshot version. An interrupted download resumes with checkpoint_id + cursor.
+    """
+    status = get_status().status
+
+    if status == "error":
+        raise HTTPException(status_code=500, detail="Generation failed. No valid game state available")
+
+    return encode_stream(request, game_state.stream_full_game_state(page_size, checkpoint_id, cursor))
 
 @router.get("/state/changes")
-def get_incremental_changes(from_checkpoint: str = Query(..., description="ID of the checkpoint to diff from")):
+def get_incremental_changes(request: Request, from_checkpoint: str = Query(..., description="ID of the checkpoint to diff from")):
     status = get_status().status
 
-    if status == "running":
-        raise HTTPException(status_code=409, detail="Game state is still being generated")
     if status == "error":
         raise HTTPException(status_code=500, detail="Generation failed. No valid game state available")
     
-    return game_state.get_incremental_changes(from_checkpoint)
+    return encode_response(request, game_state.get_incremental_changes(from_checkpoint))
+
+@router.get("/state/checkpoints/stats")
+def get_checkpoint_stats():
+    """Monitoring: number, estimated memory and evictions of the stored checkpoints."""
+    return game_state.get_checkpoint_stats()
 
 @router.post("/action", response_model=ActionResponse)
 def perform_game_action(action_request: ActionRequest):
@@ -113,5 +136,5 @@ def post_player_choice(event_id: str, payload: ChoiceRequest):
     if not isinstance(event, PlayerNPCConversationEvent):
         raise HTTPException(422, "Este evento no admite elecciones de jugador.")
 
-    event.set_player_choice(payload.choice_label)
+    state.events.set_player_choice(event.id, payload.choice_label)
     return {"status": "choice accepted"}
\ No newline at end of file
@@ -9,18 +9,24 @@ from versioning.deltas.detectors.changeset.map.entity import ScenarioDetector
 from core_game.map.schemas import GameMapModel
 from core_game.character.schemas import CharactersModel
 from core_game.game_event.schemas import GameEventsManagerModel
+from versioning.deltas.exceptions import CheckpointExpiredError
+from versioning.deltas.manager import FULL_CHANGESET_SECTIONS
 from fastapi import HTTPException
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 def get_full_game_state():
     cp_manager = SimulatedGameStateSingleton.get_checkpoint_manager()
 
     empty_cp = cp_manager.create_empty_checkpoint(ChangesetCheckpoint)
 
-    changeset = cp_manager.generate_changeset(from_id=empty_cp)
+    # Read a pinned committed version: never observes in-flight generation layers.
+    with SimulatedGameStateSingleton.get_snapshot_store().pinned() as snapshot:
+        changeset = cp_manager.generate_changeset(from_id=empty_cp, state=snapshot)
 
-    current_cp_id = cp_manager.create_checkpoint(
-        ChangesetCheckpoint,
-    )
+        current_cp_id = cp_manager.create_checkpoint(
+            ChangesetCheckpoint,
+            state=snapshot,
+        )
 
     cp_manager.delete_checkpoint(empty_cp)
 
@@ -30,30 +36,108 @@ def get_full_game_state():
     }
 
 
+def _parse_cursor(cursor: Optional[str]) -> Tuple[Optional[str], int]:
+    if cursor is None:
+        return None, 0
+    section, _, offset = cursor.partition(":")
+    if section not in FULL_CHANGESET_SECTIONS or not offset.isdigit():
+        raise HTTPException(status_code=400, detail=f"Invalid cursor '{cursor}'")
+    return section, int(offset)
+
+
+def stream_full_game_state(
+    page_size: int,
+    checkpoint_id: Optional[str] = None,
+    cursor: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Same content as get_full_game_state, as a sequence of chunks of at most
+    `page_size` entities (map, then characters, then events).
+
+    Without `checkpoint_id` a checkpoint of the current committed snapshot is taken
+    (and handed to the client as in get_full_game_state). With it, the download of
+    that checkpoint resumes at `cursor`, the `next_cursor` of the last chunk received.
+    The last chunk has `done` set.
+    """
+    section, offset = _parse_cursor(cursor)
+    cp_manager = SimulatedGameStateSingleton.get_checkpoint_manager()
+
+    if checkpoint_id is None:
+        with SimulatedGameStateSingleton.get_snapshot_store().pinned() as snapshot:
+            checkpoint_id = cp_manager.create_checkpoint(ChangesetCheckpoint, state=snapshot)
+
+    # Resolved before the first chunk is sent, so errors are still plain HTTP errors.
+    try:
+        checkpoint = cp_manager.get_checkpoint(checkpoint_id)
+    except CheckpointExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except RuntimeError:
+        raise HTTPException(status_code=404, detail=f"Checkpoint '{checkpoint_id}' not found")
+    if not isinstance(checkpoint, ChangesetCheckpoint):
+        raise HTTPException(status_code=400, detail=f"Checkpoint '{checkpoint_id}' is not a changeset checkpoint")
+
+    pages = cp_manager.iter_full_changeset(checkpoint_id, page_size, section=section, offset=offset)
+    snapshot_version = checkpoint.snapshot_version
+
+    def chunks() -> Iterator[Dict[str, Any]]:
+        for page_section, page_offset, count, changes in pages:
+            yield {
+                "checkpoint_id": checkpoint_id,
+                "snapshot_version": snapshot_version,
+                "section": page_section,
+                "offset": page_offset,
+                "next_cursor": f"{page_section}:{page_offset + count}",
+                "done": False,
+                "changes": changes,
+            }
+        yield {
+            "checkpoint_id": checkpoint_id,
+            "snapshot_version": snapshot_version,
+            "done": True,
+        }
+
+    return chunks()
+
+
 def get_incremental_changes(from_checkpoint_id: str):
     cp_manager = SimulatedGameStateSingleton.get_checkpoint_manager()
     
     try:
         from_cp=cp_manager.get_checkpoint(from_checkpoint_id)
+    except CheckpointExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
     except RuntimeError:
         raise HTTPException(
             status_code=404,
             detail=f"Checkpoint '{from_checkpoint_id}' not found"
         )
     
-    try:
-        changeset = cp_manager.generate_changeset(from_id=from_checkpoint_id)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate changeset: {str(e)}"
-        )
-    
-    new_checkpoint_id = cp_manager.create_checkpoint(ChangesetCheckpoint)
+    with SimulatedGameStateSingleton.get_snapshot_store().pinned() as snapshot:
+        try:
+            changeset = cp_manager.generate_changeset(from_id=from_checkpoint_id, state=snapshot)
+        except CheckpointExpiredError as e:
+            raise HTTPException(status_code=410, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to generate changeset: {str(e)}"
+            )
+        
+        new_checkpoint_id = cp_manager.create_checkpoint(ChangesetCheckpoint, state=snapshot)
 
-    cp_manager.delete_checkpoint(from_checkpoint_id)
+    # Releases only this client's handle; a concurrent request with the same one may have released it already.
+    try:
+        cp_manager.delete_checkpoint(from_checkpoint_id)
+    except CheckpointExpiredError:
+        pass  # Already evicted to make room for the new checkpoint.
+    except RuntimeError:
+        pass  # Already released.
 
     return {
         "checkpoint_id": new_checkpoint_id,
         "changes": changeset.get("changes") if changeset else {}
-    }
\ No newline at end of file
+    }
+
+
+def get_checkpoint_stats():
+    return SimulatedGameStateSingleton.get_checkpoint_manager().get_store_stats()
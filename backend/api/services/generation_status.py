@@ -1,32 +1,47 @@
-from typing import Literal
+from typing import Literal, Dict
 from api.schemas.status import GenerationStatusModel
+from core_game.session_context import get_current_session_id
+from simulated.world_registry import WorldRegistry
 
-# Dict for internal state
-_current_status: dict = {
+_IDLE_STATUS = {
     "status": "idle",
     "progress": 0.0,
     "message": "Waiting to start generation...",
     "detail": "You can poll /generate/status to track progress"
 }
 
+# Internal state, one dict per session (removed with the session's world)
+_statuses: Dict[str, dict] = {}
+WorldRegistry.add_drop_listener(lambda session_id: _statuses.pop(session_id, None))
+
+def _current_status() -> dict:
+    # Statuses only exist for sessions with a world, so evicting the world frees them.
+    WorldRegistry.get_world()
+    return _statuses.setdefault(get_current_session_id(), dict(_IDLE_STATUS))
+
 def update_global_progress(global_progress: float, message: str = ""):
-    _current_status["progress"] = global_progress
-    _current_status["message"] = message
+    status = _current_status()
+    status["progress"] = global_progress
+    status["message"] = message
 
 def set_done():
-    _current_status["status"] = "done"
-    _current_status["progress"] = 1.0
-    _current_status["message"] = "Generation completed"
+    status = _current_status()
+    status["status"] = "done"
+    status["progress"] = 1.0
+    status["message"] = "Generation completed"
 
 def set_error(message: str):
-    _current_status["status"] = "error"
-    _current_status["progress"] = 0.0
-    _current_status["message"] = message
+    status = _current_status()
+    status["status"] = "error"
+    status["progress"] = 0.0
+    status["message"] = message
 
 def reset():
-    _current_status["status"] = "running"
-    _current_status["progress"] = 0.0
-    _current_status["message"] = "Starting generation..."
+    status = _current_status()
+    status["status"] = "running"
+    status["progress"] = 0.0
+    status["message"] = "Starting generation..."
 
 def get_status() -> GenerationStatusModel:
-    return GenerationStatusModel(**_current_status)
+    # Reading does not register the session: unknown ids are just idle.
+    return GenerationStatusModel(**_statuses.get(get_current_session_id(), _IDLE_STATUS))
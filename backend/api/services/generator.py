@@ -1,4 +1,5 @@
 from threading import Thread
+from contextvars import copy_context
 from api.services.generation_status import (
     update_global_progress,
     set_done,
@@ -38,7 +39,8 @@ def start_generation(prompt: str) -> GenerationStatusModel:
             print(str(e))
             set_error(str(e))
 
-    Thread(target=_run).start()
+    # The thread runs in a copy of the request context so it works on the caller's world.
+    Thread(target=copy_context().run, args=(_run,)).start()
     status = GenerationStatusModel(
         status="started",
         progress=0.0,
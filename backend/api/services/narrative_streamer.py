@@ -51,7 +51,8 @@ async def generate_narrative_stream(event_id: str) -> AsyncGenerator[str, None]:
         print(f"[STREAM] Event.run completed.")
 
         # --- 3. Handle Stream Completion ---
-        final_status = event.status
+        # Writes clone shared events: read the status from the current instance.
+        final_status = game_state.events.find_event(event_id).status
         print(f"[STREAM] Final event status: {final_status}")
 
         check_and_start_event_triggers(game_state)
@@ -0,0 +1,150 @@
+"""
+Content negotiation for the state endpoints.
+
+The Unity client can ask for:
+- a binary body with `Accept: application/msgpack` (JSON otherwise), and
+- a compressed body with `Accept-Encoding: zstd` or `gzip` (zstd preferred when both are accepted).
+
+Bodies are serialized once, straight to bytes (orjson / ormsgpack), and returned as a raw
+Response, so FastAPI does not walk the payload again through jsonable_encoder.
+Streams are newline-delimited JSON or consecutive msgpack objects, flushed through the
+compressor after every chunk so the client can decode each one as it arrives.
+"""
+import gzip
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import orjson
+import ormsgpack
+import zstandard
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+# Bodies smaller than this are sent uncompressed: the frame overhead is not worth it.
+MIN_COMPRESS_BYTES = 1024
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 5
+
+
+def _default(value: Any) -> Any:
+    """Types the changesets may contain that the serializers do not handle natively."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type {type(value).__name__} is not serializable")
+
+
+def _parse_header(value: Optional[str]) -> Dict[str, float]:
+    """Parses an Accept / Accept-Encoding header into {token: q}."""
+    accepted: Dict[str, float] = {}
+    if not value:
+        return accepted
+    for part in value.split(","):
+        token, *params = [piece.strip() for piece in part.split(";")]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[token.lower()] = q
+    return accepted
+
+
+def negotiate_media_type(request: Request) -> str:
+    accepted = _parse_header(request.headers.get("accept"))
+    for media_type in _MSGPACK_MEDIA_TYPES:
+        if accepted.get(media_type, 0.0) > 0.0:
+            return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    accepted = _parse_header(request.headers.get("accept-encoding"))
+    candidates: List[str] = [encoding for encoding in ("zstd", "gzip") if accepted.get(encoding, accepted.get("*", 0.0)) > 0.0]
+    if not candidates:
+        return None
+    # Highest q wins; on ties the order above (zstd first) decides.
+    return max(candidates, key=lambda encoding: accepted.get(encoding, accepted.get("*", 0.0)))
+
+
+def serialize(content: Any, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return ormsgpack.packb(content, default=_default, option=ormsgpack.OPT_NON_STR_KEYS | ormsgpack.OPT_SERIALIZE_PYDANTIC)
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "zstd":
+        # Compressors are not thread-safe; a new one per body is cheap.
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def encode_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """Serializes `content` in the representation negotiated with the client."""
+    media_type = negotiate_media_type(request)
+    body = serialize(content, media_type)
+
+    encoding = negotiate_encoding(request) if len(body) >= MIN_COMPRESS_BYTES else None
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding is not None:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
+
+
+class _ChunkCompressor:
+    """Compresses a streamed body, flushing after every chunk so it can be decoded right away."""
+
+    def __init__(self, encoding: str):
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+
+    def compress_chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_mode)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def encode_stream(request: Request, chunks: Iterable[Any]) -> StreamingResponse:
+    """Streams `chunks` one by one in the representation negotiated with the client."""
+    media_type = negotiate_media_type(request)
+    encoding = negotiate_encoding(request)
+
+    def body() -> Iterator[bytes]:
+        compressor = _ChunkCompressor(encoding) if encoding is not None else None
+        for chunk in chunks:
+            data = serialize(chunk, media_type)
+            if media_type == JSON_MEDIA_TYPE:
+                data += b"\n"
+            yield compressor.compress_chunk(data) if compressor is not None else data
+        if compressor is not None:
+            yield compressor.finish()
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE if media_type == JSON_MEDIA_TYPE else media_type,
+        headers=headers,
+    )
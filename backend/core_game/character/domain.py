@@ -1,15 +1,41 @@
-from typing import Dict, cast, Optional, Tuple, Literal
+from typing import Dict, cast, Optional, Set, Tuple, Literal, TYPE_CHECKING
 
 from .schemas import *
+from core_game.entity_version import next_entity_version
+from core_game.entity_tracker import EntityTracker
+
+if TYPE_CHECKING:
+    from versioning.layers.journal import UndoJournal
 
 class BaseCharacter:
     def __init__(self, data: CharacterBaseModel):
         self._data = data
+        self._version: int = next_entity_version()
+        self._visual_version: int = self._version
 
     @property
     def id(self) -> str:
         return self._data.id
 
+    @property
+    def version(self) -> int:
+        """Changes every time the character is modified."""
+        return self._version
+
+    def touch(self) -> None:
+        """Marks the character as modified (bumps its version)."""
+        self._version = next_entity_version()
+
+    @property
+    def visual_version(self) -> int:
+        """Changes every time an attribute its image depends on (identity, physical) is modified."""
+        return self._visual_version
+
+    def touch_visual(self) -> None:
+        """Marks the character as visually modified: its image has to be generated again."""
+        self.touch()
+        self._visual_version = self._version
+
     @property
     def type(self) -> CharacterType:
         return self._data.type
@@ -37,6 +63,7 @@ class BaseCharacter:
     @present_in_scenario.setter
     def present_in_scenario(self, value: Optional[str]) -> None:
         self._data.present_in_scenario = value
+        self.touch()
     
     @property
     def image_path(self) -> Optional[str]:
@@ -45,6 +72,7 @@ class BaseCharacter:
     @image_path.setter
     def image_path(self, value: Optional[str]) -> None:
         self._data.image_path = value
+        self.touch()
 
     @property
     def image_generation_prompt(self) -> Optional[str]:
@@ -53,10 +81,18 @@ class BaseCharacter:
     @image_generation_prompt.setter
     def image_generation_prompt(self, value: Optional[str]) -> None:
         self._data.image_generation_prompt = value
+        self.touch()
 
     def get_model(self) -> CharacterBaseModel:
         return self._data
 
+    def clone(self) -> "BaseCharacter":
+        """Return an independent copy of this character (used for copy-on-write)."""
+        cloned = type(self)(self._data.model_copy(deep=True))
+        cloned._version = self._version
+        cloned._visual_version = self._visual_version
+        return cloned
+
 
 class PlayerCharacter(BaseCharacter):
     def __init__(self, data: PlayerCharacterModel):
@@ -91,6 +127,9 @@ class Characters:
         self._registry: Dict[str, BaseCharacter]
         self._player_id: Optional[str]
 
+        # Ownership, dirty ids, undo journal and visual baseline of the characters (see EntityTracker).
+        self._tracker: EntityTracker[BaseCharacter] = EntityTracker(self, "character", "_registry", visual=True)
+
         if model:
             self._populate_from_model(model)
         else:
@@ -108,6 +147,10 @@ class Characters:
         self._player_id = model.player_character_id
 
 
+    def get_entity_versions(self) -> Dict[str, int]:
+        """Returns the current version of every character, keyed by id."""
+        return {cid: char.version for cid, char in self._registry.items()}
+
     def to_model(self) -> CharactersModel:
         """Return the underlying data as a CharactersModel."""
         return CharactersModel(
@@ -116,6 +159,55 @@ class Characters:
             player_character_id=self._player_id,
         )
 
+    def fork(self) -> "Characters":
+        """Returns a copy that shares the characters and clones them on first write."""
+        forked = Characters()
+        forked._registry = dict(self._registry)
+        forked._player_id = self._player_id
+        forked._tracker.share_from(self._tracker)
+        return forked
+
+    def release_ownership(self) -> None:
+        """Marks every current character as shared: later writes clone it first."""
+        self._tracker.release_ownership()
+
+    def apply_changes_from(self, forked: "Characters") -> None:
+        """Applies in place the characters changed in a collection forked from this one."""
+        self._tracker.apply_changes_from(forked._tracker)
+        if forked._player_id != self._player_id:
+            self._record_player_id_before_write()
+            self._player_id = forked._player_id
+
+    def pop_dirty_ids(self) -> Set[str]:
+        """Returns the ids of the characters changed since the last call and resets them."""
+        return self._tracker.pop_dirty_ids()
+
+    def pop_visual_dirty_ids(self) -> Set[str]:
+        """
+        Returns the ids of the characters added or visually modified (see
+        BaseCharacter.touch_visual) since the last call and resets them.
+        """
+        return self._tracker.pop_visual_dirty_ids()
+
+    def attach_journal(self, journal: Optional["UndoJournal"]) -> None:
+        """Attaches (or detaches with None) the undo journal that records in-place writes."""
+        self._tracker.journal = journal
+
+    def _record_player_id_before_write(self) -> None:
+        journal = self._tracker.journal
+        if journal is None:
+            return
+        previous_player_id = self._player_id
+
+        def undo() -> None:
+            self._player_id = previous_player_id
+
+        journal.record((id(self), "player_id"), undo)
+
+    def _character_for_write(self, character_id: str) -> Optional[BaseCharacter]:
+        """Returns a character that can be mutated in place, cloning it first if it is shared."""
+        return self._tracker.for_write(character_id)
+
     def find_character(self, character_id: str) -> Optional[BaseCharacter]:
         """
         Return a character from the registry if it exists, or None.
@@ -131,7 +223,9 @@ class Characters:
 
     def add_npc(self, npc:NPCCharacter) -> NPCCharacter:
         """Create a new NPC and return it."""
+        self._tracker.record_before_write(npc.id)
         self._registry[npc.id] = npc
+        self._tracker.own(npc.id)
         return npc
 
     def add_player(self, player: PlayerCharacter) -> PlayerCharacter:
@@ -139,7 +233,10 @@ class Characters:
         if self.has_player():
             raise ValueError("A player character already exists.")
             
+        self._tracker.record_before_write(player.id)
+        self._record_player_id_before_write()
         self._registry[player.id] = player
+        self._tracker.own(player.id)
         self._player_id = player.id # La clave es guardar el ID
         return player
 
@@ -170,10 +267,11 @@ class Characters:
         new_species: Optional[str] = None,
         new_alignment: Optional[str] = None,
     ) -> bool:
-        char = self.find_character(character_id)
+        char = self._character_for_write(character_id)
         if not char:
             return False
 
+        before = char.identity.model_copy()
         if new_full_name is not None:
             char.identity.full_name = new_full_name
         if new_alias is not None:
@@ -188,6 +286,9 @@ class Characters:
             char.identity.species = new_species
         if new_alignment is not None:
             char.identity.alignment = new_alignment
+        # The image only has to be generated again if the identity really changed.
+        if char.identity != before:
+            char.touch_visual()
         return True
 
     def modify_character_physical(
@@ -201,9 +302,10 @@ class Characters:
         new_characteristic_items: Optional[List[str]] = None,
         append_characteristic_items: bool = False,
     ) -> bool:
-        char = self.find_character(character_id)
+        char = self._character_for_write(character_id)
         if not char:
             return False
+        before = char.physical.model_copy(deep=True)
         if new_appearance is not None:
             char.physical.appearance = new_appearance
         if new_visual_prompt is not None:
@@ -220,6 +322,8 @@ class Characters:
                 char.physical.characteristic_items.extend(new_characteristic_items)
             else:
                 char.physical.characteristic_items = new_characteristic_items
+        if char.physical != before:
+            char.touch_visual()
         return True
 
     def modify_character_psychological(
@@ -239,7 +343,7 @@ class Characters:
         new_quirks: Optional[List[str]] = None,
         append_quirks: bool = False,
     ) -> bool:
-        char = self.find_character(character_id)
+        char = self._character_for_write(character_id)
         if not char:
             return False
         p = char.psychological
@@ -284,7 +388,7 @@ class Characters:
         new_acquired_knowledge: Optional[List[str]] = None,
         append_acquired_knowledge: bool = False,
     ) -> bool:
-        char = self.find_character(character_id)
+        char = self._character_for_write(character_id)
         if not char:
             return False
         k = char.knowledge
@@ -306,7 +410,7 @@ class Characters:
         new_current_emotion: Optional[str] = None,
         new_immediate_goal: Optional[str] = None,
     ) -> bool:
-        char = self.find_character(character_id)
+        char = self._character_for_write(character_id)
         if not char or not isinstance(char, NPCCharacter):
             return False
         if new_current_emotion is not None:
@@ -323,7 +427,7 @@ class Characters:
         new_narrative_purposes: Optional[List[NarrativePurposeModel]] = None,
         append_narrative_purposes: bool = False,
     ) -> bool:
-        char = self.find_character(character_id)
+        char = self._character_for_write(character_id)
         if not char or not isinstance(char, NPCCharacter):
             return False
         n = char.narrative
@@ -345,10 +449,13 @@ class Characters:
         """Delete an NPC from the registry."""
         if character_id == (self.player.id if self.player else None):
             return None
+        self._tracker.disown(character_id)
+        if character_id in self._registry:
+            self._tracker.record_before_write(character_id, deleting=True)
         return self._registry.pop(character_id, None)
 
     def place_character(self, character: BaseCharacter, new_scenario_id: str) -> Optional[BaseCharacter]:
-        char = self.find_character(character.id)
+        char = self._character_for_write(character.id)
         if char:
             char.present_in_scenario = new_scenario_id
         return char
@@ -358,6 +465,8 @@ class Characters:
         char = self.find_character(character_id)
         if not char or isinstance(char, PlayerCharacter):
             return None, None
+        char = self._character_for_write(character_id)
+        assert char is not None
         scenario_id = char.present_in_scenario
         char.present_in_scenario = None
         return scenario_id, char
@@ -417,7 +526,7 @@ class Characters:
         return matches
     
     def attach_new_image(self, character_id: str, image_path: str, image_generation_prompt: str) -> bool:
-        character = self.find_character(character_id)
+        character = self._character_for_write(character_id)
         if character:
             character.image_path = image_path
             character.image_generation_prompt = image_generation_prompt
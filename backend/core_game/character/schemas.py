@@ -8,20 +8,15 @@ from core_game.character.constants import (
     NarrativeImportance,
 )
 from core_game.character.field_descriptions import *
-
-# Internal counter used for sequential character ids
-_character_id_counter = 0
+from core_game.id_allocator import get_id_allocator
 
 
 def generate_character_id() -> str:
     """Return a sequential id of the form 'character_001'."""
-    global _character_id_counter
-    _character_id_counter += 1
-    return f"character_{_character_id_counter:03d}"
+    return get_id_allocator().next_id("character")
 
-def rollback_character_id():
-    global _character_id_counter
-    _character_id_counter -= 1
+def rollback_character_id() -> None:
+    get_id_allocator().rollback("character")
 
 class IdentityModel(BaseModel):
     """Core identity traits of the character."""
@@ -0,0 +1,191 @@
+"""Copy-on-write, dirty and undo bookkeeping shared by the domain collections (map, characters, events)."""
+from typing import Any, Callable, Dict, Generic, MutableMapping, Optional, Set, TypeVar, TYPE_CHECKING
+
+from core_game.id_allocator import allocation_order
+from versioning.layers.journal import restore_key_order
+
+if TYPE_CHECKING:
+    from versioning.layers.journal import UndoJournal
+
+
+# Scenario, Connection, BaseCharacter or GameEvent: entities with clone() and touch()
+# (and visual_version, for visual ones).
+E = TypeVar("E")
+
+
+class EntityTracker(Generic[E]):
+    """
+    Bookkeeping of one kind of entity of a domain collection, kept in a store id -> entity:
+
+    - Ownership (copy-on-write): the entities the collection may mutate in place. A fork
+      shares the entities of its source and clones each one the first time it writes it.
+    - Dirty ids: the entities added, modified or removed since the last pop_dirty_ids().
+    - Undo journal of the running journal-mode transaction: the state of each entity (and
+      the order of the store) before its first write, restored on rollback.
+    - Visual baseline, for entities with an image (`visual`): the visual version of every
+      entity written since the last pop_visual_dirty_ids(), None for the added ones.
+
+    `store_attribute` names the store on the owner, read on every use since the owner may
+    replace it (e.g. when a map is packed). `on_restore` is called once the journal has
+    restored the entities, to rebuild what the collection derives from them (indexes).
+    """
+
+    def __init__(
+        self,
+        owner: Any,
+        kind: str,
+        store_attribute: str,
+        on_restore: Optional[Callable[[], None]] = None,
+        visual: bool = False,
+    ) -> None:
+        self._owner = owner
+        self._kind = kind
+        self._store_attribute = store_attribute
+        self._on_restore = on_restore
+        # None means the collection owns every entity; a fork starts empty.
+        self.owned_ids: Optional[Set[str]] = None
+        self.journal: Optional["UndoJournal"] = None
+        self.dirty_ids: Set[str] = set()
+        self.visual_baseline: Optional[Dict[str, Optional[int]]] = {} if visual else None
+
+    def _store(self) -> MutableMapping[str, E]:
+        return getattr(self._owner, self._store_attribute)
+
+    # --- Ownership ---
+
+    def share_from(self, source: "EntityTracker[E]") -> None:
+        """Makes this the tracker of a fork of `source`'s collection: it owns no entity yet."""
+        self.owned_ids = set()
+        if source.visual_baseline is not None:
+            self.visual_baseline = dict(source.visual_baseline)
+
+    def release_ownership(self) -> None:
+        """Marks every current entity as shared: later writes clone it first."""
+        self.owned_ids = set()
+
+    def own(self, entity_id: str) -> None:
+        if self.owned_ids is not None:
+            self.owned_ids.add(entity_id)
+
+    def disown(self, entity_id: str) -> None:
+        if self.owned_ids is not None:
+            self.owned_ids.discard(entity_id)
+
+    def for_write(self, entity_id: str) -> Optional[E]:
+        """Returns an entity that can be mutated in place, cloning it first if it is shared."""
+        store = self._store()
+        entity = store.get(entity_id)
+        if entity is None:
+            return None
+        self.record_before_write(entity_id)
+        if self.owned_ids is not None and entity_id not in self.owned_ids:
+            entity = entity.clone()  # type: ignore[attr-defined]
+            store[entity_id] = entity
+            self.owned_ids.add(entity_id)
+        entity.touch()  # type: ignore[attr-defined]
+        return entity
+
+    def apply_changes_from(self, forked: "EntityTracker[E]") -> None:
+        """Applies in place the entities changed in a fork of the collection (see share_from)."""
+        store, forked_store = self._store(), forked._store()
+        # Sorted so new entities keep their creation order (ids are sequential).
+        for entity_id in sorted(forked.dirty_ids, key=allocation_order):
+            entity = forked_store.get(entity_id)
+            self.record_before_write(entity_id, deleting=entity is None)
+            if entity is None:
+                store.pop(entity_id, None)
+                self.disown(entity_id)
+            else:
+                store[entity_id] = entity
+                self.own(entity_id)
+        if forked.visual_baseline is not None:
+            self.replace_visual_baseline(dict(forked.visual_baseline))
+
+    # --- Dirty and visual ids ---
+
+    def pop_dirty_ids(self) -> Set[str]:
+        """Returns the ids of the entities changed since the last call and resets them."""
+        dirty = self.dirty_ids
+        self.dirty_ids = set()
+        return dirty
+
+    def pop_visual_dirty_ids(self) -> Set[str]:
+        """Returns the ids of the entities added or visually modified since the last call and resets them."""
+        assert self.visual_baseline is not None
+        store = self._store()
+        dirty = set()
+        for entity_id, visual_version in self.visual_baseline.items():
+            entity = store.get(entity_id)
+            if entity is not None and (visual_version is None or entity.visual_version != visual_version):  # type: ignore[attr-defined]
+                dirty.add(entity_id)
+        self.replace_visual_baseline({})
+        return dirty
+
+    def replace_visual_baseline(self, baseline: Dict[str, Optional[int]]) -> None:
+        journal = self.journal
+        if journal is not None:
+            previous = self.visual_baseline
+
+            def undo() -> None:
+                self.visual_baseline = previous
+
+            journal.record((id(self._owner), "visual_baseline", self._kind), undo)
+        self.visual_baseline = baseline
+
+    # --- Journal ---
+
+    def record_before_write(self, entity_id: str, deleting: bool = False) -> None:
+        """
+        Called before an entity is written, added or removed (`deleting`): marks it dirty and
+        records in the attached journal how to restore it.
+        """
+        was_dirty = entity_id in self.dirty_ids
+        self.dirty_ids.add(entity_id)
+        baseline = self.visual_baseline
+        had_baseline = baseline is None or entity_id in baseline
+        if not had_baseline:
+            current = self._store().get(entity_id)
+            baseline[entity_id] = current.visual_version if current is not None else None  # type: ignore[index, attr-defined]
+        journal = self.journal
+        if journal is None:
+            return
+        if deleting:
+            self._record_order_before_delete(journal)
+        key = (id(self._owner), self._kind, entity_id)
+        if journal.is_recorded(key):
+            return
+        current = self._store().get(entity_id)
+        before = current.clone() if current is not None else None  # type: ignore[attr-defined]
+
+        def undo() -> None:
+            store = self._store()
+            if before is None:
+                store.pop(entity_id, None)
+            else:
+                store[entity_id] = before
+            if not was_dirty:
+                self.dirty_ids.discard(entity_id)
+            if not had_baseline and self.visual_baseline is not None:
+                self.visual_baseline.pop(entity_id, None)
+
+        journal.record(key, undo)
+        if self._on_restore is not None:
+            journal.add_finalizer((id(self._owner), "indexes"), self._on_restore)
+
+    def _record_order_before_delete(self, journal: "UndoJournal") -> None:
+        """
+        Keeps the order of the store before the first deletion of the transaction: undoing
+        a deletion adds the entity back at the end, so the rollback puts them back in order.
+        """
+        key = (id(self._owner), "order", self._kind)
+        if journal.has_finalizer(key):
+            return
+        order = list(self._store())
+
+        def restore() -> None:
+            restore_key_order(self._store(), order)
+            # What is derived from the entities may follow their order.
+            if self._on_restore is not None:
+                self._on_restore()
+
+        journal.add_finalizer(key, restore)
@@ -0,0 +1,18 @@
+"""Version numbers of domain entities (scenarios, connections, characters, events)."""
+import itertools
+from uuid import uuid4
+
+# A single process-wide sequence: a version number is never handed out twice, so
+# (entity id, version) always identifies one exact content of that entity, even
+# across rolled back layers or forks.
+_versions = itertools.count(1)
+
+# Identifies the sequence above. The sequence starts over in every process, so
+# versions recorded under another epoch (e.g. persisted before a restart) cannot be
+# compared with the current ones.
+VERSION_EPOCH = uuid4().hex
+
+
+def next_entity_version() -> int:
+    """Return a version number greater than every one returned before."""
+    return next(_versions)
@@ -12,7 +12,7 @@ from .schemas import (
     GameEventModel,
     GameEventsManagerModel,
 )
-from typing import Optional, Dict, List, Set, TYPE_CHECKING
+from typing import Optional, Dict, List, Set, TYPE_CHECKING, cast
 from collections import defaultdict
 from .constants import EVENT_STATUSES, EVENT_STATUS_LITERAL
 from core_game.game_event.activation_conditions.domain import (
@@ -21,6 +21,8 @@ from core_game.game_event.activation_conditions.domain import (
     WRAPPER_MAP as CONDITION_WRAPPER_MAP
 )
 from core_game.game_event.schemas import RunningEventInfo
+from core_game.entity_version import next_entity_version
+from core_game.entity_tracker import EntityTracker
 from core_game.game_event.activation_conditions.schemas import ActivationConditionModel, CharacterInteractionOptionModel
 
 
@@ -32,6 +34,7 @@ from typing import AsyncGenerator
 
 if TYPE_CHECKING:
     from simulated.game_state import SimulatedGameState
+    from versioning.layers.journal import UndoJournal
 
 
 class BaseGameEvent:
@@ -40,6 +43,7 @@ class BaseGameEvent:
 
     def __init__(self, model: GameEventModel):
         self._data = model
+        self._version: int = next_entity_version()
         self._activation_conditions: List[ActivationCondition] = [] # Initialize here
         self._build_condition_wrappers()
         self.triggered_by: Optional[ActivationCondition]
@@ -58,6 +62,15 @@ class BaseGameEvent:
         """Return the unique identifier of the underlying event model."""
         return self._data.id
 
+    @property
+    def version(self) -> int:
+        """Changes every time the event is modified."""
+        return self._version
+
+    def touch(self) -> None:
+        """Marks the event as modified (bumps its version)."""
+        self._version = next_entity_version()
+
     @property
     def status(self) -> str:
         """Returns the status"""
@@ -91,12 +104,28 @@ class BaseGameEvent:
     @activation_conditions.setter
     def activation_conditions(self, value: List[ActivationCondition]) -> None:
         self._activation_conditions = value
+        self.touch()
 
 
     def get_model(self) -> GameEventModel:
         """Return the underlying Pydantic model."""
         return self._data
 
+    def _latest(self, game_state: 'SimulatedGameState') -> "BaseGameEvent":
+        """
+        The current instance of this event in `game_state`: writes clone shared events,
+        so a running event reads its messages from there instead of from itself.
+        """
+        return game_state.events.find_event(self.id) or self
+
+    def clone(self) -> "BaseGameEvent":
+        """Return an independent copy of this event (used for copy-on-write)."""
+        cloned = type(self)(self._data.model_copy(deep=True))
+        cloned._version = self._version
+        if hasattr(self, "triggered_by"):
+            cloned.triggered_by = self.triggered_by
+        return cloned
+
 class NPCConversationEvent(BaseGameEvent):
     """Domain logic for an NPC-only conversation."""
 
@@ -105,7 +134,9 @@ class NPCConversationEvent(BaseGameEvent):
         self._data = model
 
     def add_message(self, message: ConversationMessage) -> None:
+        """In place: callers go through GameEventsManager.add_message_to_event."""
         self._data.messages.append(message)
+        self.touch()
     
     @property
     def npc_ids(self) -> List[str]:
@@ -129,7 +160,8 @@ class NPCConversationEvent(BaseGameEvent):
         # --- Bucle de Conversación Principal ---
         # Este bucle continúa mientras haya alguien que hablar.
         while True:
-            speaker = decide_next_npc_speaker(self, self.triggered_by, game_state)
+            event = self._latest(game_state)
+            speaker = decide_next_npc_speaker(event, self.triggered_by, game_state)
 
             if not speaker:
                 print(f"[Event: {self.id}] Conversation concluded naturally.")
@@ -144,13 +176,13 @@ class NPCConversationEvent(BaseGameEvent):
                 
                 raw_llm_stream = generate_npc_message_stream(
                     speaker=speaker,
-                    event=self,
+                    event=self._latest(game_state),
                     game_state=game_state
                 )
 
                 try:
                     # Intenta parsear y streamear el turno completo.
-                    async for message_json in parse_and_stream_messages(raw_llm_stream, speaker, self):
+                    async for message_json in parse_and_stream_messages(raw_llm_stream, speaker, self, game_state):
                         yield message_json
                     
                     # Si el bucle 'async for' termina sin lanzar una excepción, el turno fue exitoso.
@@ -193,7 +225,9 @@ class PlayerNPCConversationEvent(BaseGameEvent):
         self._pending_choice: Optional[str] = None
 
     def add_message(self, message: ConversationMessage) -> None:
+        """In place: callers go through GameEventsManager.add_message_to_event."""
         self._data.messages.append(message)
+        self.touch()
     
     @property
     def npc_ids(self) -> List[str]:
@@ -203,8 +237,13 @@ class PlayerNPCConversationEvent(BaseGameEvent):
     def messages(self) -> List[ConversationMessage]:
         return self._data.messages
     
-    def set_player_choice(self, choice_label: str) -> None:
-        """Llamar desde el endpoint /choice para continuar la conversación."""
+    def clone(self) -> "PlayerNPCConversationEvent":
+        cloned = cast(PlayerNPCConversationEvent, super().clone())
+        cloned._pending_choice = self._pending_choice
+        return cloned
+
+    def set_player_choice(self, choice_label: Optional[str]) -> None:
+        """Llamar desde el endpoint /choice (vía GameEventsManager.set_player_choice) para continuar la conversación."""
         self._pending_choice = choice_label
     
     async def run(self, game_state: 'SimulatedGameState') -> AsyncGenerator[str, None]:
@@ -215,7 +254,7 @@ class PlayerNPCConversationEvent(BaseGameEvent):
         """
         if self._pending_choice is not None:
             choice = self._pending_choice
-            self._pending_choice = None
+            game_state.events.set_player_choice(self.id, None)
             # Procesamos la elección y la stream devolviendo sus mensajes
             async for msg in self._process_choice_stream(game_state, choice):
                 yield msg
@@ -234,20 +273,21 @@ class PlayerNPCConversationEvent(BaseGameEvent):
         conversation_ended = False
 
         while True:
-            speaker = decide_next_player_npc_speaker(self, self.triggered_by, game_state)
+            speaker = decide_next_player_npc_speaker(self._latest(game_state), self.triggered_by, game_state)
             if not speaker:
                 conversation_ended = True
                 break
 
             is_player = isinstance(speaker, PlayerCharacter)
             for attempt in range(MAX_RETRIES_PER_TURN):
+                event = self._latest(game_state)
                 if is_player:
-                    raw = generate_player_message_stream(speaker=speaker, event=self, game_state=game_state)
+                    raw = generate_player_message_stream(speaker=speaker, event=event, game_state=game_state)
                 else:
-                    raw = generate_npc_message_stream(speaker=speaker, event=self, game_state=game_state)
+                    raw = generate_npc_message_stream(speaker=speaker, event=event, game_state=game_state)
 
                 try:
-                    async for chunk in parse_and_stream_messages(raw, speaker, self):
+                    async for chunk in parse_and_stream_messages(raw, speaker, self, game_state):
                         yield chunk
                     break  # turno completado
                 except InvalidTagError as e:
@@ -282,11 +322,11 @@ class PlayerNPCConversationEvent(BaseGameEvent):
             raw = generate_choice_driven_message_stream(
                 player_choice=choice_label,
                 speaker=player,
-                event=self,
+                event=self._latest(game_state),
                 game_state=game_state
             )
             try:
-                async for chunk in parse_and_stream_messages(raw, game_state.read_only_characters.get_player(), self):
+                async for chunk in parse_and_stream_messages(raw, game_state.read_only_characters.get_player(), self, game_state):
                     yield chunk
                 break
             except InvalidTagError:
@@ -304,7 +344,9 @@ class NarratorInterventionEvent(BaseGameEvent):
         self._data = model
 
     def add_message(self, message: ConversationMessage) -> None:
+        """In place: callers go through GameEventsManager.add_message_to_event."""
         self._data.messages.append(message)
+        self.touch()
 
     @property
     def messages(self) -> List[ConversationMessage]:
@@ -359,12 +401,12 @@ class NarratorInterventionEvent(BaseGameEvent):
             print(f"[Event: {self.id}] Attempt {attempt + 1}/{MAX_RETRIES} for narrator...")
             
             raw_llm_stream = generate_narrator_message_stream(
-                event=self,
+                event=self._latest(game_state),
                 game_state=game_state
             )
 
             try:
-                async for message_json in parse_and_stream_messages(raw_llm_stream, narrator_speaker, self):
+                async for message_json in parse_and_stream_messages(raw_llm_stream, narrator_speaker, self, game_state):
                     yield message_json
                 
                 turn_successful = True
@@ -405,7 +447,9 @@ class CutsceneEvent(BaseGameEvent):
         self._data = model
 
     def add_frame(self, frame: CutsceneFrameModel) -> None:
+        """In place: callers go through GameEventsManager.add_frame_to_event."""
         self._data.frames.append(frame)
+        self.touch()
 
 
 WRAPPER_MAP: Dict[str, type[BaseGameEvent]] = {
@@ -426,10 +470,71 @@ class GameEventsManager:
         self._events_by_beat_id: Dict[str, Set[str]] = defaultdict(set)
         self._beatless_event_ids: Set[str] = set()
         self._interaction_options_by_character: Dict[str, Set[str]] = defaultdict(set)
+
+        # Ownership, dirty ids and undo journal of the events (see EntityTracker).
+        self._tracker: EntityTracker[BaseGameEvent] = EntityTracker(self, "event", "_all_events", on_restore=self._rebuild_indexes)
         
         if model:
             self._populate_and_reindex(model)
 
+    def fork(self) -> "GameEventsManager":
+        """
+        Returns a copy that shares the event objects and clones them on first write.
+        Only the id indexes are copied.
+        """
+        forked = GameEventsManager()
+        forked._all_events = dict(self._all_events)
+        forked._running_event_stack = list(self._running_event_stack)
+        forked._status_indexes = {status: set(ids) for status, ids in self._status_indexes.items()}
+        forked._events_by_beat_id = defaultdict(set, {beat: set(ids) for beat, ids in self._events_by_beat_id.items()})
+        forked._beatless_event_ids = set(self._beatless_event_ids)
+        forked._interaction_options_by_character = defaultdict(
+            set, {cid: set(ids) for cid, ids in self._interaction_options_by_character.items()}
+        )
+        forked._tracker.share_from(self._tracker)
+        return forked
+
+    def release_ownership(self) -> None:
+        """Marks every current event as shared: later writes clone it first."""
+        self._tracker.release_ownership()
+
+    def apply_changes_from(self, forked: "GameEventsManager") -> None:
+        """
+        Applies in place the events changed in a manager forked from this one.
+        The indexes of the fork are adopted as they already describe the result.
+        """
+        self._tracker.apply_changes_from(forked._tracker)
+        if forked._running_event_stack != self._running_event_stack:
+            self._record_running_stack_before_write()
+            self._running_event_stack = forked._running_event_stack
+        self._status_indexes = forked._status_indexes
+        self._events_by_beat_id = forked._events_by_beat_id
+        self._beatless_event_ids = forked._beatless_event_ids
+        self._interaction_options_by_character = forked._interaction_options_by_character
+
+    def pop_dirty_ids(self) -> Set[str]:
+        """Returns the ids of the events changed since the last call and resets them."""
+        return self._tracker.pop_dirty_ids()
+
+    def attach_journal(self, journal: Optional["UndoJournal"]) -> None:
+        """Attaches (or detaches with None) the undo journal that records in-place writes."""
+        self._tracker.journal = journal
+
+    def _record_running_stack_before_write(self) -> None:
+        journal = self._tracker.journal
+        if journal is None:
+            return
+        previous_stack = list(self._running_event_stack)
+
+        def undo() -> None:
+            self._running_event_stack = previous_stack
+
+        journal.record((id(self), "running_event_stack"), undo)
+
+    def _event_for_write(self, event_id: str) -> Optional[BaseGameEvent]:
+        """Returns an event that can be mutated in place, cloning it first if it is shared."""
+        return self._tracker.for_write(event_id)
+
     def _populate_and_reindex(self, model: GameEventsManagerModel):
         """
         Populates the manager from the data model and REBUILDS all
@@ -437,24 +542,28 @@ class GameEventsManager:
         """
         # The stack is now a list of Pydantic models
         self._running_event_stack = model.running_event_stack.copy()
-        
-        self._status_indexes = {status: set() for status in EVENT_STATUSES}
-        self._events_by_beat_id = defaultdict(set)
-        self._beatless_event_ids = set()
-        self._interaction_options_by_character = defaultdict(set)
         self._all_events = {}
 
         for event_id, event_model in model.all_events.items():
             wrapper_class = WRAPPER_MAP.get(event_model.type)
             if not wrapper_class: continue
             
-            domain_event = wrapper_class(model=event_model)
-            self._all_events[event_id] = domain_event
+            self._all_events[event_id] = wrapper_class(model=event_model)
 
-            self._status_indexes[event_model.status].add(event_id)
+        self._rebuild_indexes()
 
-            if event_model.source_beat_id:
-                self._events_by_beat_id[event_model.source_beat_id].add(event_id)
+    def _rebuild_indexes(self) -> None:
+        """Rebuilds every secondary index from `_all_events`."""
+        self._status_indexes = {status: set() for status in EVENT_STATUSES}
+        self._events_by_beat_id = defaultdict(set)
+        self._beatless_event_ids = set()
+        self._interaction_options_by_character = defaultdict(set)
+
+        for event_id, domain_event in self._all_events.items():
+            self._status_indexes[domain_event.status].add(event_id)
+
+            if domain_event.source_beat_id:
+                self._events_by_beat_id[domain_event.source_beat_id].add(event_id)
             else:
                 self._beatless_event_ids.add(event_id)
 
@@ -464,6 +573,10 @@ class GameEventsManager:
 
 
 
+    def get_entity_versions(self) -> Dict[str, int]:
+        """Returns the current version of every event, keyed by id."""
+        return {eid: event.version for eid, event in self._all_events.items()}
+
     def to_model(self) -> GameEventsManagerModel:
         return GameEventsManagerModel(
             all_events={eid: ev.get_model() for eid, ev in self._all_events.items()},
@@ -483,6 +596,8 @@ class GameEventsManager:
             return
 
         self.set_event_status(event_id, "RUNNING")
+        event = self._event_for_write(event_id)
+        assert event is not None
         activating_condition = None
         for cond in event.activation_conditions:
             if activating_condition_id == cond:
@@ -491,6 +606,7 @@ class GameEventsManager:
 
         event.triggered_by = activating_condition
         # Push the new info object onto the stack
+        self._record_running_stack_before_write()
         self._running_event_stack.append(
             RunningEventInfo(event_id=event_id, activating_condition_id=activating_condition_id)
         )
@@ -504,6 +620,7 @@ class GameEventsManager:
             print("Warning: Tried to complete an event, but the running stack is empty.")
             return
 
+        self._record_running_stack_before_write()
         event_info_to_complete = self._running_event_stack.pop()
         self.set_event_status(event_info_to_complete.event_id, "COMPLETED")
         
@@ -546,12 +663,14 @@ class GameEventsManager:
             return
 
         if event_id in self._all_events:
-            event = self._all_events[event_id]
-            old_status = event.status
+            old_status = self._all_events[event_id].status
 
             if old_status == new_status:
                 return 
 
+            event = self._event_for_write(event_id)
+            assert event is not None
+
             if old_status in self._status_indexes:
                 self._status_indexes[old_status].discard(event_id)
 
@@ -593,7 +712,9 @@ class GameEventsManager:
             raise TypeError(f"Internal Error: Event type '{event_model.type}' is unknown and cannot be processed.")
 
         domain_event = wrapper_class(model=event_model)
+        self._tracker.record_before_write(event_model.id)
         self._all_events[event_model.id] = domain_event
+        self._tracker.own(event_model.id)
 
         self._status_indexes[domain_event.status].add(domain_event.id)
 
@@ -613,7 +734,8 @@ class GameEventsManager:
         (Core Logic) Adds new activation conditions to an existing event's data model
         and updates all relevant indexes.
         """
-        event = self._all_events[event_id] # Assumes event existence is pre-validated
+        event = self._event_for_write(event_id) # Assumes event existence is pre-validated
+        assert event is not None
 
         # Add the new conditions to the underlying Pydantic model
         event.get_model().activation_conditions.extend(conditions)
@@ -628,7 +750,7 @@ class GameEventsManager:
 
     def unlink_condition_from_event(self, event_id: str, condition_id: str) -> ActivationConditionModel:
         """Remove a specific activation condition from an event and update indexes."""
-        event = self._all_events.get(event_id)
+        event = self._event_for_write(event_id)
         if not event:
             raise KeyError(f"Event with ID '{event_id}' not found.")
 
@@ -671,9 +793,13 @@ class GameEventsManager:
 
     def delete_event(self, event_id: str) -> BaseGameEvent:
         """Remove an event completely from the manager and all indexes."""
+        if event_id in self._all_events:
+            self._tracker.record_before_write(event_id, deleting=True)
+            self._record_running_stack_before_write()
         event = self._all_events.pop(event_id, None)
         if not event:
             raise KeyError(f"Event with ID '{event_id}' not found.")
+        self._tracker.disown(event_id)
 
         # Remove from running stack if present
         self._running_event_stack = [eid for eid in self._running_event_stack if eid != event_id]
@@ -705,7 +831,7 @@ class GameEventsManager:
 
     def update_event_description(self, event_id: str, new_description: str) -> BaseGameEvent:
         """Update the description of an existing event."""
-        event = self._all_events.get(event_id)
+        event = self._event_for_write(event_id)
         if not event:
             raise KeyError(f"Event with ID '{event_id}' not found.")
         event.get_model().description = new_description
@@ -713,12 +839,45 @@ class GameEventsManager:
 
     def update_event_title(self, event_id: str, new_title: str) -> BaseGameEvent:
         """Update the title of an existing event."""
-        event = self._all_events.get(event_id)
+        event = self._event_for_write(event_id)
         if not event:
             raise KeyError(f"Event with ID '{event_id}' not found.")
         event.get_model().title = new_title
         return event
 
+    def add_message_to_event(self, event_id: str, message: ConversationMessage) -> BaseGameEvent:
+        """Appends a message to a conversation or narrator event."""
+        event = self._all_events.get(event_id)
+        if not event:
+            raise KeyError(f"Event with ID '{event_id}' not found.")
+        if not isinstance(event, (NPCConversationEvent, PlayerNPCConversationEvent, NarratorInterventionEvent)):
+            raise ValueError(f"Event '{event_id}' of type '{event.type}' has no messages.")
+        event = self._event_for_write(event_id)
+        event.add_message(message)
+        return event
+
+    def add_frame_to_event(self, event_id: str, frame: CutsceneFrameModel) -> CutsceneEvent:
+        """Appends a frame to a cutscene event."""
+        event = self._all_events.get(event_id)
+        if not event:
+            raise KeyError(f"Event with ID '{event_id}' not found.")
+        if not isinstance(event, CutsceneEvent):
+            raise ValueError(f"Event '{event_id}' of type '{event.type}' is not a cutscene.")
+        event = self._event_for_write(event_id)
+        event.add_frame(frame)
+        return event
+
+    def set_player_choice(self, event_id: str, choice_label: Optional[str]) -> PlayerNPCConversationEvent:
+        """Stores (or clears, with None) the pending player choice of a player conversation."""
+        event = self._all_events.get(event_id)
+        if not event:
+            raise KeyError(f"Event with ID '{event_id}' not found.")
+        if not isinstance(event, PlayerNPCConversationEvent):
+            raise ValueError(f"Event '{event_id}' of type '{event.type}' does not accept player choices.")
+        event = self._event_for_write(event_id)
+        event.set_player_choice(choice_label)
+        return event
+
     def disable_event(self, event_id: str) -> BaseGameEvent:
         """Set the event status to DISABLED if currently AVAILABLE."""
         event = self._all_events.get(event_id)
@@ -730,7 +889,8 @@ class GameEventsManager:
             )
 
         self.set_event_status(event_id, "DISABLED")
-        return event
+        # set_event_status may have cloned a shared event: return the one now in the manager.
+        return self._all_events[event_id]
 
     def enable_event(self, event_id: str) -> BaseGameEvent:
         """Set the event status back to AVAILABLE if currently DISABLED."""
@@ -743,7 +903,8 @@ class GameEventsManager:
             )
 
         self.set_event_status(event_id, "AVAILABLE")
-        return event
+        # set_event_status may have cloned a shared event: return the one now in the manager.
+        return self._all_events[event_id]
 
     def get_all_events_grouped(self) -> Dict[str, Dict[str, List[BaseGameEvent]]]:
         """
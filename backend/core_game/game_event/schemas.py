@@ -4,18 +4,15 @@ from typing import List, Optional, Literal, Union, Dict, Set
 from pydantic import BaseModel, Field
 from core_game.game_event.activation_conditions.schemas import ActivationConditionModel
 from core_game.game_event.constants import EVENT_STATUS_LITERAL
+from core_game.id_allocator import get_id_allocator
 
-_event_id_counter = 0
 
 def generate_event_id() -> str:
     """Return a sequential id of the form 'event_001'."""
-    global _event_id_counter
-    _event_id_counter += 1
-    return f"event_{_event_id_counter:03d}"
+    return get_id_allocator().next_id("event")
 
 def rollback_event_id() -> None:
-    global _event_id_counter
-    _event_id_counter -= 1
+    get_id_allocator().rollback("event")
 
 class GameEventModel(BaseModel):
     """Base class for all game events."""
@@ -6,15 +6,12 @@ from core_game.character.schemas import CharacterBaseModel, PlayerCharacterModel
 from core_game.narrative.schemas import NarrativeStateModel
 from core_game.game_event.schemas import GameEventModel
 from core_game.relationship.schemas import RelationshipsModel
-
-_session_id_counter = 0
+from core_game.id_allocator import get_id_allocator
 
 
 def generate_session_id() -> str:
     """Return a sequential id of the form 'scenario_001'."""
-    global _session_id_counter
-    _session_id_counter += 1
-    return f"session_{_session_id_counter:03d}"
+    return get_id_allocator().next_id("session")
 
 class GameSessionModel(BaseModel):
     """Contains global information and configuration for the game session."""
@@ -1,11 +1,37 @@
+import threading
+from typing import Dict, List, Optional
+
+from core_game.session_context import get_current_session_id
 from .domain import GameState
 
 class GameStateSingleton:
-    _instance: GameState | None = None
+    """
+    Access point to the GameState of the current session.
+    There is one GameState per session id (see core_game.session_context); code that
+    does not set a session works against the default one.
+    """
+    _instances: Dict[str, GameState] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, session_id: Optional[str] = None) -> GameState:
+        session_id = session_id or get_current_session_id()
+        instance = cls._instances.get(session_id)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(session_id)
+                if instance is None:
+                    instance = GameState()
+                    #instance.load_from_file()
+                    cls._instances[session_id] = instance
+        return instance
+
+    @classmethod
+    def remove_instance(cls, session_id: Optional[str] = None) -> None:
+        """Forgets the GameState of a session (the current one by default)."""
+        with cls._lock:
+            cls._instances.pop(session_id or get_current_session_id(), None)
 
     @classmethod
-    def get_instance(cls) -> GameState:
-        if cls._instance is None:
-            cls._instance = GameState()
-            #cls._instance.load_from_file()
-        return cls._instance
+    def session_ids(cls) -> List[str]:
+        return list(cls._instances.keys())
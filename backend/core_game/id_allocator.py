@@ -0,0 +1,56 @@
+"""Sequential id generation, isolated per game session."""
+import threading
+from typing import Dict, Optional, Tuple
+
+from core_game.session_context import get_current_session_id
+
+
+class IdAllocator:
+    """Sequential counters per id prefix (e.g. 'scenario' -> scenario_001, scenario_002...)."""
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next_id(self, prefix: str) -> str:
+        """Return the next id of the form '<prefix>_001'."""
+        with self._lock:
+            value = self._counters.get(prefix, 0) + 1
+            self._counters[prefix] = value
+        return f"{prefix}_{value:03d}"
+
+    def rollback(self, prefix: str) -> None:
+        """Gives back the last id generated for `prefix`."""
+        with self._lock:
+            self._counters[prefix] = self._counters.get(prefix, 0) - 1
+
+    def get_counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+_allocators: Dict[str, IdAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_id_allocator(session_id: Optional[str] = None) -> IdAllocator:
+    """Return the id allocator of the given session (the current one by default)."""
+    session_id = session_id or get_current_session_id()
+    allocator = _allocators.get(session_id)
+    if allocator is None:
+        with _allocators_lock:
+            allocator = _allocators.setdefault(session_id, IdAllocator())
+    return allocator
+
+
+def drop_id_allocator(session_id: str) -> None:
+    with _allocators_lock:
+        _allocators.pop(session_id, None)
+
+
+def allocation_order(entity_id: str) -> Tuple[int, str]:
+    """
+    Sort key that puts ids of one prefix in the order they were allocated: the number is
+    zero-padded to 3 digits only, so 'scenario_1000' has to come after 'scenario_999'.
+    """
+    return len(entity_id), entity_id
@@ -0,0 +1,244 @@
+import heapq
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core_game.map.domain import Connection
+
+# Versions are unique across graphs: two graphs with the same version have the same content.
+_versions = count(1)
+
+# Reached scenario id, id of the scenario it was reached from, id of the connection used.
+NeighborhoodEntry = Tuple[str, str, str]
+# Entries by distance: levels[0] are the scenarios at distance 1, and so on.
+Neighborhood = Tuple[Tuple[NeighborhoodEntry, ...], ...]
+
+# Scenario ids from the start to the goal, both included.
+Path = Tuple[str, ...]
+
+NEIGHBORHOOD_CACHE_SIZE = 512
+PATH_CACHE_SIZE = 2048
+
+
+class AdjacencyGraph:
+    """
+    Compact adjacency of the map: every scenario gets an integer slot (slots of deleted
+    scenarios are reused) and its edges are a list of (neighbour slot, connection id),
+    in the order the connections were added.
+
+    `version` changes on every structural change; results memoized on the graph
+    (see neighborhood() and shortest_path()) are only valid for the version they were
+    computed on.
+    """
+
+    def __init__(self) -> None:
+        self._slot_of: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._edges: List[List[Tuple[int, str]]] = []
+        self._free_slots: List[int] = []
+        self.version = next(_versions)
+        # (start id, max distance) -> neighborhood, for the current version.
+        self._neighborhoods: Dict[Tuple[str, int], Neighborhood] = {}
+        # (start id, goal id) -> shortest path (None if unreachable), for the current version.
+        self._paths: Dict[Tuple[str, str], Optional[Path]] = {}
+
+    @classmethod
+    def build(cls, scenario_ids: List[str], connections: List["Connection"]) -> "AdjacencyGraph":
+        graph = cls()
+        graph._ids = list(scenario_ids)
+        graph._slot_of = {scenario_id: slot for slot, scenario_id in enumerate(graph._ids)}
+        graph._edges = [[] for _ in graph._ids]
+        slot_of, edges = graph._slot_of, graph._edges
+        for connection in connections:
+            slot_a = slot_of.get(connection.scenario_a_id)
+            slot_b = slot_of.get(connection.scenario_b_id)
+            if slot_a is None or slot_b is None:
+                continue
+            edges[slot_a].append((slot_b, connection.id))
+            if slot_b != slot_a:
+                edges[slot_b].append((slot_a, connection.id))
+        return graph
+
+    def copy(self) -> "AdjacencyGraph":
+        copied = AdjacencyGraph()
+        copied._slot_of = dict(self._slot_of)
+        copied._ids = list(self._ids)
+        copied._edges = [list(edges) for edges in self._edges]
+        copied._free_slots = list(self._free_slots)
+        # Same content: keeps the version and what was memoized for it.
+        copied.version = self.version
+        copied._neighborhoods = dict(self._neighborhoods)
+        copied._paths = dict(self._paths)
+        return copied
+
+    def __contains__(self, scenario_id: object) -> bool:
+        return scenario_id in self._slot_of
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def neighbor_ids(self, scenario_id: str) -> Iterator[str]:
+        slot = self._slot_of.get(scenario_id)
+        if slot is None:
+            return
+        ids = self._ids
+        for other_slot, _ in self._edges[slot]:
+            yield ids[other_slot]
+
+    def add_scenario(self, scenario_id: str) -> None:
+        if scenario_id in self._slot_of:
+            return
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._ids[slot] = scenario_id
+        else:
+            slot = len(self._ids)
+            self._ids.append(scenario_id)
+            self._edges.append([])
+        self._slot_of[scenario_id] = slot
+        self._changed()
+
+    def remove_scenario(self, scenario_id: str) -> None:
+        """Removes a scenario and its edges."""
+        slot = self._slot_of.pop(scenario_id, None)
+        if slot is None:
+            return
+        for other_slot, _ in self._edges[slot]:
+            if other_slot != slot:
+                self._edges[other_slot] = [edge for edge in self._edges[other_slot] if edge[0] != slot]
+        self._edges[slot] = []
+        self._ids[slot] = None
+        self._free_slots.append(slot)
+        self._changed()
+
+    def add_connection(self, connection: "Connection") -> None:
+        """Adds the edge of a connection if both its scenarios are in the graph."""
+        slot_a = self._slot_of.get(connection.scenario_a_id)
+        slot_b = self._slot_of.get(connection.scenario_b_id)
+        if slot_a is None or slot_b is None:
+            return
+        self._edges[slot_a].append((slot_b, connection.id))
+        if slot_b != slot_a:
+            self._edges[slot_b].append((slot_a, connection.id))
+        self._changed()
+
+    def remove_connection(self, connection: "Connection") -> None:
+        for scenario_id in (connection.scenario_a_id, connection.scenario_b_id):
+            slot = self._slot_of.get(scenario_id)
+            if slot is not None:
+                self._edges[slot] = [edge for edge in self._edges[slot] if edge[1] != connection.id]
+        self._changed()
+
+    def neighborhood(self, start_id: str, max_distance: int) -> Neighborhood:
+        """
+        Scenarios within `max_distance` hops of `start_id`, by distance. Every level lists
+        each connection from a scenario of the previous level to a newly reached one, so a
+        scenario reached from several scenarios at the same distance appears once per
+        connection. Memoized until the graph changes.
+        """
+        return _memoized(
+            self._neighborhoods, (start_id, max_distance), NEIGHBORHOOD_CACHE_SIZE,
+            lambda: self._compute_neighborhood(start_id, max_distance),
+        )
+
+    def shortest_path(self, start_id: str, goal_id: str, lower_bound: Optional[Callable[[str], int]] = None) -> Optional[Path]:
+        """
+        A shortest path (fewest connections) from `start_id` to `goal_id`, or None if there
+        is none. With `lower_bound` (a scenario id -> hops it is at least away from the goal,
+        never overestimated) the search is an A* instead of a BFS; either way the path is a
+        shortest one, so both share the memoized paths until the graph changes.
+        """
+        reversed_path = self._paths.get((goal_id, start_id), _MISSING)
+        if reversed_path is not _MISSING:
+            return reversed_path[::-1] if reversed_path is not None else None
+        return _memoized(
+            self._paths, (start_id, goal_id), PATH_CACHE_SIZE,
+            lambda: self._compute_path(start_id, goal_id, lower_bound),
+        )
+
+    def _compute_path(self, start_id: str, goal_id: str, lower_bound: Optional[Callable[[str], int]]) -> Optional[Path]:
+        start_slot = self._slot_of.get(start_id)
+        goal_slot = self._slot_of.get(goal_id)
+        if start_slot is None or goal_slot is None:
+            return None
+        ids, edges = self._ids, self._edges
+        came_from: Dict[int, int] = {start_slot: start_slot}
+        if lower_bound is None:
+            queue = deque([start_slot])
+            while queue and goal_slot not in came_from:
+                slot = queue.popleft()
+                for other_slot, _ in edges[slot]:
+                    if other_slot not in came_from:
+                        came_from[other_slot] = slot
+                        queue.append(other_slot)
+        else:
+            # lower_bound never overestimates and changes by at most 1 per hop, so the first
+            # time a scenario is popped it is at its shortest distance.
+            hops: Dict[int, int] = {start_slot: 0}
+            closed = set()
+            tie_breaker = count()
+            heap = [(lower_bound(start_id), next(tie_breaker), start_slot)]
+            while heap:
+                _, _, slot = heapq.heappop(heap)
+                if slot == goal_slot:
+                    break
+                if slot in closed:
+                    continue
+                closed.add(slot)
+                next_hops = hops[slot] + 1
+                for other_slot, _ in edges[slot]:
+                    if next_hops < hops.get(other_slot, next_hops + 1):
+                        hops[other_slot] = next_hops
+                        came_from[other_slot] = slot
+                        heapq.heappush(heap, (next_hops + lower_bound(ids[other_slot]), next(tie_breaker), other_slot))
+        if goal_slot not in came_from:
+            return None
+        path = [goal_slot]
+        while path[-1] != start_slot:
+            path.append(came_from[path[-1]])
+        return tuple(ids[slot] for slot in reversed(path))
+
+    def _compute_neighborhood(self, start_id: str, max_distance: int) -> Neighborhood:
+        start_slot = self._slot_of.get(start_id)
+        if start_slot is None:
+            return ()
+        ids, edges = self._ids, self._edges
+        distance_of: Dict[int, int] = {start_slot: 0}
+        frontier = [start_slot]
+        levels: List[Tuple[NeighborhoodEntry, ...]] = []
+        for distance in range(1, max_distance + 1):
+            level: List[NeighborhoodEntry] = []
+            next_frontier: List[int] = []
+            for slot in frontier:
+                for other_slot, connection_id in edges[slot]:
+                    reached_at = distance_of.get(other_slot)
+                    if reached_at is None:
+                        distance_of[other_slot] = reached_at = distance
+                        next_frontier.append(other_slot)
+                    if reached_at == distance:
+                        level.append((ids[other_slot], ids[slot], connection_id))
+            levels.append(tuple(level))
+            frontier = next_frontier
+            if not frontier:
+                break
+        return tuple(levels)
+
+    def _changed(self) -> None:
+        self.version = next(_versions)
+        self._neighborhoods.clear()
+        self._paths.clear()
+
+
+_MISSING: Any = object()
+
+
+def _memoized(cache: Dict, key: Any, max_size: int, compute: Callable[[], Any]) -> Any:
+    """LRU lookup: the least recently used entry is the first one of the (insertion-ordered) dict."""
+    value = cache.pop(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        if len(cache) >= max_size:
+            del cache[next(iter(cache))]
+    cache[key] = value
+    return value
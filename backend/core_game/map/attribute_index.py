@@ -0,0 +1,126 @@
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core_game.map.domain import Scenario
+
+# Attributes matched by (case insensitive) equality.
+EXACT_ATTRIBUTES = ("type", "zone", "indoor_or_outdoor")
+NAME_CONTAINS = "name_contains"
+# Length of the name n-grams: substrings shorter than this are matched by scanning the names.
+GRAM_SIZE = 3
+
+
+def _grams(text: str) -> Iterable[str]:
+    return {text[start:start + GRAM_SIZE] for start in range(len(text) - GRAM_SIZE + 1)}
+
+
+class ScenarioAttributeIndex:
+    """
+    Secondary indexes of the attributes the scenarios can be searched by:
+    - type, zone and indoor_or_outdoor: lowercased value -> scenario ids;
+    - name: lowercased name trigram -> scenario ids (for name_contains).
+
+    find() keeps the order of the scenarios in the map (the order they were indexed in).
+    """
+
+    def __init__(self) -> None:
+        # Dicts used as insertion-ordered sets.
+        self._exact: Dict[str, Dict[str, Dict[str, None]]] = {attribute: {} for attribute in EXACT_ATTRIBUTES}
+        self._name_grams: Dict[str, Dict[str, None]] = {}
+        # scenario id -> (lowercased type, zone, indoor_or_outdoor, name), to unindex it.
+        self._keys: Dict[str, Tuple[str, ...]] = {}
+        self._rank: Dict[str, int] = {}
+        self._ranks = count()
+
+    @classmethod
+    def build(cls, scenarios: Iterable["Scenario"]) -> "ScenarioAttributeIndex":
+        index = cls()
+        for scenario in scenarios:
+            index.add(scenario)
+        return index
+
+    def copy(self) -> "ScenarioAttributeIndex":
+        copied = ScenarioAttributeIndex()
+        copied._exact = {
+            attribute: {value: dict(ids) for value, ids in values.items()} for attribute, values in self._exact.items()
+        }
+        copied._name_grams = {gram: dict(ids) for gram, ids in self._name_grams.items()}
+        copied._keys = dict(self._keys)
+        copied._rank = dict(self._rank)
+        copied._ranks = count(next(self._ranks))
+        return copied
+
+    def add(self, scenario: "Scenario") -> None:
+        """Indexes a scenario, or reindexes it if it already is (keeping its position)."""
+        keys = tuple(str(getattr(scenario, attribute)).lower() for attribute in EXACT_ATTRIBUTES) + (scenario.name.lower(),)
+        previous = self._keys.get(scenario.id)
+        if previous == keys:
+            return
+        if previous is not None:
+            self._unindex(scenario.id, previous)
+        else:
+            self._rank[scenario.id] = next(self._ranks)
+        self._keys[scenario.id] = keys
+        for attribute, value in zip(EXACT_ATTRIBUTES, keys):
+            self._exact[attribute].setdefault(value, {})[scenario.id] = None
+        for gram in _grams(keys[-1]):
+            self._name_grams.setdefault(gram, {})[scenario.id] = None
+
+    def remove(self, scenario_id: str) -> None:
+        keys = self._keys.pop(scenario_id, None)
+        if keys is not None:
+            self._unindex(scenario_id, keys)
+            del self._rank[scenario_id]
+
+    def find(self, filters: Dict[str, str]) -> List[str]:
+        """
+        Ids of the scenarios matching every filter ({attribute: value}, attributes among
+        EXACT_ATTRIBUTES and NAME_CONTAINS). The candidates come from the most selective
+        index (the smallest set of ids) and are checked against the other filters.
+        """
+        postings: List[Dict[str, None]] = []
+        for attribute, value in filters.items():
+            value = value.lower()
+            if attribute == NAME_CONTAINS:
+                if len(value) < GRAM_SIZE:
+                    continue
+                for gram in _grams(value):
+                    postings.append(self._name_grams.get(gram, {}))
+            else:
+                postings.append(self._exact[attribute].get(value, {}))
+
+        candidates: Iterable[str] = min(postings, key=len) if postings else self._keys
+        checks = [(self._position(attribute), value.lower()) for attribute, value in filters.items()]
+        matches = [
+            scenario_id
+            for scenario_id in candidates
+            if all(self._matches(self._keys[scenario_id], position, value) for position, value in checks)
+        ]
+        matches.sort(key=self._rank.__getitem__)
+        return matches
+
+    @staticmethod
+    def _position(attribute: str) -> Optional[int]:
+        """Position of the attribute in the stored keys; None for name_contains."""
+        return None if attribute == NAME_CONTAINS else EXACT_ATTRIBUTES.index(attribute)
+
+    @staticmethod
+    def _matches(keys: Tuple[str, ...], position: Optional[int], value: str) -> bool:
+        if position is None:
+            return value in keys[-1]
+        return keys[position] == value
+
+    def _unindex(self, scenario_id: str, keys: Tuple[str, ...]) -> None:
+        for attribute, value in zip(EXACT_ATTRIBUTES, keys):
+            ids = self._exact[attribute].get(value)
+            if ids is not None:
+                ids.pop(scenario_id, None)
+                if not ids:
+                    del self._exact[attribute][value]
+        for gram in _grams(keys[-1]):
+            ids = self._name_grams.get(gram)
+            if ids is not None:
+                ids.pop(scenario_id, None)
+                if not ids:
+                    del self._name_grams[gram]
@@ -0,0 +1,236 @@
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Set
+
+NeighborsFn = Callable[[str], Iterable[str]]
+
+# Views memoized per IslandClusters (see memoized()); past this many, they are all dropped.
+MAX_MEMOIZED_VIEWS = 64
+
+
+class _Cluster:
+    __slots__ = ("members", "first", "_snapshot")
+
+    def __init__(self, members: Set[str], first: str):
+        self.members = members
+        # Earliest added member: clusters are listed in the order of their first member.
+        self.first = first
+        self._snapshot: Optional[Set[str]] = None
+
+    def changed(self) -> None:
+        self._snapshot = None
+
+    def snapshot(self) -> Set[str]:
+        """Copy of the members handed out to callers, so later edits do not change it under them."""
+        if self._snapshot is None:
+            self._snapshot = set(self.members)
+        return self._snapshot
+
+
+class IslandClusters:
+    """
+    Connected components (islands) of the map, maintained incrementally.
+
+    - Adding a scenario or a connection is a union by size: the members of the smaller
+      cluster are moved to the bigger one, so a scenario changes cluster O(log n) times.
+    - Removing a connection or a scenario runs one search per loose end, expanded in
+      turns, and stops as soon as all but one of them have met: only the parts that got
+      split off (the smaller side) are fully walked.
+
+    as_list() returns the same clusters, in the same order (by first added scenario),
+    as a full traversal of the map in scenario order.
+
+    Views derived from the clusters (by_size(), summaries...) are memoized until the
+    clusters change: adding a connection inside a cluster does not invalidate them.
+    """
+
+    def __init__(self) -> None:
+        self._cluster_of: Dict[str, _Cluster] = {}
+        self._rank: Dict[str, int] = {}
+        self._ranks = count()
+        self._list: Optional[List[Set[str]]] = None
+        self._views: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def build(cls, scenario_ids: Iterable[str], neighbors: NeighborsFn) -> "IslandClusters":
+        """Clusters of a whole map; `scenario_ids` in map order."""
+        clusters = cls()
+        scenario_ids = list(scenario_ids)
+        clusters._rank = {scenario_id: rank for rank, scenario_id in enumerate(scenario_ids)}
+        clusters._ranks = count(len(scenario_ids))
+        cluster_of = clusters._cluster_of
+        # One traversal per component, started from its first scenario in map order.
+        for scenario_id in scenario_ids:
+            if scenario_id in cluster_of:
+                continue
+            cluster = _Cluster({scenario_id}, scenario_id)
+            cluster_of[scenario_id] = cluster
+            pending = [scenario_id]
+            while pending:
+                for other_id in neighbors(pending.pop()):
+                    if other_id not in cluster_of and other_id in clusters._rank:
+                        cluster_of[other_id] = cluster
+                        cluster.members.add(other_id)
+                        pending.append(other_id)
+        return clusters
+
+    def copy(self) -> "IslandClusters":
+        copied = IslandClusters()
+        copied._rank = dict(self._rank)
+        copied._ranks = count(next(self._ranks))
+        clusters: Dict[int, _Cluster] = {}
+        for scenario_id, cluster in self._cluster_of.items():
+            clone = clusters.get(id(cluster))
+            if clone is None:
+                clone = clusters[id(cluster)] = _Cluster(set(cluster.members), cluster.first)
+                clone._snapshot = cluster._snapshot
+            copied._cluster_of[scenario_id] = clone
+        copied._list = self._list
+        copied._views = dict(self._views)
+        return copied
+
+    def __contains__(self, scenario_id: object) -> bool:
+        return scenario_id in self._cluster_of
+
+    def add(self, scenario_id: str) -> None:
+        """Adds an isolated scenario (no-op if it is already known)."""
+        if scenario_id in self._cluster_of:
+            return
+        self._rank[scenario_id] = next(self._ranks)
+        self._cluster_of[scenario_id] = _Cluster({scenario_id}, scenario_id)
+        self._changed()
+
+    def connect(self, scenario_a_id: str, scenario_b_id: str) -> None:
+        cluster_a = self._cluster_of.get(scenario_a_id)
+        cluster_b = self._cluster_of.get(scenario_b_id)
+        if cluster_a is None or cluster_b is None or cluster_a is cluster_b:
+            return
+        if len(cluster_a.members) < len(cluster_b.members):
+            cluster_a, cluster_b = cluster_b, cluster_a
+        for member in cluster_b.members:
+            self._cluster_of[member] = cluster_a
+        cluster_a.members |= cluster_b.members
+        if self._rank[cluster_b.first] < self._rank[cluster_a.first]:
+            cluster_a.first = cluster_b.first
+        cluster_a.changed()
+        self._changed()
+
+    def disconnect(self, scenario_a_id: str, scenario_b_id: str, neighbors: NeighborsFn) -> None:
+        """Called after the connection between both scenarios was removed from the map."""
+        cluster = self._cluster_of.get(scenario_a_id)
+        if cluster is None or cluster is not self._cluster_of.get(scenario_b_id):
+            return
+        self._split(cluster, [scenario_a_id, scenario_b_id], neighbors)
+
+    def remove(self, scenario_id: str, former_neighbor_ids: Iterable[str], neighbors: NeighborsFn) -> None:
+        """Called after a scenario and its connections were removed from the map."""
+        cluster = self._cluster_of.pop(scenario_id, None)
+        self._rank.pop(scenario_id, None)
+        if cluster is None:
+            return
+        self._changed()
+        cluster.members.discard(scenario_id)
+        cluster.changed()
+        if not cluster.members:
+            return
+        if cluster.first == scenario_id:
+            cluster.first = self._first_of(cluster.members)
+        seeds = [other_id for other_id in dict.fromkeys(former_neighbor_ids) if self._cluster_of.get(other_id) is cluster]
+        self._split(cluster, seeds, neighbors)
+
+    def by_size(self) -> List[Set[str]]:
+        """The clusters from bigger to smaller (ties in as_list() order): the first one is the main cluster."""
+        return self.memoized("by_size", lambda: sorted(self.as_list(), key=len, reverse=True))
+
+    def memoized(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the view stored under `key`, computing it first if the clusters changed since."""
+        if key not in self._views:
+            if len(self._views) >= MAX_MEMOIZED_VIEWS:
+                self._views.clear()
+            self._views[key] = compute()
+        return self._views[key]
+
+    def _changed(self) -> None:
+        self._list = None
+        self._views = {}
+
+    def as_list(self) -> List[Set[str]]:
+        if self._list is None:
+            unique = {id(cluster): cluster for cluster in self._cluster_of.values()}
+            ordered = sorted(unique.values(), key=lambda cluster: self._rank[cluster.first])
+            self._list = [cluster.snapshot() for cluster in ordered]
+        return self._list
+
+    def _first_of(self, members: Iterable[str]) -> str:
+        return min(members, key=self._rank.__getitem__)
+
+    def _split(self, cluster: _Cluster, seeds: List[str], neighbors: NeighborsFn) -> None:
+        """
+        Splits `cluster` into the components reachable from `seeds` (which were connected
+        through the removed part). Searches that run out before meeting the others are
+        split-off components; the last search left standing keeps the rest of the cluster.
+        """
+        if len(seeds) < 2:
+            return
+        # owner[scenario] -> search index; merged searches point to the surviving one.
+        owner: Dict[str, int] = {}
+        merged_into: List[int] = list(range(len(seeds)))
+        visited: List[Set[str]] = []
+        frontiers: List[Deque[str]] = []
+        for index, seed in enumerate(seeds):
+            owner[seed] = index
+            visited.append({seed})
+            frontiers.append(deque([seed]))
+
+        def find(index: int) -> int:
+            while merged_into[index] != index:
+                merged_into[index] = merged_into[merged_into[index]]
+                index = merged_into[index]
+            return index
+
+        active = list(range(len(seeds)))
+        split_off: List[Set[str]] = []
+        while len(active) > 1:
+            still_active = []
+            for index in active:
+                if find(index) != index:
+                    continue
+                frontier = frontiers[index]
+                if not frontier:
+                    split_off.append(visited[index])
+                    continue
+                current = frontier.popleft()
+                for other_id in neighbors(current):
+                    other_owner = owner.get(other_id)
+                    if other_owner is None:
+                        owner[other_id] = index
+                        visited[index].add(other_id)
+                        frontier.append(other_id)
+                        continue
+                    other_owner = find(other_owner)
+                    if other_owner != index:
+                        # Both searches met: they are the same component.
+                        merged_into[other_owner] = index
+                        for member in visited[other_owner]:
+                            owner[member] = index
+                        visited[index] |= visited[other_owner]
+                        frontier.extend(frontiers[other_owner])
+                        visited[other_owner] = set()
+                        frontiers[other_owner] = deque()
+                still_active.append(index)
+            active = [index for index in still_active if find(index) == index]
+
+        if not active:
+            # The last searches ran out in the same turn: the last one keeps the cluster.
+            split_off.pop()
+        if not split_off:
+            return
+        for members in split_off:
+            cluster.members -= members
+            part = _Cluster(members, self._first_of(members))
+            for member in members:
+                self._cluster_of[member] = part
+        if cluster.first not in cluster.members:
+            cluster.first = self._first_of(cluster.members)
+        cluster.changed()
+        self._changed()
@@ -0,0 +1,365 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, MutableMapping, Optional, Set, Union, TYPE_CHECKING
+from core_game.map.constants import Direction, IndoorOrOutdoor, OppositeDirections
+from core_game.map.schemas import ScenarioModel, ScenarioSnapshot, ScenarioImageGenerationTemplate
+
+if TYPE_CHECKING:
+    from core_game.map.domain import Scenario
+
+# Directions by code (position in the list): exits are stored as (direction code, connection id code).
+DIRECTIONS: List[Direction] = list(OppositeDirections)
+_DIRECTION_CODES: Dict[Direction, int] = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Text fields of a scenario, stored as codes of the (interned) string table.
+STRING_FIELDS = (
+    "name", "visual_description", "narrative_context", "summary_description",
+    "indoor_or_outdoor", "type", "zone", "image_path",
+)
+
+
+class PackedScenarios:
+    """
+    Immutable column storage of scenarios: slot i holds the scenario ids[i].
+
+    - Text fields are columns of codes into a string table where every distinct string
+      (types, zones, names, descriptions, connection and character ids...) is stored once;
+      code 0 is None.
+    - Exits are CSR-style: the exits of slot i are the (direction code, connection code)
+      pairs at positions exit_start[i]..exit_start[i + 1] of the exit arrays. Present
+      character ids use the same layout.
+    - Fields that are rarely set (valid_from, image prompt, previous versions) are kept by slot.
+
+    Never modified once packed, so copies of a map share it.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.slot_of: Dict[str, int] = {}
+        self._strings: List[Optional[str]] = [None]
+        self._columns: Dict[str, array] = {field: array("I") for field in STRING_FIELDS}
+        self._versions = array("q")
+        self._visual_versions = array("q")
+        self._exit_start = array("I", [0])
+        self._exit_directions = array("B")
+        self._exit_connections = array("I")
+        self._character_start = array("I", [0])
+        self._characters = array("I")
+        self._valid_from: Dict[int, float] = {}
+        self._image_prompts: Dict[int, ScenarioImageGenerationTemplate] = {}
+        self._previous_versions: Dict[int, List[ScenarioSnapshot]] = {}
+
+    @classmethod
+    def pack(cls, scenarios: Iterable[Union["Scenario", "PackedScenarioView"]]) -> "PackedScenarios":
+        """Packs scenarios (or views of already packed ones), keeping their versions."""
+        packed = cls()
+        codes: Dict[str, int] = {}
+        strings = packed._strings
+
+        def code_of(value: Optional[str]) -> int:
+            if value is None:
+                return 0
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(strings)
+                strings.append(value)
+            return code
+
+        columns = [(packed._columns[field], field) for field in STRING_FIELDS]
+        for slot, scenario in enumerate(scenarios):
+            packed.ids.append(scenario.id)
+            packed.slot_of[scenario.id] = slot
+            for column, field in columns:
+                column.append(code_of(getattr(scenario, field)))
+            packed._versions.append(scenario.version)
+            packed._visual_versions.append(scenario.visual_version)
+            for direction, connection_id in scenario.connections.items():
+                if connection_id is not None:
+                    packed._exit_directions.append(_DIRECTION_CODES[direction])
+                    packed._exit_connections.append(code_of(connection_id))
+            packed._exit_start.append(len(packed._exit_directions))
+            packed._characters.extend(code_of(character_id) for character_id in scenario.present_characters_ids)
+            packed._character_start.append(len(packed._characters))
+            if scenario.valid_from is not None:
+                packed._valid_from[slot] = scenario.valid_from
+            if scenario.image_generation_prompt is not None:
+                packed._image_prompts[slot] = scenario.image_generation_prompt
+            if scenario.previous_versions:
+                packed._previous_versions[slot] = list(scenario.previous_versions)
+        return packed
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def string(self, field: str, slot: int) -> Optional[str]:
+        return self._strings[self._columns[field][slot]]
+
+    def version(self, slot: int) -> int:
+        return self._versions[slot]
+
+    def visual_version(self, slot: int) -> int:
+        return self._visual_versions[slot]
+
+    def connections(self, slot: int) -> Dict[Direction, Optional[str]]:
+        connections: Dict[Direction, Optional[str]] = {direction: None for direction in DIRECTIONS}
+        strings = self._strings
+        for position in range(self._exit_start[slot], self._exit_start[slot + 1]):
+            connections[DIRECTIONS[self._exit_directions[position]]] = strings[self._exit_connections[position]]
+        return connections
+
+    def character_ids(self, slot: int) -> Set[str]:
+        strings = self._strings
+        return {strings[code] for code in self._characters[self._character_start[slot]:self._character_start[slot + 1]]}
+
+    def valid_from(self, slot: int) -> Optional[float]:
+        return self._valid_from.get(slot)
+
+    def image_generation_prompt(self, slot: int) -> Optional[ScenarioImageGenerationTemplate]:
+        return self._image_prompts.get(slot)
+
+    def previous_versions(self, slot: int) -> List[ScenarioSnapshot]:
+        return list(self._previous_versions.get(slot, ()))
+
+    def model(self, slot: int) -> ScenarioModel:
+        """A new model with the content of the slot (the packed content was validated when it was first modelled)."""
+        return next(self.models((slot,)))
+
+    def models(self, slots: Iterable[int]) -> Iterator[ScenarioModel]:
+        """
+        New models of the given slots, decoded straight from the columns (see model()).
+        Whole-map serialization goes through here, without materializing any scenario.
+        """
+        strings = self._strings
+        name, visual_description, narrative_context, summary_description, indoor_or_outdoor, type_, zone, image_path = (
+            self._columns[field] for field in STRING_FIELDS
+        )
+        exit_start, exit_directions, exit_connections = self._exit_start, self._exit_directions, self._exit_connections
+        character_start, characters = self._character_start, self._characters
+        no_connections: Dict[Direction, Optional[str]] = dict.fromkeys(DIRECTIONS)
+        for slot in slots:
+            connections = no_connections.copy()
+            for position in range(exit_start[slot], exit_start[slot + 1]):
+                connections[DIRECTIONS[exit_directions[position]]] = strings[exit_connections[position]]
+            prompt = self._image_prompts.get(slot)
+            fields = {
+                "id": self.ids[slot],
+                "name": strings[name[slot]],
+                "visual_description": strings[visual_description[slot]],
+                "narrative_context": strings[narrative_context[slot]],
+                "summary_description": strings[summary_description[slot]],
+                "indoor_or_outdoor": strings[indoor_or_outdoor[slot]],
+                "type": strings[type_[slot]],
+                "zone": strings[zone[slot]],
+                "valid_from": self._valid_from.get(slot),
+                "image_path": strings[image_path[slot]],
+                "image_generation_prompt": prompt.model_copy(deep=True) if prompt is not None else None,
+                "connections": connections,
+                "present_character_ids": {strings[code] for code in characters[character_start[slot]:character_start[slot + 1]]},
+                "previous_versions": [snapshot.model_copy(deep=True) for snapshot in self._previous_versions.get(slot, ())],
+            }
+            yield ScenarioModel.model_construct(**fields)
+
+    def materialize(self, slot: int) -> "Scenario":
+        from core_game.map.domain import Scenario
+        return Scenario.with_versions(self.model(slot), self._versions[slot], self._visual_versions[slot])
+
+
+def _string_field(field: str) -> property:
+    return property(lambda view: view._packed.string(field, view._slot))
+
+
+class PackedScenarioView:
+    """
+    Read-only view of a packed scenario, with the same read properties as Scenario.
+    Cheap to create and not kept: used for whole-map reads (index builds, versions,
+    serialization) that should not materialize every scenario.
+    """
+    __slots__ = ("_packed", "_slot")
+
+    def __init__(self, packed: PackedScenarios, slot: int):
+        self._packed = packed
+        self._slot = slot
+
+    @property
+    def id(self) -> str:
+        return self._packed.ids[self._slot]
+
+    @property
+    def version(self) -> int:
+        return self._packed.version(self._slot)
+
+    @property
+    def visual_version(self) -> int:
+        return self._packed.visual_version(self._slot)
+
+    name = _string_field("name")
+    visual_description = _string_field("visual_description")
+    narrative_context = _string_field("narrative_context")
+    summary_description = _string_field("summary_description")
+    type = _string_field("type")
+    zone = _string_field("zone")
+    image_path = _string_field("image_path")
+
+    @property
+    def indoor_or_outdoor(self) -> IndoorOrOutdoor:
+        return self._packed.string("indoor_or_outdoor", self._slot)  # type: ignore[return-value]
+
+    @property
+    def connections(self) -> Dict[Direction, Optional[str]]:
+        return self._packed.connections(self._slot)
+
+    @property
+    def present_characters_ids(self) -> Set[str]:
+        return self._packed.character_ids(self._slot)
+
+    @property
+    def valid_from(self) -> Optional[float]:
+        return self._packed.valid_from(self._slot)
+
+    @property
+    def image_generation_prompt(self) -> Optional[ScenarioImageGenerationTemplate]:
+        return self._packed.image_generation_prompt(self._slot)
+
+    @property
+    def previous_versions(self) -> List[ScenarioSnapshot]:
+        return self._packed.previous_versions(self._slot)
+
+    def get_scenario_model(self) -> ScenarioModel:
+        return self._packed.model(self._slot)
+
+
+class CompactScenarioStore(MutableMapping[str, "Scenario"]):
+    """
+    Scenarios of a compact GameMap: a mapping scenario id -> Scenario, in map order, like
+    the dict of a regular map, backed by PackedScenarios.
+
+    A Scenario object is only created (materialized) the first time a scenario is accessed,
+    and then kept, so reads and in-place writes see the same object. Scenarios added after
+    packing are kept as objects, and deleted ones are hidden, until the next repack().
+    Whole-map reads should go through rows(), which does not materialize anything.
+    """
+
+    def __init__(self, packed: Optional[PackedScenarios] = None):
+        self._packed = packed if packed is not None else PackedScenarios()
+        # Scenarios materialized or set since packing: packed ones and added ones.
+        self._materialized: Dict[str, "Scenario"] = {}
+        # Packed ids that were deleted, and ids added since packing (in order). A deleted
+        # packed id set again goes back to its slot.
+        self._removed: Set[str] = set()
+        self._added: Dict[str, None] = {}
+
+    @classmethod
+    def pack(cls, scenarios: Iterable[Union["Scenario", PackedScenarioView]]) -> "CompactScenarioStore":
+        return cls(PackedScenarios.pack(scenarios))
+
+    def repacked(self) -> "CompactScenarioStore":
+        """A store with the same scenarios, all of them packed."""
+        return CompactScenarioStore.pack(self.rows())
+
+    def copy(self) -> "CompactScenarioStore":
+        """Shallow copy (shares the Scenario objects, like dict.copy); the packed columns are shared."""
+        copied = CompactScenarioStore(self._packed)
+        copied._materialized = dict(self._materialized)
+        copied._removed = set(self._removed)
+        copied._added = dict(self._added)
+        return copied
+
+    def clone(self) -> "CompactScenarioStore":
+        """Independent copy: the packed columns are shared, the materialized scenarios are cloned."""
+        copied = self.copy()
+        copied._materialized = {scenario_id: scenario.clone() for scenario_id, scenario in self._materialized.items()}
+        return copied
+
+    def models(self) -> Dict[str, ScenarioModel]:
+        """
+        The model of every scenario, in map order, without materializing any: the models
+        of materialized scenarios, and new ones decoded from the columns for the others.
+        """
+        materialized = self._materialized
+        removed = self._removed
+        decoded = self._packed.models(
+            slot for slot, scenario_id in enumerate(self._packed.ids)
+            if scenario_id not in removed and scenario_id not in materialized
+        )
+        return {
+            scenario_id: materialized[scenario_id].get_scenario_model() if scenario_id in materialized else next(decoded)
+            for scenario_id in self
+        }
+
+    @property
+    def materialized_count(self) -> int:
+        return len(self._materialized)
+
+    def _packed_slot(self, scenario_id: str) -> Optional[int]:
+        """Slot of a packed scenario that was not deleted since packing."""
+        slot = self._packed.slot_of.get(scenario_id)
+        if slot is None or scenario_id in self._removed:
+            return None
+        return slot
+
+    def row(self, scenario_id: str) -> Optional[Union["Scenario", PackedScenarioView]]:
+        """The scenario if it is materialized, else a view of it (None if it does not exist)."""
+        scenario = self._materialized.get(scenario_id)
+        if scenario is not None:
+            return scenario
+        slot = self._packed_slot(scenario_id)
+        return PackedScenarioView(self._packed, slot) if slot is not None else None
+
+    def rows(self) -> Iterator[Union["Scenario", PackedScenarioView]]:
+        """Every scenario, in map order: the materialized ones as they are, the others as views."""
+        materialized = self._materialized
+        for slot, scenario_id in enumerate(self._packed.ids):
+            if scenario_id in self._removed:
+                continue
+            scenario = materialized.get(scenario_id)
+            yield scenario if scenario is not None else PackedScenarioView(self._packed, slot)
+        for scenario_id in self._added:
+            yield materialized[scenario_id]
+
+    def get(self, scenario_id: str, default: Optional["Scenario"] = None) -> Optional["Scenario"]:
+        scenario = self._materialized.get(scenario_id)
+        if scenario is not None:
+            return scenario
+        slot = self._packed_slot(scenario_id)
+        if slot is None:
+            return default
+        scenario = self._materialized[scenario_id] = self._packed.materialize(slot)
+        return scenario
+
+    def __getitem__(self, scenario_id: str) -> "Scenario":
+        scenario = self.get(scenario_id)
+        if scenario is None:
+            raise KeyError(scenario_id)
+        return scenario
+
+    def __setitem__(self, scenario_id: str, scenario: "Scenario") -> None:
+        if scenario_id in self._removed:
+            # A deleted packed scenario set again (an undo) goes back to its slot.
+            self._removed.discard(scenario_id)
+        elif scenario_id not in self._materialized and self._packed_slot(scenario_id) is None:
+            self._added[scenario_id] = None
+        self._materialized[scenario_id] = scenario
+
+    def __delitem__(self, scenario_id: str) -> None:
+        if scenario_id in self._added:
+            del self._added[scenario_id]
+        elif self._packed_slot(scenario_id) is not None:
+            self._removed.add(scenario_id)
+        else:
+            raise KeyError(scenario_id)
+        self._materialized.pop(scenario_id, None)
+
+    def __contains__(self, scenario_id: object) -> bool:
+        return scenario_id in self._materialized or (isinstance(scenario_id, str) and self._packed_slot(scenario_id) is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        removed = self._removed
+        for scenario_id in self._packed.ids:
+            if scenario_id not in removed:
+                yield scenario_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        return len(self._packed) - len(self._removed) + len(self._added)
+
+    def __repr__(self) -> str:
+        return f"CompactScenarioStore({len(self)} scenarios, {len(self._materialized)} materialized)"
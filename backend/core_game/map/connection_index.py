@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, KeysView, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core_game.map.domain import Connection
+
+_EMPTY: Dict[str, None] = {}
+
+
+class ConnectionIndex:
+    """
+    Reverse index scenario id -> ids of the connections it is an endpoint of, in the
+    order they were added. The endpoints of a connection are on the Connection itself
+    (scenario_a_id, scenario_b_id).
+    """
+
+    def __init__(self) -> None:
+        # Dicts used as insertion-ordered sets, so queries are deterministic.
+        self._by_scenario: Dict[str, Dict[str, None]] = {}
+
+    @classmethod
+    def build(cls, scenario_ids: Iterable[str], connections: Iterable["Connection"]) -> "ConnectionIndex":
+        index = cls()
+        for scenario_id in scenario_ids:
+            index.add_scenario(scenario_id)
+        for connection in connections:
+            index.add_connection(connection)
+        return index
+
+    def copy(self) -> "ConnectionIndex":
+        copied = ConnectionIndex()
+        copied._by_scenario = {scenario_id: dict(connection_ids) for scenario_id, connection_ids in self._by_scenario.items()}
+        return copied
+
+    def connection_ids_of(self, scenario_id: str) -> KeysView[str]:
+        """Ids of the connections of a scenario (a live view: copy it before changing the map)."""
+        return self._by_scenario.get(scenario_id, _EMPTY).keys()
+
+    def add_scenario(self, scenario_id: str) -> None:
+        self._by_scenario.setdefault(scenario_id, {})
+
+    def remove_scenario(self, scenario_id: str) -> None:
+        self._by_scenario.pop(scenario_id, None)
+
+    def add_connection(self, connection: "Connection") -> None:
+        """Indexes a connection under the endpoints present in the index."""
+        for scenario_id in (connection.scenario_a_id, connection.scenario_b_id):
+            connection_ids = self._by_scenario.get(scenario_id)
+            if connection_ids is not None:
+                connection_ids[connection.id] = None
+
+    def remove_connection(self, connection: "Connection") -> None:
+        for scenario_id in (connection.scenario_a_id, connection.scenario_b_id):
+            connection_ids = self._by_scenario.get(scenario_id)
+            if connection_ids is not None:
+                connection_ids.pop(connection.id, None)
@@ -1,16 +1,56 @@
 from core_game.map.schemas import ScenarioModel, ScenarioSnapshot, ConnectionModel, GameMapModel, ScenarioImageGenerationTemplate
-from typing import Dict, Optional, List, Set, Literal
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, MutableMapping, Optional, List, Set, Literal, Union, TYPE_CHECKING
 from core_game.map.constants import Direction, OppositeDirections, IndoorOrOutdoor
 from core_game.character.domain import PlayerCharacter, BaseCharacter
+from core_game.entity_version import next_entity_version
+from core_game.entity_tracker import EntityTracker
+from core_game.map.clusters import IslandClusters
+from core_game.map.connection_index import ConnectionIndex
+from core_game.map.adjacency import AdjacencyGraph, Neighborhood
+from core_game.map.exit_index import FreeExitIndex
+from core_game.map.attribute_index import ScenarioAttributeIndex, EXACT_ATTRIBUTES, NAME_CONTAINS
+from core_game.map.compact import CompactScenarioStore, PackedScenarioView
+
+if TYPE_CHECKING:
+    from versioning.layers.journal import UndoJournal
 
 class Scenario:
     def __init__(self, scenario_model: ScenarioModel):
         self._data: ScenarioModel = scenario_model
+        self._version: int = next_entity_version()
+        self._visual_version: int = self._version
     
     @property
     def id(self) -> str:
         return self._data.id
 
+    @property
+    def version(self) -> int:
+        """Changes every time the scenario is modified."""
+        return self._version
+
+    def touch(self) -> None:
+        """Marks the scenario as modified (bumps its version)."""
+        self._version = next_entity_version()
+
+    @property
+    def visual_version(self) -> int:
+        """Changes every time a field its image depends on is modified."""
+        return self._visual_version
+
+    def touch_visual(self) -> None:
+        """Marks the scenario as visually modified: its image has to be generated again."""
+        self.touch()
+        self._visual_version = self._version
+
+    def _set_visual_field(self, field_name: str, value: Any) -> None:
+        """Sets a field the image depends on; the visual version only changes if the value does."""
+        if getattr(self._data, field_name) == value:
+            return
+        setattr(self._data, field_name, value)
+        self.touch_visual()
+
     @property
     def name(self) -> str:
         return self._data.name
@@ -18,6 +58,7 @@ class Scenario:
     @name.setter
     def name(self, value: str) -> None:
         self._data.name = value
+        self.touch()
 
     @property
     def visual_description(self) -> str:
@@ -25,7 +66,7 @@ class Scenario:
 
     @visual_description.setter
     def visual_description(self, value: str) -> None:
-        self._data.visual_description = value
+        self._set_visual_field('visual_description', value)
 
     @property
     def narrative_context(self) -> str:
@@ -34,6 +75,7 @@ class Scenario:
     @narrative_context.setter
     def narrative_context(self, value: str) -> None:
         self._data.narrative_context = value
+        self.touch()
 
     @property
     def summary_description(self) -> str:
@@ -42,6 +84,7 @@ class Scenario:
     @summary_description.setter
     def summary_description(self, value: str) -> None:
         self._data.summary_description = value
+        self.touch()
 
     @property
     def indoor_or_outdoor(self) -> IndoorOrOutdoor:
@@ -49,7 +92,7 @@ class Scenario:
 
     @indoor_or_outdoor.setter
     def indoor_or_outdoor(self, value: IndoorOrOutdoor) -> None:
-        self._data.indoor_or_outdoor = value
+        self._set_visual_field('indoor_or_outdoor', value)
 
     @property
     def type(self) -> str:
@@ -57,7 +100,7 @@ class Scenario:
 
     @type.setter
     def type(self, value: str) -> None:
-        self._data.type = value
+        self._set_visual_field('type', value)
 
     @property
     def zone(self) -> str:
@@ -65,7 +108,7 @@ class Scenario:
 
     @zone.setter
     def zone(self, value: str) -> None:
-        self._data.zone = value
+        self._set_visual_field('zone', value)
 
     @property
     def connections(self) -> Dict[Direction, Optional[str]]:
@@ -90,6 +133,7 @@ class Scenario:
     @image_path.setter
     def image_path(self, value: Optional[str]) -> None:
         self._data.image_path = value
+        self.touch()
 
     @property
     def image_generation_prompt(self) -> Optional[ScenarioImageGenerationTemplate]:
@@ -98,6 +142,7 @@ class Scenario:
     @image_generation_prompt.setter
     def image_generation_prompt(self, value: Optional[ScenarioImageGenerationTemplate]) -> None:
         self._data.image_generation_prompt = value
+        self.touch()
 
     def snapshot_scenario(self, current_time: float):
         snapshot = ScenarioSnapshot(
@@ -116,19 +161,42 @@ class Scenario:
         )
         self._data.valid_from = current_time
         self._data.previous_versions.append(snapshot)
+        self.touch()
 
     def get_scenario_model(self) -> ScenarioModel:
         """Return the underlying scenario model."""
         return self._data
 
+    @classmethod
+    def with_versions(cls, scenario_model: ScenarioModel, version: int, visual_version: int) -> "Scenario":
+        """Return a scenario over `scenario_model` that keeps the given versions (same content they were given to)."""
+        scenario = cls(scenario_model)
+        scenario._version = version
+        scenario._visual_version = visual_version
+        return scenario
+
+    def clone(self) -> "Scenario":
+        """Return an independent copy of this scenario (used for copy-on-write)."""
+        return Scenario.with_versions(self._data.model_copy(deep=True), self._version, self._visual_version)
+
 class Connection:
     def __init__(self, connection_model: ConnectionModel):
         self._data: ConnectionModel = connection_model
+        self._version: int = next_entity_version()
     
     @property
     def id(self) -> str:
         return self._data.id
 
+    @property
+    def version(self) -> int:
+        """Changes every time the connection is modified."""
+        return self._version
+
+    def touch(self) -> None:
+        """Marks the connection as modified (bumps its version)."""
+        self._version = next_entity_version()
+
     @property
     def scenario_a_id(self) -> str:
         return self._data.scenario_a_id
@@ -148,6 +216,7 @@ class Connection:
     @connection_type.setter
     def connection_type(self, value: str) -> None:
         self._data.connection_type = value
+        self.touch()
 
     @property
     def travel_description(self) -> Optional[str]:
@@ -156,6 +225,7 @@ class Connection:
     @travel_description.setter
     def travel_description(self, value: Optional[str]) -> None:
         self._data.travel_description = value
+        self.touch()
 
     @property
     def traversal_conditions(self) -> List[str]:
@@ -164,6 +234,7 @@ class Connection:
     @traversal_conditions.setter
     def traversal_conditions(self, value: List[str]) -> None:
         self._data.traversal_conditions = value
+        self.touch()
 
     @property
     def exit_appearance_description(self) -> Optional[str]:
@@ -172,6 +243,7 @@ class Connection:
     @exit_appearance_description.setter
     def exit_appearance_description(self, value: Optional[str]) -> None:
         self._data.exit_appearance_description = value
+        self.touch()
 
     @property
     def is_blocked(self) -> bool:
@@ -180,6 +252,7 @@ class Connection:
     @is_blocked.setter
     def is_blocked(self, value: bool) -> None:
         self._data.is_blocked = value
+        self.touch()
 
     @property
     def direction_from_b(self) -> Direction:
@@ -215,65 +288,298 @@ class Connection:
         """Return the underlying connection model."""
         return self._data
 
+    def clone(self) -> "Connection":
+        """Return an independent copy of this connection (used for copy-on-write)."""
+        # traversal_conditions is the only mutable field: a shallow copy with its own list
+        # is independent, and much cheaper than a deep copy.
+        cloned = Connection(self._data.model_copy(update={"traversal_conditions": list(self._data.traversal_conditions)}))
+        cloned._version = self._version
+        return cloned
+
 
 class GameMap():
-    def __init__(self, map_model: Optional[GameMapModel] = None):
-        self._scenarios: Dict[str, Scenario]
+    def __init__(self, map_model: Optional[GameMapModel] = None, compact: bool = False):
+        # A dict, or a CompactScenarioStore for compact maps (see compact()).
+        self._scenarios: MutableMapping[str, Scenario]
         self._connections: Dict[str, Connection]
-        self._island_clusters: List[Set[str]]
+        # Indexes of the topology, updated on every scenario/connection add or removal:
+        # connections by scenario, adjacency (see AdjacencyGraph), connected components
+        # (see IslandClusters) and free exits.
+        # Shared with forks until one of them changes the topology.
+        self._connection_index: ConnectionIndex
+        self._adjacency: AdjacencyGraph
+        self._clusters: IslandClusters
+        self._free_exits: FreeExitIndex
+        self._indexes_shared = False
+        # Scenarios by type, zone, indoor_or_outdoor and name (see find_scenarios_by_attribute).
+        # Built on first use (None until then).
+        self._attribute_index: Optional[ScenarioAttributeIndex] = None
+        self._attribute_index_shared = False
+        # Changes whenever a scenario is renamed: views with names (get_cluster_summary) depend on it.
+        self._names_version = next_entity_version()
+        # Inside bulk_update(): the indexes are not maintained and get rebuilt at the end.
+        self._indexes_deferred = False
+
+        # Ownership, dirty ids, undo journal and (for scenarios) visual baseline (see EntityTracker).
+        self._scenario_tracker: EntityTracker[Scenario] = EntityTracker(
+            self, "scenario", "_scenarios", on_restore=self._rebuild_indexes, visual=True,
+        )
+        self._connection_tracker: EntityTracker[Connection] = EntityTracker(
+            self, "connection", "_connections", on_restore=self._rebuild_indexes,
+        )
 
         if map_model:
-            self._populate_from_model(map_model)
+            self._populate_from_model(map_model, compact)
         else:
-            self._scenarios = {}
+            self._scenarios = CompactScenarioStore() if compact else {}
             self._connections = {}
-            self._island_clusters = []
-
-    def _populate_from_model(self, model: GameMapModel):
-        self._scenarios = {scenario.id: Scenario(scenario) for scenario in model.scenarios.values()}
+            self._connection_index = ConnectionIndex()
+            self._adjacency = AdjacencyGraph()
+            self._clusters = IslandClusters()
+            self._free_exits = FreeExitIndex()
+            self._attribute_index = ScenarioAttributeIndex()
+
+    def _populate_from_model(self, model: GameMapModel, compact: bool = False):
+        if compact:
+            self._scenarios = CompactScenarioStore.pack(Scenario(scenario) for scenario in model.scenarios.values())
+        else:
+            self._scenarios = {scenario.id: Scenario(scenario) for scenario in model.scenarios.values()}
         self._connections = {connection.id: Connection(connection) for connection in model.connections.values()}
-        self._island_clusters = []
-        self._compute_island_clusters()
-
-    def _compute_island_clusters(self) -> None:
-        """Computes the clusters formed by scenarios in the map"""
-        visited = set()
-        clusters = []
-        for scenario_id in self._scenarios:
-            if scenario_id not in visited:
-                cluster = set()
-                to_visit = [scenario_id]
-                while to_visit:
-                    current = to_visit.pop()
-                    if current not in visited:
-                        visited.add(current)
-                        cluster.add(current)
-                        conns = self._scenarios[current].connections
-                        connected_ids = []
-                        for conn_id in conns.values():
-                            if conn_id:
-                                conn = self._connections.get(conn_id)
-                                if not conn:
-                                    continue
-                                other_id = conn.get_other_scenario_id(current)
-                                if other_id in self._scenarios:
-                                    connected_ids.append(other_id)
-                        
-                        to_visit.extend([sid for sid in connected_ids if sid not in visited])
-                clusters.append(cluster)
-        self._island_clusters = clusters
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Computes the topology indexes (connections by scenario, adjacency, clusters, free exits) from scratch"""
+        self._connection_index = ConnectionIndex.build(self._scenarios, self._connections.values())
+        self._adjacency = AdjacencyGraph.build(list(self._scenarios), list(self._connections.values()))
+        self._clusters = IslandClusters.build(self._scenarios, self._neighbor_ids)
+        self._free_exits = FreeExitIndex.build(self._scenario_rows())
+        self._indexes_shared = False
+        self._attribute_index = None
+        self._attribute_index_shared = False
+
+    def _own_indexes(self) -> None:
+        """Copies the topology indexes if they are shared with a fork, so they can be updated in place."""
+        if self._indexes_shared:
+            self._connection_index = self._connection_index.copy()
+            self._adjacency = self._adjacency.copy()
+            self._clusters = self._clusters.copy()
+            self._free_exits = self._free_exits.copy()
+            self._indexes_shared = False
+
+    def _get_attribute_index(self) -> ScenarioAttributeIndex:
+        """Returns the attribute index, built first if it was not yet."""
+        if self._attribute_index is None:
+            self._attribute_index = ScenarioAttributeIndex.build(self._scenario_rows())
+            self._attribute_index_shared = False
+        return self._attribute_index
+
+    def _own_attribute_index(self) -> ScenarioAttributeIndex:
+        """Returns the attribute index, copied first if it is shared with a fork."""
+        if self._attribute_index_shared and self._attribute_index is not None:
+            self._attribute_index = self._attribute_index.copy()
+            self._attribute_index_shared = False
+        return self._get_attribute_index()
+
+    @property
+    def is_compact(self) -> bool:
+        """True if the scenarios are in compact storage (see compact())."""
+        return isinstance(self._scenarios, CompactScenarioStore)
+
+    def compact(self) -> None:
+        """
+        Switches the map to compact storage, or repacks it if it already uses it: the scenarios
+        are packed into columns (interned strings, exits by direction code; see
+        core_game.map.compact) and a Scenario object is only created when a scenario is accessed.
+        Meant for very large maps that are mostly read. The content and the versions do not
+        change, but Scenario objects obtained before are no longer the ones in the map.
+        """
+        self._scenarios = (
+            self._scenarios.repacked() if isinstance(self._scenarios, CompactScenarioStore)
+            else CompactScenarioStore.pack(self._scenarios.values())
+        )
+
+    def _scenario_rows(self) -> Iterable[Union[Scenario, PackedScenarioView]]:
+        """Every scenario for reading, in map order, without materializing packed ones (see CompactScenarioStore.rows)."""
+        if isinstance(self._scenarios, CompactScenarioStore):
+            return self._scenarios.rows()
+        return self._scenarios.values()
+
+    def _scenario_row(self, scenario_id: str) -> Optional[Union[Scenario, PackedScenarioView]]:
+        """A scenario for reading, without materializing it if it is packed."""
+        if isinstance(self._scenarios, CompactScenarioStore):
+            return self._scenarios.row(scenario_id)
+        return self._scenarios.get(scenario_id)
+
+    @property
+    def _island_clusters(self) -> List[Set[str]]:
+        return self._clusters.as_list()
+
+    def _neighbor_ids(self, scenario_id: str) -> Iterator[str]:
+        """Ids of the scenarios connected to `scenario_id`."""
+        return self._adjacency.neighbor_ids(scenario_id)
+
+    def fork(self) -> "GameMap":
+        """
+        Returns a structurally shared copy of the map.
+        Scenarios and connections are shared with this map and only cloned the
+        first time the fork writes to them, so the cost is proportional to the edit.
+        """
+        forked = GameMap()
+        forked._scenarios = self._scenarios.copy()
+        forked._connections = dict(self._connections)
+        forked._connection_index = self._connection_index
+        forked._adjacency = self._adjacency
+        forked._clusters = self._clusters
+        forked._free_exits = self._free_exits
+        forked._indexes_shared = self._indexes_shared = True
+        forked._names_version = self._names_version
+        forked._attribute_index = self._attribute_index
+        forked._attribute_index_shared = self._attribute_index_shared = True
+        forked._scenario_tracker.share_from(self._scenario_tracker)
+        forked._connection_tracker.share_from(self._connection_tracker)
+        return forked
+
+    def copy(self) -> "GameMap":
+        """
+        Returns an independent copy of the map, with the same content and versions, leaving
+        this map as it is (unlike fork(), nothing is shared that either map writes in place).
+        The packed columns of a compact map are immutable, so they are shared.
+        """
+        copied = GameMap()
+        if isinstance(self._scenarios, CompactScenarioStore):
+            copied._scenarios = self._scenarios.clone()
+        else:
+            copied._scenarios = {scenario_id: scenario.clone() for scenario_id, scenario in self._scenarios.items()}
+        copied._connections = {connection_id: connection.clone() for connection_id, connection in self._connections.items()}
+        copied._connection_index = self._connection_index.copy()
+        copied._adjacency = self._adjacency.copy()
+        copied._clusters = self._clusters.copy()
+        copied._free_exits = self._free_exits.copy()
+        copied._attribute_index = self._attribute_index.copy() if self._attribute_index is not None else None
+        copied._names_version = self._names_version
+        return copied
+
+    def release_ownership(self) -> None:
+        """
+        Marks every current entity as shared (e.g. with a published read snapshot):
+        later writes clone the entity first instead of mutating it in place.
+        """
+        self._scenario_tracker.release_ownership()
+        self._connection_tracker.release_ownership()
+
+    def apply_changes_from(self, forked: "GameMap") -> None:
+        """
+        Applies the entity changes of a map forked from this one (its dirty entities)
+        in place. The forked map must be discarded afterwards.
+        """
+        self._scenario_tracker.apply_changes_from(forked._scenario_tracker)
+        self._connection_tracker.apply_changes_from(forked._connection_tracker)
+        self._connection_index = forked._connection_index
+        self._adjacency = forked._adjacency
+        self._clusters = forked._clusters
+        self._free_exits = forked._free_exits
+        self._indexes_shared = forked._indexes_shared
+        self._attribute_index = forked._attribute_index
+        self._attribute_index_shared = forked._attribute_index_shared
+        self._names_version = forked._names_version
+
+    @contextmanager
+    def bulk_update(self) -> Iterator["GameMap"]:
+        """
+        Context manager for large batches of changes (world imports, seed generation...).
+        Yields a fork of the map to apply them to; the indexes (clusters, connections by
+        scenario, adjacency, free exits, attributes) are not maintained while the block runs,
+        so index-backed queries on the yielded map are not up to date until it ends.
+
+        When the block ends the new connections are validated together, the indexes are
+        computed once and the changes are applied to this map. If the block raises, or the
+        validation fails (ValueError), none of the changes are applied. A compact map is
+        packed again afterwards (see compact()).
+        A bulk_update inside another one joins it.
+        """
+        if self._indexes_deferred:
+            yield self
+            return
+        staged = self.fork()
+        staged._indexes_deferred = True
+        yield staged
+        staged._validate_connections(staged._connection_tracker.dirty_ids)
+        staged._indexes_deferred = False
+        staged._rebuild_indexes()
+        self.apply_changes_from(staged)
+        if self.is_compact:
+            self.compact()
+
+    def _validate_connections(self, connection_ids: Iterable[str]) -> None:
+        """Checks that both scenarios of each connection exist and have their exit set to it."""
+        for connection_id in connection_ids:
+            connection = self._connections.get(connection_id)
+            if connection is None:
+                continue
+            for scenario_id, direction in (
+                (connection.scenario_a_id, connection.direction_from_a),
+                (connection.scenario_b_id, connection.direction_from_b),
+            ):
+                scenario = self._scenarios.get(scenario_id)
+                if scenario is None:
+                    raise ValueError(f"Connection '{connection_id}' leads to scenario '{scenario_id}', which does not exist.")
+                if scenario.connections.get(direction) != connection_id:
+                    raise ValueError(f"Exit '{direction}' of scenario '{scenario_id}' is not connection '{connection_id}'.")
+
+    def pop_dirty_ids(self) -> Dict[str, Set[str]]:
+        """Returns the ids of the scenarios and connections changed since the last call and resets them."""
+        return {"scenario": self._scenario_tracker.pop_dirty_ids(), "connection": self._connection_tracker.pop_dirty_ids()}
+
+    def pop_visual_dirty_ids(self) -> Set[str]:
+        """
+        Returns the ids of the scenarios added or visually modified (see Scenario.touch_visual)
+        since the last call and resets them.
+        """
+        return self._scenario_tracker.pop_visual_dirty_ids()
+
+    def attach_journal(self, journal: Optional["UndoJournal"]) -> None:
+        """Attaches (or detaches with None) the undo journal that records in-place writes."""
+        self._scenario_tracker.journal = journal
+        self._connection_tracker.journal = journal
+
+    def _scenario_for_write(self, scenario_id: str) -> Optional[Scenario]:
+        """Returns a scenario that can be mutated in place, cloning it first if it is shared."""
+        return self._scenario_tracker.for_write(scenario_id)
+
+    def _connection_for_write(self, connection_id: str) -> Optional[Connection]:
+        """Returns a connection that can be mutated in place, cloning it first if it is shared."""
+        return self._connection_tracker.for_write(connection_id)
+
+    def get_entity_versions(self) -> Dict[str, Dict[str, int]]:
+        """Returns the current version of every scenario and connection, keyed by kind and id."""
+        return {
+            "scenario": {scenario.id: scenario.version for scenario in self._scenario_rows()},
+            "connection": {cid: conn.version for cid, conn in self._connections.items()},
+        }
 
     def to_model(self) -> GameMapModel:
         """Converts the domain GameMap back into a Pydantic model."""
+        if isinstance(self._scenarios, CompactScenarioStore):
+            scenarios = self._scenarios.models()
+        else:
+            scenarios = {scenario.id: scenario.get_scenario_model() for scenario in self._scenarios.values()}
         return GameMapModel(
-            scenarios={sid: scenario.get_scenario_model() for sid, scenario in self._scenarios.items()},
+            scenarios=scenarios,
             connections={cid: conn.get_connection_model() for cid, conn in self._connections.items()}
         )
     
     def add_scenario(self, scenario: Scenario) -> Scenario:
         """Adds Scenario to the map. Does not check anything"""
+        self._scenario_tracker.record_before_write(scenario.id)
         self._scenarios[scenario.id] = scenario
-        self._island_clusters.append({scenario.id})
+        self._scenario_tracker.own(scenario.id)
+        if not self._indexes_deferred:
+            self._own_indexes()
+            self._connection_index.add_scenario(scenario.id)
+            self._adjacency.add_scenario(scenario.id)
+            self._clusters.add(scenario.id)
+            self._free_exits.add_scenario(scenario)
+            self._own_attribute_index().add(scenario)
         return scenario
     
     def modify_scenario(self,
@@ -287,13 +593,13 @@ class GameMap():
     ) -> bool:
         """Modify an existing scenario. Returns True if modified, False if it does not exist."""
 
-        if scenario_id not in self._scenarios:
+        scenario_to_modify = self._scenario_for_write(scenario_id)
+        if scenario_to_modify is None:
             return False
 
-        scenario_to_modify = self._scenarios[scenario_id]
-
         if new_name is not None:
             scenario_to_modify.name = new_name
+            self._names_version = next_entity_version()
         if new_summary_description is not None:
             scenario_to_modify.summary_description = new_summary_description
         if new_visual_description is not None:
@@ -306,6 +612,8 @@ class GameMap():
             scenario_to_modify.type = new_type
         if new_zone is not None:
             scenario_to_modify.zone = new_zone
+        if not self._indexes_deferred and any(value is not None for value in (new_name, new_indoor_or_outdoor, new_type, new_zone)):
+            self._own_attribute_index().add(scenario_to_modify)
 
         return True
 
@@ -316,51 +624,107 @@ class GameMap():
     def delete_scenario(self, scenario_id: str) -> bool:
         """Delete a scenario. Returns True if deleted, False if it does not exist."""
 
-        if scenario_id not in self._scenarios:
+        scenario = self._scenarios.get(scenario_id)
+        if scenario is None:
             return False
 
-        for other_id, other_scenario in self._scenarios.items():
-            for direction, conn_id in other_scenario.connections.items():
-                if conn_id:
-                    conn = self._connections.get(conn_id)
-                    if conn and (conn.scenario_a_id == scenario_id or conn.scenario_b_id == scenario_id):
-                        other_scenario.connections[direction] = None
-                        self._connections.pop(conn_id, None)
-
+        # Unlink the neighbours through the connection index: O(degree).
+        deferred = self._indexes_deferred
+        if deferred:
+            # The index is not up to date: the exits of the scenario are.
+            conn_ids = [conn_id for conn_id in scenario.connections.values() if conn_id]
+        else:
+            self._own_indexes()
+            conn_ids = list(self._connection_index.connection_ids_of(scenario_id))
+        neighbor_ids = []
+        for conn_id in conn_ids:
+            conn = self._connections.get(conn_id)
+            if conn is None:
+                continue
+            if not deferred:
+                self._connection_index.remove_connection(conn)
+                self._adjacency.remove_connection(conn)
+            other_id = conn.get_other_scenario_id(scenario_id)
+            if other_id != scenario_id:
+                neighbor_ids.append(other_id)
+                other_scenario = self._scenario_for_write(other_id)
+                if other_scenario is not None:
+                    other_scenario.connections[conn.get_direction_from(other_id)] = None
+                    if not deferred:
+                        self._free_exits.free(other_id, conn.get_direction_from(other_id))
+            self._connection_tracker.record_before_write(conn_id, deleting=True)
+            self._connections.pop(conn_id, None)
+            self._connection_tracker.disown(conn_id)
+
+        self._scenario_tracker.record_before_write(scenario_id, deleting=True)
         del self._scenarios[scenario_id]
-        self._compute_island_clusters()
+        self._scenario_tracker.disown(scenario_id)
+        if not deferred:
+            self._connection_index.remove_scenario(scenario_id)
+            self._adjacency.remove_scenario(scenario_id)
+            self._free_exits.remove_scenario(scenario_id)
+            self._clusters.remove(scenario_id, neighbor_ids, self._neighbor_ids)
+            self._own_attribute_index().remove(scenario_id)
 
         return True
 
     def add_connection(self, connection: Connection) -> Optional[Connection]:
-        scenario_a = self.find_scenario(connection.scenario_a_id)
-        scenario_b = self.find_scenario(connection.scenario_b_id)
+        """
+        Adds a connection between two existing scenarios whose exits in its directions are free.
+        Returns None, without writing anything, if they are not.
+        """
+        for scenario_id in (connection.scenario_a_id, connection.scenario_b_id):
+            scenario = self._scenarios.get(scenario_id)
+            if scenario is None or scenario.connections.get(connection.get_direction_from(scenario_id)) is not None:
+                return None
+        scenario_a = self._scenario_for_write(connection.scenario_a_id)
+        scenario_b = self._scenario_for_write(connection.scenario_b_id)
         if scenario_a and scenario_b:
+            self._connection_tracker.record_before_write(connection.id)
             self._connections[connection.id] = connection
+            self._connection_tracker.own(connection.id)
             scenario_a.connections[connection.get_direction_from(scenario_a.id)] = connection.id
             scenario_b.connections[connection.get_direction_from(scenario_b.id)] = connection.id
-            self._compute_island_clusters()
+            if not self._indexes_deferred:
+                self._own_indexes()
+                self._connection_index.add_connection(connection)
+                self._adjacency.add_connection(connection)
+                self._clusters.connect(scenario_a.id, scenario_b.id)
+                self._free_exits.occupy(scenario_a.id, connection.get_direction_from(scenario_a.id))
+                self._free_exits.occupy(scenario_b.id, connection.get_direction_from(scenario_b.id))
             return connection
         return None
     
     def delete_bidirectional_connection(self, connection_id: str)->Optional[Connection]:
         """Delete a bidirectional connection from scenario A in the specified direction."""
+        if connection_id in self._connections:
+            self._connection_tracker.record_before_write(connection_id, deleting=True)
         connection = self._connections.pop(connection_id, None)
         if not connection:
             return None
+        self._connection_tracker.disown(connection_id)
         
         scenario_id_B = connection.scenario_b_id
         scenario_id_A = connection.scenario_a_id
 
-        scenario_B = self.find_scenario(scenario_id_B)
-        scenario_A = self.find_scenario(scenario_id_A)
+        scenario_B = self._scenario_for_write(scenario_id_B)
+        scenario_A = self._scenario_for_write(scenario_id_A)
 
         if scenario_A:
             scenario_A.connections[connection.direction_from_a] = None
 
         if scenario_B:
             scenario_B.connections[connection.direction_from_b] = None
-        self._compute_island_clusters()
+        if self._indexes_deferred:
+            return connection
+        self._own_indexes()
+        self._connection_index.remove_connection(connection)
+        self._adjacency.remove_connection(connection)
+        self._clusters.disconnect(scenario_id_A, scenario_id_B, self._neighbor_ids)
+        if scenario_A:
+            self._free_exits.free(scenario_id_A, connection.direction_from_a)
+        if scenario_B:
+            self._free_exits.free(scenario_id_B, connection.direction_from_b)
         return connection
     
     def modify_bidirectional_connection(self, 
@@ -372,7 +736,7 @@ class GameMap():
         """Modify an existing bidirectional connection."""
 
 
-        connection = self._connections.get(connection_id)
+        connection = self._connection_for_write(connection_id)
         if not connection:
             return False
         
@@ -401,6 +765,58 @@ class GameMap():
             return None
         return self._connections.get(conn_id)
     
+    def get_scenario_connections(self, scenario_id: str) -> List[Connection]:
+        """Returns the connections of a scenario (empty if it does not exist)."""
+        connections = (self._connections.get(conn_id) for conn_id in self._connection_index.connection_ids_of(scenario_id))
+        return [conn for conn in connections if conn is not None]
+
+    def get_neighbor_ids(self, scenario_id: str) -> List[str]:
+        """Returns the ids of the scenarios directly connected to a scenario."""
+        return list(self._neighbor_ids(scenario_id))
+
+    def get_neighbors_at_distance(self, scenario_id: str, max_distance: int) -> Neighborhood:
+        """
+        Returns the scenarios within `max_distance` hops of a scenario, by distance: for each
+        distance, the (scenario id, reached from scenario id, connection id) of every connection
+        leading from the previous distance to a scenario first reached at it.
+        Memoized until the topology changes (see AdjacencyGraph.neighborhood).
+        """
+        return self._adjacency.neighborhood(scenario_id, max_distance)
+
+    def find_path(self, from_scenario_id: str, to_scenario_id: str, use_zone_heuristic: bool = False) -> Optional[List[str]]:
+        """
+        Returns the scenario ids of a shortest path (fewest connections) between two scenarios,
+        both included, or None if either does not exist or they are not connected.
+        With use_zone_heuristic the search is an A* that explores the scenarios in the zone of
+        the destination first (the path is still a shortest one).
+        Paths are memoized until the topology changes.
+        """
+        lower_bound = None
+        if use_zone_heuristic and to_scenario_id in self._scenarios:
+            goal_zone = self._scenario_row(to_scenario_id).zone.lower()
+            # Admissible: a scenario outside the destination zone is at least one hop away.
+            lower_bound = lambda scenario_id: 0 if self._scenario_row(scenario_id).zone.lower() == goal_zone else 1
+        path = self._adjacency.shortest_path(from_scenario_id, to_scenario_id, lower_bound)
+        return list(path) if path is not None else None
+
+    def get_distance(self, from_scenario_id: str, to_scenario_id: str) -> Optional[int]:
+        """Returns the number of connections of a shortest path between two scenarios, or None if there is none."""
+        path = self._adjacency.shortest_path(from_scenario_id, to_scenario_id)
+        return len(path) - 1 if path is not None else None
+
+    def get_scenarios_within_distance(self, scenario_id: str, max_distance: int) -> Dict[str, int]:
+        """Returns the scenarios reachable in at most `max_distance` hops (the scenario itself excluded) and their distance."""
+        reachable: Dict[str, int] = {}
+        for distance, level in enumerate(self._adjacency.neighborhood(scenario_id, max_distance), start=1):
+            for reached_id, _, _ in level:
+                reachable[reached_id] = distance
+        return reachable
+
+    @property
+    def topology_version(self) -> int:
+        """Changes whenever a scenario or connection is added or removed."""
+        return self._adjacency.version
+
     def get_scenario_count(self)->int:
         """
         Returns the number of scenarios.
@@ -409,27 +825,30 @@ class GameMap():
     
     def find_scenarios_by_attribute(self,attribute_to_filter: Literal["type", "name_contains", "zone", "indoor_or_outdoor"],value_to_match: str)->List[Scenario]:
         """Returns a list of filtered scenarios by an attribute"""
-        matches = []
-        value_to_match_lower = value_to_match.lower()
-
-        for scenario in self._scenarios.values():
-            if attribute_to_filter == "type" and getattr(scenario, 'type', '').lower() == value_to_match_lower:
-                matches.append(scenario)
-            elif attribute_to_filter == "indoor_or_outdoor" and getattr(scenario, 'indoor_or_outdoor', '').lower() == value_to_match_lower:
-                matches.append(scenario)
-            elif attribute_to_filter == "name_contains" and value_to_match_lower in scenario.name.lower():
-                matches.append(scenario)
-            elif attribute_to_filter == "zone" and getattr(scenario, 'zone', '').lower() == value_to_match_lower:
-                matches.append(scenario)
-
-        return matches
+        return self.find_scenarios({attribute_to_filter: value_to_match})
+
+    def find_scenarios(self, filters: Dict[Literal["type", "name_contains", "zone", "indoor_or_outdoor"], str]) -> List[Scenario]:
+        """
+        Returns the scenarios matching every filter (case insensitive; name_contains is a
+        substring match, the others are exact), in map order. Answered from the attribute index.
+        """
+        if any(attribute not in EXACT_ATTRIBUTES and attribute != NAME_CONTAINS for attribute in filters):
+            return []
+        return [self._scenarios[scenario_id] for scenario_id in self._get_attribute_index().find(filters)]
     
     def get_cluster_summary(self, list_all_scenarios: bool, max_listed_per_cluster: Optional[int] = 5) -> str:
         """
         Generates a formatted string summarizing connectivity clusters.
         Lists all scenarios (ID and name) per cluster if list_all_scenarios is True.
         Otherwise, lists up to 'max_listed_per_cluster' scenarios per cluster.
+        Memoized until the clusters change or a scenario is renamed.
         """
+        return self._clusters.memoized(
+            ("summary", self._names_version, list_all_scenarios, max_listed_per_cluster),
+            lambda: self._format_cluster_summary(list_all_scenarios, max_listed_per_cluster),
+        )
+
+    def _format_cluster_summary(self, list_all_scenarios: bool, max_listed_per_cluster: Optional[int]) -> str:
         if not self._island_clusters:
             return "The simulated map currently has 0 scenarios."
         
@@ -445,7 +864,7 @@ class GameMap():
             scenario_lines: List[str] = []
             for k, scenario_id in enumerate(cluster_list_sorted):
                 if k < num_to_display:
-                    scenario = self._scenarios.get(scenario_id)
+                    scenario = self._scenario_row(scenario_id)
                     if scenario:
                         scenario_lines.append(f"  - \"{scenario.name}\" (ID: {scenario.id})")
                 else:
@@ -468,29 +887,40 @@ class GameMap():
     
     def place_player(self, player: PlayerCharacter, scenario_id: str) -> Optional[Scenario]:
         """places player at scenario. doesnt check anything"""
-        scenario = self.find_scenario(scenario_id)
+        scenario = self._scenario_for_write(scenario_id)
         if scenario:
             scenario.present_characters_ids.add(player.id)
         return scenario
     
     def place_character(self, character: BaseCharacter, scenario_id: str) -> Optional[Scenario]:
         """places player at scenario. doesnt check anything"""
-        scenario = self.find_scenario(scenario_id)
+        scenario = self._scenario_for_write(scenario_id)
         if scenario:
             scenario.present_characters_ids.add(character.id)
         return scenario
 
     def remove_character_from_scenario(self, character: BaseCharacter, scenario_id: str) -> Optional[Scenario]:
-        scenario = self.find_scenario(scenario_id)
+        scenario = self._scenario_for_write(scenario_id)
         if scenario:
             scenario.present_characters_ids.discard(character.id)
         return scenario
 
     def get_all_clusters(self) -> List[Set[str]]:
         return self._island_clusters
+
+    def get_clusters_by_size(self) -> List[Set[str]]:
+        """Returns the clusters from bigger to smaller; the first one is the main cluster. Memoized until the clusters change."""
+        return list(self._clusters.by_size())
+
+    def get_free_exits(self, scenario_ids: Iterable[str]) -> Dict[Direction, List[str]]:
+        """
+        Returns, for each direction, the ids of the given scenarios (e.g. a cluster) whose
+        exit in that direction is free. Answered from the free exit index.
+        """
+        return self._free_exits.free_exits_in(scenario_ids)
     
     def attach_new_image(self, scenario_id: str, image_path: str, image_generation_prompt: ScenarioImageGenerationTemplate) -> bool:
-        scenario = self.find_scenario(scenario_id)
+        scenario = self._scenario_for_write(scenario_id)
         if scenario:
             scenario.image_path = image_path
             scenario.image_generation_prompt = image_generation_prompt
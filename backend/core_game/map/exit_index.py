@@ -0,0 +1,63 @@
+from typing import Dict, Iterable, KeysView, List, TYPE_CHECKING
+from core_game.map.constants import Direction, OppositeDirections
+
+if TYPE_CHECKING:
+    from core_game.map.domain import Scenario
+
+DIRECTIONS: List[Direction] = list(OppositeDirections)
+
+
+class FreeExitIndex:
+    """
+    Index direction -> ids of the scenarios whose exit in that direction is free
+    (no connection), kept up to date as connections are added and removed.
+    """
+
+    def __init__(self) -> None:
+        # Dicts used as insertion-ordered sets, so queries are deterministic.
+        self._by_direction: Dict[Direction, Dict[str, None]] = {direction: {} for direction in DIRECTIONS}
+
+    @classmethod
+    def build(cls, scenarios: Iterable["Scenario"]) -> "FreeExitIndex":
+        index = cls()
+        for scenario in scenarios:
+            index.add_scenario(scenario)
+        return index
+
+    def copy(self) -> "FreeExitIndex":
+        copied = FreeExitIndex()
+        copied._by_direction = {direction: dict(scenario_ids) for direction, scenario_ids in self._by_direction.items()}
+        return copied
+
+    def with_free_exit(self, direction: Direction) -> KeysView[str]:
+        """Ids of the scenarios with a free exit in `direction` (a live view)."""
+        return self._by_direction[direction].keys()
+
+    def add_scenario(self, scenario: "Scenario") -> None:
+        for direction in DIRECTIONS:
+            if scenario.connections.get(direction) is None:
+                self._by_direction[direction][scenario.id] = None
+
+    def remove_scenario(self, scenario_id: str) -> None:
+        for scenario_ids in self._by_direction.values():
+            scenario_ids.pop(scenario_id, None)
+
+    def occupy(self, scenario_id: str, direction: Direction) -> None:
+        self._by_direction[direction].pop(scenario_id, None)
+
+    def free(self, scenario_id: str, direction: Direction) -> None:
+        self._by_direction[direction][scenario_id] = None
+
+    def free_exits_in(self, scenario_ids: Iterable[str]) -> Dict[Direction, List[str]]:
+        """
+        Free exits of a group of scenarios (e.g. a cluster): direction -> ids of its
+        scenarios with that exit free. Walks whichever is smaller, the group or the index.
+        """
+        group = scenario_ids if isinstance(scenario_ids, (set, frozenset, dict)) else set(scenario_ids)
+        free_exits: Dict[Direction, List[str]] = {}
+        for direction, free_ids in self._by_direction.items():
+            if len(free_ids) <= len(group):
+                free_exits[direction] = [scenario_id for scenario_id in free_ids if scenario_id in group]
+            else:
+                free_exits[direction] = [scenario_id for scenario_id in group if scenario_id in free_ids]
+        return free_exits
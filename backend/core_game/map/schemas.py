@@ -1,28 +1,19 @@
 from typing import Dict, List, Optional, Literal, Any, Tuple, Set
 from pydantic import BaseModel, Field
 from core_game.map.constants import Direction, OppositeDirections, IndoorOrOutdoor
-
-# Internal counter to generate sequential scenario ids
-_scenario_id_counter = 0
-# Internal counter to generate sequential connection ids
-_connection_id_counter = 0
+from core_game.id_allocator import get_id_allocator
 
 
 def generate_scenario_id() -> str:
     """Return a sequential id of the form 'scenario_001'."""
-    global _scenario_id_counter
-    _scenario_id_counter += 1
-    return f"scenario_{_scenario_id_counter:03d}"
+    return get_id_allocator().next_id("scenario")
 
-def rollback_scenario_id():
-    global _scenario_id_counter
-    _scenario_id_counter -= 1
+def rollback_scenario_id() -> None:
+    get_id_allocator().rollback("scenario")
 
 def generate_connection_id() -> str:
     """Return a sequential id of the form 'connection_001'."""
-    global _connection_id_counter
-    _connection_id_counter += 1
-    return f"connection_{_connection_id_counter:03d}"
+    return get_id_allocator().next_id("connection")
 
 from core_game.map.field_descriptions import SCENARIO_FIELDS, EXIT_FIELDS
 
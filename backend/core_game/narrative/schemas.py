@@ -1,30 +1,21 @@
 from typing import Dict, List, Optional, Literal, Any
 from pydantic import BaseModel, Field, model_validator
+from core_game.id_allocator import get_id_allocator
 
-# Internal counters to generate sequential ids for narrative elements
-_structure_id_counter = 0
-_beat_id_counter = 0
-_failure_condition_id_counter = 0
 
 def _generate_structure_id() -> str:
     """Return a sequential id of the form 'structure_001'."""
-    global _structure_id_counter
-    _structure_id_counter += 1
-    return f"structure_{_structure_id_counter:03d}"
+    return get_id_allocator().next_id("structure")
 
 
 def generate_beat_id() -> str:
     """Return a sequential id of the form 'beat_001'."""
-    global _beat_id_counter
-    _beat_id_counter += 1
-    return f"beat_{_beat_id_counter:03d}"
+    return get_id_allocator().next_id("beat")
 
 
 def generate_failure_condition_id() -> str:
     """Return a sequential id of the form 'failure_001'."""
-    global _failure_condition_id_counter
-    _failure_condition_id_counter += 1
-    return f"failure_{_failure_condition_id_counter:03d}"
+    return get_id_allocator().next_id("failure")
 
 class GoalModel(BaseModel):
     """Defines a main goal for the player in the narrative. This will guide the narrative."""
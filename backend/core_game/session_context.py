@@ -0,0 +1,35 @@
+"""
+Resolution of the game session (world) the current code is running for.
+The session id lives in a ContextVar so each request, task or thread with a copied
+context transparently works against its own world.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator
+
+DEFAULT_SESSION_ID = "default"
+
+_current_session_id: ContextVar[str] = ContextVar("current_session_id", default=DEFAULT_SESSION_ID)
+
+
+def get_current_session_id() -> str:
+    return _current_session_id.get()
+
+
+def set_current_session_id(session_id: str) -> Token:
+    """Sets the session for the current context. Returns the token needed to reset it."""
+    return _current_session_id.set(session_id)
+
+
+def reset_current_session_id(token: Token) -> None:
+    _current_session_id.reset(token)
+
+
+@contextmanager
+def use_session(session_id: str) -> Iterator[str]:
+    """Runs the enclosed block against the world of `session_id`."""
+    token = set_current_session_id(session_id)
+    try:
+        yield session_id
+    finally:
+        reset_current_session_id(token)
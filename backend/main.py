@@ -1,6 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from api.routes import game
 from api.routes import assets
+from core_game.session_context import DEFAULT_SESSION_ID, set_current_session_id, reset_current_session_id
+from simulated.world_registry import WorldLimitError
 
 
 
@@ -10,6 +13,21 @@ app = FastAPI(
     description="API para generar y gestionar el estado del juego"
 )
 
+# Each request works against the world of its session (one world per player).
+@app.middleware("http")
+async def bind_session_world(request: Request, call_next):
+    session_id = request.headers.get("X-Session-Id") or request.query_params.get("session_id") or DEFAULT_SESSION_ID
+    token = set_current_session_id(session_id)
+    try:
+        return await call_next(request)
+    finally:
+        reset_current_session_id(token)
+
+# A new session arrived while every world slot is in use (see WorldRegistry.max_worlds).
+@app.exception_handler(WorldLimitError)
+async def world_limit_reached(request: Request, exc: WorldLimitError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "60"})
+
 app.include_router(game.router, prefix="/game", tags=["Game"])
 app.include_router(assets.router, prefix="/assets", tags=["assets"])
 
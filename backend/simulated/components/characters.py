@@ -29,6 +29,10 @@ class SimulatedCharacters:
         )
         return new_copy
 
+    def fork(self) -> "SimulatedCharacters":
+        """Returns a copy-on-write view of the characters: each character is cloned on first write."""
+        return SimulatedCharacters(characters=self._working_state.fork())
+
     def get_state(self) -> Characters:
         return self._working_state
 
@@ -265,9 +269,12 @@ class SimulatedCharacters:
         characters = self._working_state.get_characters_at_scenario(scenario_id)
         if any(isinstance(c, PlayerCharacter) for c in characters):
             raise PlayerDeletionError(f"Player is currently at {scenario_id} and player can not be removed from scenarios.")
+        removed_characters: List[BaseCharacter] = []
         for c in characters:
-            c.present_in_scenario = None
-        return characters
+            _, character = self._working_state.remove_character_from_scenario(c.id)
+            if character:
+                removed_characters.append(character)
+        return removed_characters
         
     def get_character(self, cid: str) -> Optional[BaseCharacter]:
         return self._working_state.find_character(cid)
@@ -301,4 +308,8 @@ class SimulatedCharacters:
         )
 
     def attach_new_image(self, character_id: str, image_path: str, image_generation_prompt: str) -> bool:
-        return self._working_state.attach_new_image(character_id, image_path, image_generation_prompt)
\ No newline at end of file
+        return self._working_state.attach_new_image(character_id, image_path, image_generation_prompt)
+
+    def pop_visual_dirty_ids(self) -> Set[str]:
+        """Ids of the characters that need a new image (added or visually modified since the last call)."""
+        return self._working_state.pop_visual_dirty_ids()
@@ -14,7 +14,9 @@ from copy import deepcopy
 
 
 from core_game.game_event.schemas import (
-    GameEventModel
+    GameEventModel,
+    ConversationMessage,
+    CutsceneFrameModel,
 )
 from core_game.game_event.activation_conditions.schemas import ActivationConditionModel
 
@@ -28,6 +30,10 @@ class SimulatedGameEvents:
         copied = GameEventsManager(model=deepcopy(self._working_state.to_model()))
         return SimulatedGameEvents(copied)
 
+    def fork(self) -> SimulatedGameEvents:
+        """Returns a copy-on-write view of the events: each event is cloned on first write."""
+        return SimulatedGameEvents(self._working_state.fork())
+
     def get_state(self) -> GameEventsManager:
         return self._working_state
     
@@ -95,6 +101,15 @@ class SimulatedGameEvents:
             raise KeyError(f"Event with ID '{event_id}' not found.")
         return self._working_state.update_event_title(event_id, new_title)
 
+    def add_message_to_event(self, event_id: str, message: ConversationMessage) -> BaseGameEvent:
+        return self._working_state.add_message_to_event(event_id, message)
+
+    def add_frame_to_event(self, event_id: str, frame: CutsceneFrameModel) -> BaseGameEvent:
+        return self._working_state.add_frame_to_event(event_id, frame)
+
+    def set_player_choice(self, event_id: str, choice_label: Optional[str]) -> BaseGameEvent:
+        return self._working_state.set_player_choice(event_id, choice_label)
+
     def disable_event(self, event_id: str) -> BaseGameEvent:
         event = self._working_state.find_event(event_id)
         if not event:
@@ -1,27 +1,52 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Set, Literal, Tuple
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Set, Literal, Tuple
 
 from copy import deepcopy
 from core_game.map.domain import GameMap, Scenario, Connection
+from core_game.map.adjacency import Neighborhood
 from core_game.map.schemas import ScenarioModel, ConnectionModel, ScenarioImageGenerationTemplate
 from core_game.map.constants import IndoorOrOutdoor, Direction, OppositeDirections
 from core_game.character.domain import BaseCharacter, PlayerCharacter
 import random
 
+# How connect_largest_island_to_main_cluster chooses among the candidate pairs.
+IslandConnectionStrategy = Literal["random", "nearest_zone", "fewest_exits"]
+
 class SimulatedMap:
     def __init__(self, game_map: GameMap) -> None:
         self._working_state: GameMap = game_map
 
     def __deepcopy__(self, memo):
-        copied_game_map = GameMap(map_model=deepcopy(self._working_state.to_model()))
+        game_map = self._working_state
+        if game_map.is_compact:
+            # Shares the (immutable) packed scenarios instead of rebuilding them from a model.
+            copied_game_map = game_map.copy()
+        else:
+            copied_game_map = GameMap(map_model=deepcopy(game_map.to_model()))
         new_copy = SimulatedMap(
             game_map=copied_game_map,
         )
         return new_copy
 
+    def fork(self) -> "SimulatedMap":
+        """Returns a copy-on-write view of this map: scenarios and connections are cloned on first write."""
+        return SimulatedMap(game_map=self._working_state.fork())
+
     def get_state(self) -> GameMap:
         return self._working_state
 
+    @contextmanager
+    def bulk_update(self) -> Iterator["SimulatedMap"]:
+        """
+        Context manager to create, modify or delete many scenarios and connections at once:
+        every operation on the yielded map is validated as usual, but clusters and the other
+        indexes are only recomputed once, when the block ends. All or nothing: if the block
+        raises, none of its changes reach this map (see GameMap.bulk_update).
+        """
+        with self._working_state.bulk_update() as staged:
+            yield SimulatedMap(staged)
+
     
     def create_scenario(self,
         name: str,
@@ -199,7 +224,34 @@ class SimulatedMap:
         Given a scenario id and direction, returns the Connection or None if not found.
         """
         return self._working_state.get_connection(scenario_id,direction_from)
+
+    def get_connection_by_id(self, conn_id: str) -> Optional[Connection]:
+        return self._working_state.get_connection_by_id(conn_id)
     
+    def get_scenario_connections(self, scenario_id: str) -> List[Connection]:
+        """Returns the connections of a scenario (empty if it does not exist)."""
+        return self._working_state.get_scenario_connections(scenario_id)
+
+    def get_neighbor_ids(self, scenario_id: str) -> List[str]:
+        """Returns the ids of the scenarios directly connected to a scenario."""
+        return self._working_state.get_neighbor_ids(scenario_id)
+
+    def get_neighbors_at_distance(self, scenario_id: str, max_distance: int) -> Neighborhood:
+        """Returns the scenarios within `max_distance` hops of a scenario, by distance (see GameMap.get_neighbors_at_distance)."""
+        return self._working_state.get_neighbors_at_distance(scenario_id, max_distance)
+
+    def find_path(self, from_scenario_id: str, to_scenario_id: str, use_zone_heuristic: bool = False) -> Optional[List[str]]:
+        """Returns the scenario ids of a shortest path between two scenarios (both included), or None if there is none."""
+        return self._working_state.find_path(from_scenario_id, to_scenario_id, use_zone_heuristic)
+
+    def get_distance(self, from_scenario_id: str, to_scenario_id: str) -> Optional[int]:
+        """Returns the number of connections of a shortest path between two scenarios, or None if there is none."""
+        return self._working_state.get_distance(from_scenario_id, to_scenario_id)
+
+    def get_scenarios_within_distance(self, scenario_id: str, max_distance: int) -> Dict[str, int]:
+        """Returns the scenarios reachable in at most `max_distance` hops and their distance."""
+        return self._working_state.get_scenarios_within_distance(scenario_id, max_distance)
+
     def get_scenario_count(self)->int:
         """
         Returns the number of scenarios.
@@ -222,6 +274,10 @@ class SimulatedMap:
         """Returns a list of filtered scenarios by an attribute"""
         return self._working_state.find_scenarios_by_attribute(attribute_to_filter,value_to_match)
 
+    def find_scenarios(self, filters: Dict[Literal["type", "name_contains", "zone", "indoor_or_outdoor"], str]) -> List[Scenario]:
+        """Returns the scenarios matching every filter ({attribute: value}), in map order."""
+        return self._working_state.find_scenarios(filters)
+
 
     def can_place_character(self, character: BaseCharacter, scenario_id: str) -> Tuple[bool,str]:
         """Checks if it can place the player to a certain scenario. Returns result and message in case of negative result"""
@@ -257,13 +313,7 @@ class SimulatedMap:
         The main cluster is defined as the largest one.
         This is a read-only operation.
         """
-        all_clusters = self._working_state.get_all_clusters()
-
-        if len(all_clusters) <= 1:
-            return []
-        sorted_clusters = sorted(all_clusters, key=len, reverse=True)
-        outside_clusters = sorted_clusters[1:]
-        return outside_clusters
+        return self._working_state.get_clusters_by_size()[1:]
     
     def get_main_cluster(self) -> Optional[Set[str]]:
         """
@@ -271,19 +321,19 @@ class SimulatedMap:
         The main cluster is defined as the largest one.
         This is a read-only operation.
         """
-        all_clusters = self._working_state.get_all_clusters()
-
-        if not all_clusters: 
+        clusters_by_size = self._working_state.get_clusters_by_size()
+        if not clusters_by_size:
             return None
-
-        sorted_clusters = sorted(all_clusters, key=len, reverse=True)
-        return sorted_clusters[0]
+        return clusters_by_size[0]
     
-    def connect_largest_island_to_main_cluster(self) -> bool:
+    def connect_largest_island_to_main_cluster(self, strategy: IslandConnectionStrategy = "random") -> bool:
         """
         Finds the largest isolated island and connects it to the main cluster.
-        It exhaustively tries all pairs of scenarios between the main cluster
-        and the island to find a valid connection.
+        Candidate pairs (main cluster scenario with a free exit, island scenario with the
+        opposite exit free) come from the free exit index; `strategy` chooses among them:
+        - "random": any candidate pair, at random.
+        - "nearest_zone": a pair of scenarios in the same zone (random pair if there is none).
+        - "fewest_exits": the least connected scenarios (fewest exits in use) on both sides.
         Returns True on successful connection, False if no connection could be made.
         """
         print("  - Executing: Connect largest island to main cluster.")
@@ -298,52 +348,90 @@ class SimulatedMap:
             return False
 
         largest_island = outside_clusters[0]
-        
-        # Shuffle both lists to ensure random connection choices
-        shuffled_main_cluster_ids = list(main_cluster_ids)
-        random.shuffle(shuffled_main_cluster_ids)
-        
-        shuffled_island_ids = list(largest_island)
-        random.shuffle(shuffled_island_ids)
-
-        for origin_node_id in shuffled_main_cluster_ids:
-            origin_scenario = self._working_state.find_scenario(origin_node_id)
-            if not origin_scenario:
-                continue
-
-            # Find an available exit from the origin
-            available_origin_directions: List[Direction] = [d for d, c_id in origin_scenario.connections.items() if c_id is None]
-            if not available_origin_directions:
-                continue # This origin is full, try the next one
-
-            # Now, find a destination with a compatible available exit
-            for destination_node_id in shuffled_island_ids:
-                destination_scenario = self._working_state.find_scenario(destination_node_id)
-                if not destination_scenario:
-                    continue
-
-                # Try to make a connection for each available direction
-                for direction in available_origin_directions:
-                    return_direction = OppositeDirections[direction]
-                    
-                    # Check if the return path is free on the destination
-                    if destination_scenario.connections.get(return_direction) is None:
-                        try:
-                            # We found a valid pair, make the connection and exit
-                            self.create_bidirectional_connection(
-                                from_scenario_id=origin_node_id,
-                                to_scenario_id=destination_node_id,
-                                direction_from_origin=direction,
-                                connection_type="path"
-                            )
-                            print(f"    - ✅ Successfully created connection from '{origin_node_id}' to '{destination_node_id}'.")
-                            return True
-                        except Exception as e:
-                            print(f"    - ⚠️ An unexpected error occurred when trying to connect from '{origin_node_id}' to '{destination_node_id}': {e}")
-                            continue
-        
-        print(f"    - ❌ FAILED to connect largest island. No valid connection pairs found between the main cluster and the island.")
-        return False
+
+        main_free_exits = self._working_state.get_free_exits(main_cluster_ids)
+        island_free_exits = self._working_state.get_free_exits(largest_island)
+        # direction from the main cluster -> (origins in the main cluster, destinations in the island)
+        candidates: Dict[Direction, Tuple[List[str], List[str]]] = {}
+        for direction, origin_ids in main_free_exits.items():
+            destination_ids = island_free_exits[OppositeDirections[direction]]
+            if origin_ids and destination_ids:
+                candidates[direction] = (origin_ids, destination_ids)
+        if not candidates:
+            print(f"    - ❌ FAILED to connect largest island. No valid connection pairs found between the main cluster and the island.")
+            return False
+
+        if strategy == "nearest_zone":
+            chosen = self._choose_same_zone_pair(candidates)
+            if chosen is None:
+                print("    - No scenarios in the same zone, choosing a random pair.")
+                chosen = self._choose_random_pair(candidates)
+        elif strategy == "fewest_exits":
+            chosen = self._choose_least_connected_pair(candidates, main_free_exits, island_free_exits)
+        else:
+            chosen = self._choose_random_pair(candidates)
+
+        origin_node_id, direction, destination_node_id = chosen
+        self.create_bidirectional_connection(
+            from_scenario_id=origin_node_id,
+            to_scenario_id=destination_node_id,
+            direction_from_origin=direction,
+            connection_type="path"
+        )
+        print(f"    - ✅ Successfully created connection from '{origin_node_id}' to '{destination_node_id}'.")
+        return True
+
+    @staticmethod
+    def _choose_random_pair(candidates: Dict[Direction, Tuple[List[str], List[str]]]) -> Tuple[str, Direction, str]:
+        directions = list(candidates)
+        # Weighted by the number of pairs, so every candidate pair is equally likely.
+        direction = random.choices(directions, weights=[len(candidates[d][0]) * len(candidates[d][1]) for d in directions])[0]
+        origin_ids, destination_ids = candidates[direction]
+        return random.choice(origin_ids), direction, random.choice(destination_ids)
+
+    def _choose_same_zone_pair(self, candidates: Dict[Direction, Tuple[List[str], List[str]]]) -> Optional[Tuple[str, Direction, str]]:
+        best: Optional[Tuple[str, Direction, str]] = None
+        for direction, (origin_ids, destination_ids) in candidates.items():
+            destination_by_zone: Dict[str, str] = {}
+            for destination_id in sorted(destination_ids):
+                zone = self._working_state.find_scenario(destination_id).zone.lower()
+                destination_by_zone.setdefault(zone, destination_id)
+            for origin_id in sorted(origin_ids):
+                destination_id = destination_by_zone.get(self._working_state.find_scenario(origin_id).zone.lower())
+                if destination_id is not None:
+                    if best is None or (origin_id, destination_id) < (best[0], best[2]):
+                        best = (origin_id, direction, destination_id)
+                    break
+        return best
+
+    @staticmethod
+    def _choose_least_connected_pair(
+        candidates: Dict[Direction, Tuple[List[str], List[str]]],
+        main_free_exits: Dict[Direction, List[str]],
+        island_free_exits: Dict[Direction, List[str]],
+    ) -> Tuple[str, Direction, str]:
+        # The least connected scenario is the one with the most free exits.
+        free_exit_counts: Dict[str, int] = {}
+        for free_exits in (main_free_exits, island_free_exits):
+            for scenario_ids in free_exits.values():
+                for scenario_id in scenario_ids:
+                    free_exit_counts[scenario_id] = free_exit_counts.get(scenario_id, 0) + 1
+
+        def rank(scenario_id: str) -> Tuple[int, str]:
+            return (-free_exit_counts[scenario_id], scenario_id)
+
+        best = None
+        for direction, (origin_ids, destination_ids) in candidates.items():
+            origin = min(map(rank, origin_ids))
+            destination = min(map(rank, destination_ids))
+            key = (origin[0] + destination[0], origin[1], destination[1])
+            if best is None or key < best[0]:
+                best = (key, (origin[1], direction, destination[1]))
+        return best[1]
 
     def attach_new_image(self, scenario_id: str, image_path: str, image_generation_prompt: ScenarioImageGenerationTemplate) -> bool:
-        return self._working_state.attach_new_image(scenario_id, image_path, image_generation_prompt)
\ No newline at end of file
+        return self._working_state.attach_new_image(scenario_id, image_path, image_generation_prompt)
+
+    def pop_visual_dirty_ids(self) -> Set[str]:
+        """Ids of the scenarios that need a new image (added or visually modified since the last call)."""
+        return self._working_state.pop_visual_dirty_ids()
@@ -252,7 +252,26 @@ class SimulatedGameState:
             raise ValueError(f"Scenario with ID '{scenario_id}' does not exist.")
         self.characters.try_remove_any_characters_at_scenario(scenario_id)
         return self.map.delete_scenario(scenario_id)
-    
+
+    def find_route_for_character(self, character_id: str, destination_scenario_id: str) -> List[str]:
+        """
+        Returns the scenario ids a character would walk through to reach a scenario, from the
+        one it is in to the destination (both included), along a shortest path.
+        Raises KeyError if the character or the destination do not exist, ValueError if the
+        character is not in any scenario or the destination cannot be reached.
+        """
+        character = self.read_only_characters.get_character(character_id)
+        if not character:
+            raise KeyError(f"Character with ID '{character_id}' not found.")
+        if not character.present_in_scenario:
+            raise ValueError(f"Character {character_id} is not present in any scenario.")
+        if not self.read_only_map.find_scenario(destination_scenario_id):
+            raise KeyError(f"Scenario with ID '{destination_scenario_id}' does not exist.")
+        route = self.read_only_map.find_path(character.present_in_scenario, destination_scenario_id, use_zone_heuristic=True)
+        if route is None:
+            raise ValueError(f"Scenario with ID '{destination_scenario_id}' cannot be reached from '{character.present_in_scenario}'.")
+        return route
+
     # GAME EVENT METHODS
 
     def _validate_activation_conditions(self, conditions: List[ActivationConditionModel]):
@@ -456,15 +475,21 @@ class SimulatedGameState:
     def prune_scenarios_outside_main_cluster(self) -> bool:
         """Prunes all scenarios not forming part of main cluster. Returns False if any went wrong while doing"""
         outside_clusters = self.read_only_map.get_outside_clusters()
-        for cluster in outside_clusters:
-            for scenario_id in cluster:
-                try:
+        try:
+            # Characters are moved out first, so the scenarios can then be deleted in a single
+            # bulk update: the clusters are computed once, and a failure deletes none of them.
+            for cluster in outside_clusters:
+                for scenario_id in cluster:
                     scenario = self.read_only_map.find_scenario(scenario_id)
                     assert scenario is not None
-                    for character_id in scenario.present_characters_ids:
+                    for character_id in list(scenario.present_characters_ids):
                         self.place_character_main_cluster_random_safe_scenario(character_id)
-                    self.delete_scenario(scenario_id)
-                except Exception as e:
-                    return False
+                    self.characters.try_remove_any_characters_at_scenario(scenario_id)
+            with self.map.bulk_update() as staged_map:
+                for cluster in outside_clusters:
+                    for scenario_id in cluster:
+                        staged_map.delete_scenario(scenario_id)
+        except Exception as e:
+            return False
         return True
 
@@ -1,79 +1,62 @@
-from core_game.game_state.singleton import GameStateSingleton
-from versioning.layers.manager import GameStateVersionManager 
 from simulated.game_state import SimulatedGameState
 from versioning.deltas.manager import StateCheckpointManager
-import typing 
-from versioning.deltas.factory import CheckpointManagerFactory
+from versioning.layers.manager import GameStateVersionManager
+from versioning.layers.snapshots import SnapshotStore
+from simulated.world_registry import WorldRegistry
 
 class SimulatedGameStateSingleton:
     """
-    Singleton that orchestrates the simulated state and its versioning.
-    
-    - Provides global access to an instance of the facade (SimulatedGameState).
+    Orchestrates the simulated state and its versioning for the current session.
+
+    - Provides access to the facade (SimulatedGameState) of the current world.
     - Internally manages the transaction lifecycle (commit/rollback).
-    """
-    _version_manager_instance: typing.Optional[GameStateVersionManager] = None
-    _facade_instance: typing.Optional[SimulatedGameState] = None
-    _checkpoint_manager: typing.Optional[StateCheckpointManager] = None
 
-    @classmethod
-    def _initialize(cls):
-        """Initializes the internal instances if they don't exist yet."""
-        if cls._version_manager_instance is None:
-            game_state = GameStateSingleton.get_instance()
-            cls._version_manager_instance = GameStateVersionManager(game_state)
-        
-        if cls._facade_instance is None:
-            cls._facade_instance = SimulatedGameState(cls._version_manager_instance)
+    Every session has its own world (see simulated.world_registry); the session is
+    resolved from core_game.session_context, so existing callers keep working unchanged.
+    """
 
     @classmethod
     def get_instance(cls) -> SimulatedGameState:
         """
-        Returns the unique instance of the SimulatedGameState facade.
+        Returns the SimulatedGameState facade of the current world.
         All state reads and modifications are performed through this object.
         """
-        cls._initialize()
-        assert cls._facade_instance is not None, "Initialization of facade failed."
-        return cls._facade_instance
+        return WorldRegistry.get_world().facade
+
+    @classmethod
+    def get_version_manager(cls) -> GameStateVersionManager:
+        return WorldRegistry.get_world().version_manager
 
     # --- DELEGATED TRANSACTION METHODS ---
 
     @classmethod
     def begin_transaction(cls):
         """Starts a new simulation layer (transaction)."""
-        cls._initialize()
-        assert cls._version_manager_instance is not None, "Initialization of version manager failed."
-        cls._version_manager_instance.begin_transaction()
+        WorldRegistry.get_world().version_manager.begin_transaction()
 
     @classmethod
     def commit(cls):
         """Commits the changes from the current layer."""
-        cls._initialize()
-        assert cls._version_manager_instance is not None, "Initialization of version manager failed."
-        cls._version_manager_instance.commit()
+        WorldRegistry.get_world().version_manager.commit()
 
     @classmethod
     def rollback(cls):
         """Discards the changes from the current layer."""
-        cls._initialize()
-        assert cls._version_manager_instance is not None, "Initialization of version manager failed."
-        cls._version_manager_instance.rollback()
-        
+        WorldRegistry.get_world().version_manager.rollback()
+
     @classmethod
     def reset_instance(cls):
         """
-        Completely resets the simulated state to its original base state.
+        Completely resets the simulated state of the current world to its original base state.
         """
-        cls._version_manager_instance = None
-        cls._facade_instance = None
-        cls._checkpoint_manager = None
-        cls._initialize()
+        WorldRegistry.reset_world()
+
+    @classmethod
+    def get_snapshot_store(cls) -> SnapshotStore:
+        """Return the committed read snapshots (MVCC) of the current world."""
+        return WorldRegistry.get_world().snapshot_store
 
     @classmethod
     def get_checkpoint_manager(cls) -> StateCheckpointManager:
-        """Return the global StateCheckpointManager instance."""
-        cls._initialize()
-        if cls._checkpoint_manager is None:
-            factory = CheckpointManagerFactory()
-            cls._checkpoint_manager = factory.create_manager(cls.get_instance())
-        return cls._checkpoint_manager
\ No newline at end of file
+        """Return the StateCheckpointManager of the current world."""
+        return WorldRegistry.get_world().get_checkpoint_manager()
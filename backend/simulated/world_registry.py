@@ -0,0 +1,226 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core_game.game_state.domain import GameState
+from core_game.game_state.singleton import GameStateSingleton
+from core_game.id_allocator import IdAllocator, get_id_allocator, drop_id_allocator
+from core_game.session_context import DEFAULT_SESSION_ID, get_current_session_id
+from simulated.game_state import SimulatedGameState
+from versioning.layers.manager import GameStateVersionManager, TransactionMode
+from versioning.deltas.manager import StateCheckpointManager
+from versioning.deltas.factory import CheckpointManagerFactory
+from versioning.deltas.store import CheckpointStore, DEFAULT_BUDGET_BYTES, DEFAULT_TTL_SECONDS
+from versioning.deltas.backends.sqlite import SQLiteCheckpointBackend
+from versioning.layers.snapshots import SnapshotStore
+
+
+class World:
+    """
+    Everything that belongs to one game session: its GameState, version manager,
+    simulated facade, committed read snapshots, checkpoint manager and id allocator.
+
+    With a `checkpoint_directory`, the checkpoints are also kept in an SQLite file
+    of that directory, so the clients can keep asking for changes after a restart.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        transaction_mode: TransactionMode = "copy",
+        checkpoint_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        checkpoint_ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        checkpoint_directory: Optional[str] = None,
+    ) -> None:
+        self._session_id = session_id
+        self._checkpoint_directory = checkpoint_directory
+        self._checkpoint_budget_bytes = checkpoint_budget_bytes
+        self._checkpoint_ttl_seconds = checkpoint_ttl_seconds
+        self._version_manager = GameStateVersionManager(self.game_state, transaction_mode=transaction_mode)
+        self._facade = SimulatedGameState(self._version_manager)
+        self._checkpoint_manager: Optional[StateCheckpointManager] = None
+        self._snapshot_store = SnapshotStore(self._version_manager)
+
+    @property
+    def session_id(self) -> str:
+        return self._session_id
+
+    @property
+    def game_state(self) -> GameState:
+        return GameStateSingleton.get_instance(self._session_id)
+
+    @property
+    def version_manager(self) -> GameStateVersionManager:
+        return self._version_manager
+
+    @property
+    def facade(self) -> SimulatedGameState:
+        return self._facade
+
+    @property
+    def id_allocator(self) -> IdAllocator:
+        return get_id_allocator(self._session_id)
+
+    @property
+    def snapshot_store(self) -> SnapshotStore:
+        return self._snapshot_store
+
+    @property
+    def checkpoint_db_path(self) -> Optional[str]:
+        """File of the persisted checkpoints, None when they are only kept in memory."""
+        if self._checkpoint_directory is None:
+            return None
+        # Session ids come from the clients: hash them instead of using them as file names.
+        file_name = hashlib.sha256(self._session_id.encode()).hexdigest()[:32]
+        return os.path.join(self._checkpoint_directory, f"{file_name}.sqlite3")
+
+    def get_checkpoint_manager(self) -> StateCheckpointManager:
+        if self._checkpoint_manager is None:
+            backend = None
+            if self._checkpoint_directory is not None:
+                os.makedirs(self._checkpoint_directory, exist_ok=True)
+                backend = SQLiteCheckpointBackend(self.checkpoint_db_path)
+            factory = CheckpointManagerFactory()
+            self._checkpoint_manager = factory.create_manager(
+                self._facade,
+                operation_log=self._snapshot_store.operation_log,
+                checkpoint_store=CheckpointStore(
+                    budget_bytes=self._checkpoint_budget_bytes,
+                    ttl_seconds=self._checkpoint_ttl_seconds,
+                    backend=backend,
+                ),
+            )
+        return self._checkpoint_manager
+
+    def discard_checkpoints(self) -> None:
+        """Closes the checkpoint store and deletes the persisted checkpoints, if any."""
+        if self._checkpoint_manager is not None:
+            self._checkpoint_manager.close()
+        path = self.checkpoint_db_path
+        if path is not None:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+class WorldLimitError(RuntimeError):
+    """Raised when a new session needs a world but the registry is full of active ones."""
+
+    def __init__(self, max_worlds: int):
+        super().__init__(f"Too many active sessions (max {max_worlds}), try again later")
+        self.max_worlds = max_worlds
+
+
+class WorldRegistry:
+    """
+    Process-wide registry of isolated worlds keyed by session id.
+
+    Session ids come from the clients, so the registry holds at most `max_worlds`
+    worlds: worlds not used for `idle_seconds` are dropped to make room for new
+    sessions (never the default one), and when none is idle new sessions are refused.
+    """
+
+    _worlds: Dict[str, World] = {}
+    _last_used: Dict[str, float] = {}
+    _drop_listeners: List[Callable[[str], None]] = []
+    _lock = threading.Lock()
+    max_worlds: int = int(os.getenv("MAX_WORLDS", "64"))
+    idle_seconds: float = float(os.getenv("WORLD_IDLE_SECONDS", str(2 * 60 * 60)))
+    clock: Callable[[], float] = time.monotonic
+    default_transaction_mode: TransactionMode = "copy"
+    checkpoint_budget_bytes: int = DEFAULT_BUDGET_BYTES
+    checkpoint_ttl_seconds: float = DEFAULT_TTL_SECONDS
+    # Directory of the persisted checkpoints; None keeps them in memory only.
+    checkpoint_directory: Optional[str] = os.getenv("CHECKPOINT_STORE_DIR")
+
+    @classmethod
+    def get_world(cls, session_id: Optional[str] = None) -> World:
+        """Returns the world of `session_id` (the current session by default), creating it if needed."""
+        session_id = session_id or get_current_session_id()
+        world = cls._worlds.get(session_id)
+        if world is None:
+            evicted: List[Tuple[str, World]] = []
+            with cls._lock:
+                world = cls._worlds.get(session_id)
+                if world is None:
+                    if len(cls._worlds) >= cls.max_worlds:
+                        evicted = cls._pop_idle_worlds()
+                    if len(cls._worlds) >= cls.max_worlds:
+                        raise WorldLimitError(cls.max_worlds)
+                    world = cls._new_world(session_id)
+                    cls._worlds[session_id] = world
+            for evicted_id, evicted_world in evicted:
+                cls._release(evicted_id, evicted_world)
+        cls._last_used[session_id] = cls.clock()
+        return world
+
+    @classmethod
+    def _pop_idle_worlds(cls) -> List[Tuple[str, World]]:
+        """Unregisters (under the lock) the worlds idle for too long; the caller releases them."""
+        now = cls.clock()
+        idle = [
+            session_id for session_id in cls._worlds
+            if session_id != DEFAULT_SESSION_ID
+            and now - cls._last_used.get(session_id, now) >= cls.idle_seconds
+        ]
+        for session_id in idle:
+            cls._last_used.pop(session_id, None)
+        return [(session_id, cls._worlds.pop(session_id)) for session_id in idle]
+
+    @classmethod
+    def _new_world(cls, session_id: str) -> World:
+        return World(
+            session_id,
+            transaction_mode=cls.default_transaction_mode,
+            checkpoint_budget_bytes=cls.checkpoint_budget_bytes,
+            checkpoint_ttl_seconds=cls.checkpoint_ttl_seconds,
+            checkpoint_directory=cls.checkpoint_directory,
+        )
+
+    @classmethod
+    def has_world(cls, session_id: str) -> bool:
+        return session_id in cls._worlds
+
+    @classmethod
+    def reset_world(cls, session_id: Optional[str] = None) -> World:
+        """
+        Discards the transactions and checkpoints of a world and starts over from its
+        current GameState (the domain state itself is kept).
+        """
+        session_id = session_id or get_current_session_id()
+        with cls._lock:
+            previous = cls._worlds.get(session_id) or cls._new_world(session_id)
+            previous.discard_checkpoints()
+            world = cls._new_world(session_id)
+            cls._worlds[session_id] = world
+            cls._last_used[session_id] = cls.clock()
+        return world
+
+    @classmethod
+    def drop_world(cls, session_id: str) -> None:
+        """Removes a world and everything it owns."""
+        with cls._lock:
+            world = cls._worlds.pop(session_id, None)
+            cls._last_used.pop(session_id, None)
+        cls._release(session_id, world)
+
+    @classmethod
+    def _release(cls, session_id: str, world: Optional[World]) -> None:
+        if world is not None:
+            world.discard_checkpoints()
+        GameStateSingleton.remove_instance(session_id)
+        drop_id_allocator(session_id)
+        for listener in list(cls._drop_listeners):
+            listener(session_id)
+
+    @classmethod
+    def add_drop_listener(cls, listener: Callable[[str], None]) -> None:
+        """Registers a callback run with the session id of every dropped or evicted world."""
+        if listener not in cls._drop_listeners:
+            cls._drop_listeners.append(listener)
+
+    @classmethod
+    def session_ids(cls) -> List[str]:
+        return list(cls._worlds.keys())
@@ -69,6 +69,11 @@ class ToolGetNeighborsAtDistanceArgs(InjectedToolContext):
     max_distance: int = Field(..., description="Maximum distance (number of hops) to explore. Recommended 2-3.", ge=1, le=4)
 
 
+class ToolFindPathBetweenScenariosArgs(InjectedToolContext):
+    from_scenario_id: str = Field(..., description="ID of the scenario where the path starts.")
+    to_scenario_id: str = Field(..., description="ID of the scenario where the path ends.")
+
+
 class ToolListScenariosClusterSummaryArgs(InjectedToolContext):
     list_all_scenarios_in_each_cluster: bool = Field(
         default=False,  # Default gives a summary
@@ -502,45 +507,21 @@ def get_neighbors_at_distance(
         })
 
     output_lines = [f"Neighbors of '{scenario.name}' (ID: {scenario.id}) up to distance {max_distance}:"]
-    # BFS: (scenario_id, current_distance, path_description_list)
-    queue: List[Tuple[str, int, List[str]]] = [(scenario.id, 0, [])]
-    # Visited format: {scenario_id: distance_found_at} to find shortest paths
-    visited_at_dist: Dict[str, int] = {scenario.id: 0}
-    
+    read_only_map = simulated_state.read_only_map
     results_by_distance: Dict[int, List[str]] = {dist: [] for dist in range(1, max_distance + 1)}
+    # Cached by the map until its topology changes: only names and descriptions are read here.
+    neighborhood = read_only_map.get_neighbors_at_distance(scenario.id, max_distance)
+    for dist_level, level in enumerate(neighborhood, start=1):
+        for neighbor_id, current_id, conn_id in level:
+            neighbor_scenario = read_only_map.find_scenario(neighbor_id)
+            current_scenario = read_only_map.find_scenario(current_id)
+            conn = read_only_map.get_connection_by_id(conn_id)
+            direction = conn.get_direction_from(current_id)
+            connection_desc = f"from '{current_scenario.name}' (ID: {current_id}) via '{direction}' (connection type: {conn.connection_type})"
+            entry_str = f"- '{neighbor_scenario.name}' (ID: {neighbor_id}, Type: {neighbor_scenario.type}, Zone: {neighbor_scenario.zone}) reached {connection_desc}."
+            # Each connection appears once per level, so the entries are unique.
+            results_by_distance[dist_level].append(entry_str)
 
-    head = 0
-    while head < len(queue):
-        current_id, distance, _ = queue[head] 
-        head += 1
-
-        if distance >= max_distance: continue
-
-        current_scenario = simulated_state.read_only_map.find_scenario(current_id)
-        if not current_scenario or not current_scenario.connections:
-            continue
-
-        for direction, conn_id in current_scenario.connections.items():
-            if conn_id:
-                conn = simulated_state.read_only_map.get_connection(current_id, direction)
-                if conn is None:
-                    continue
-                neighbor_id = conn.get_other_scenario_id(current_id)
-                neighbor_scenario = simulated_state.read_only_map.find_scenario(neighbor_id)
-                if neighbor_scenario:
-                    # Process if not visited, or found via a shorter/equal path to add all connections at this distance
-                    if neighbor_id not in visited_at_dist or visited_at_dist[neighbor_id] >= distance + 1:
-                        if neighbor_id not in visited_at_dist : # Add to queue only if truly new or shorter path (for BFS structure)
-                            visited_at_dist[neighbor_id] = distance + 1
-                            if distance + 1 < max_distance : # Only add to queue if we need to explore further from it
-                                queue.append((neighbor_id, distance + 1, []))
-
-                    if visited_at_dist[neighbor_id] == distance + 1:  # ensure we only list it once per distance level from different paths
-                        connection_desc = f"from '{current_scenario.name}' (ID: {current_id}) via '{direction}' (connection type: {conn.connection_type})"
-                        entry_str = f"- '{neighbor_scenario.name}' (ID: {neighbor_id}, Type: {neighbor_scenario.type}, Zone: {neighbor_scenario.zone}) reached {connection_desc}."
-                        if entry_str not in results_by_distance[distance + 1]:  # Avoid duplicate entries if multiple paths lead at same shortest distance
-                            results_by_distance[distance + 1].append(entry_str)
-    
     has_results = False
     for dist_level in range(1, max_distance + 1):
         if results_by_distance[dist_level]:
@@ -560,6 +541,60 @@ def get_neighbors_at_distance(
             ]
         })
 
+@tool(args_schema=ToolFindPathBetweenScenariosArgs)
+def find_path_between_scenarios(
+    from_scenario_id: str,
+    to_scenario_id: str,
+    messages_field_to_update: Annotated[str, InjectedState("messages_field_to_update")], 
+    logs_field_to_update: Annotated[str, InjectedState("logs_field_to_update")],
+    tool_call_id: Annotated[str, InjectedToolCallId]
+) -> Command:
+    """(QUERY tool) Finds the shortest route (fewest connections) between two scenarios, listing every step and its direction. Use this to check how far apart two scenarios are."""
+    args = extract_tool_args(locals())
+
+    simulated_state = SimulatedGameStateSingleton.get_instance()
+    read_only_map = simulated_state.read_only_map
+    missing_ids = [scenario_id for scenario_id in (from_scenario_id, to_scenario_id) if not read_only_map.find_scenario(scenario_id)]
+    path = read_only_map.find_path(from_scenario_id, to_scenario_id, use_zone_heuristic=True) if not missing_ids else None
+    if path is None:
+        if missing_ids:
+            message = f"Scenario with ID '{missing_ids[0]}' does not exist."
+        else:
+            message = f"There is no path between '{from_scenario_id}' and '{to_scenario_id}': they are in different clusters."
+        return Command(update={
+            logs_field_to_update: [get_log_item("find_path_between_scenarios", args, True, False, message)],
+            messages_field_to_update: [
+                ToolMessage(
+                    get_observation(read_only_map.get_scenario_count(), "find_path_between_scenarios", False, message),
+                    tool_call_id=tool_call_id
+                )
+            ]
+        })
+
+    start = read_only_map.find_scenario(path[0])
+    lines = [f"Shortest path from '{start.name}' (ID: {start.id}) to '{to_scenario_id}': {len(path) - 1} step(s)."]
+    for step, (current_id, next_id) in enumerate(zip(path, path[1:]), start=1):
+        conn = next(
+            conn for conn in read_only_map.get_scenario_connections(current_id)
+            if conn.get_other_scenario_id(current_id) == next_id
+        )
+        next_scenario = read_only_map.find_scenario(next_id)
+        lines.append(
+            f"{step}. via '{conn.get_direction_from(current_id)}' (connection type: {conn.connection_type}) "
+            f"to '{next_scenario.name}' (ID: {next_id}, Zone: {next_scenario.zone})."
+        )
+    message = "\n".join(lines)
+
+    return Command(update={
+        logs_field_to_update: [get_log_item("find_path_between_scenarios", args, True, True, message)],
+        messages_field_to_update: [
+            ToolMessage(
+                get_observation(read_only_map.get_scenario_count(), "find_path_between_scenarios", True, message),
+                tool_call_id=tool_call_id
+            )
+        ]
+    })
+
 @tool(args_schema=ToolListScenariosClusterSummaryArgs)
 def list_scenarios_summary_per_cluster(
     tool_call_id: Annotated[str, InjectedToolCallId],
@@ -823,6 +858,7 @@ EXECUTORTOOLS = [
         delete_bidirectional_connection,
         get_scenario_details,
         get_neighbors_at_distance,
+        find_path_between_scenarios,
         list_scenarios_summary_per_cluster,
         find_scenarios_by_attribute,
         get_connection_details,
@@ -832,6 +868,7 @@ EXECUTORTOOLS = [
 
 VALIDATIONTOOLS = [
         get_neighbors_at_distance,
+        find_path_between_scenarios,
         list_scenarios_summary_per_cluster,
         find_scenarios_by_attribute,
         get_connection_details,
@@ -841,6 +878,7 @@ VALIDATIONTOOLS = [
 
 QUERYTOOLS = [
         get_neighbors_at_distance,
+        find_path_between_scenarios,
         list_scenarios_summary_per_cluster,
         find_scenarios_by_attribute,
         get_connection_details,
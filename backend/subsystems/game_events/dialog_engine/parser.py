@@ -20,7 +20,8 @@ message_counter = 0
 async def parse_and_stream_messages(
     raw_llm_stream: AsyncGenerator[str, None],
     speaker,
-    event
+    event,
+    game_state
 ) -> AsyncGenerator[str, None]:
     global message_counter
 
@@ -56,7 +57,7 @@ async def parse_and_stream_messages(
 
                 message_counter += 1
                 current_id = f"msg_{event.id}_{message_counter}"
-                event.add_message(PlayerChoiceMessage(
+                game_state.events.add_message_to_event(event.id, PlayerChoiceMessage(
                     actor_id=speaker.id, title=title, options=options))
 
                 yield "data: " + json.dumps({
@@ -94,7 +95,7 @@ async def parse_and_stream_messages(
 
                 # 3) Cerramos el bloque anterior si había contenido acumulado
                 if current_type and content_accum.strip():
-                    event.add_message(_build_message(current_type, speaker, content_accum.strip()))
+                    game_state.events.add_message_to_event(event.id, _build_message(current_type, speaker, content_accum.strip()))
                 content_accum = ""
 
                 # 4) Si es [end], terminamos la función
@@ -140,7 +141,7 @@ async def parse_and_stream_messages(
 
     # Al terminar el stream, añadimos el bloque final si queda contenido
     if current_type and content_accum.strip():
-        event.add_message(_build_message(current_type, speaker, content_accum.strip()))
+        game_state.events.add_message_to_event(event.id, _build_message(current_type, speaker, content_accum.strip()))
 
 def _build_message(msg_type, speaker, content):
     if msg_type == "dialogue":
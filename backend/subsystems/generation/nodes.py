@@ -7,7 +7,6 @@ from subsystems.image_generation.characters.create.orchestrator import get_creat
 from core_game.character.schemas import CharacterBaseModel
 from core_game.map.schemas import ScenarioModel, ScenarioImageGenerationTemplate
 from typing import Set, Optional, Tuple, List, Dict, Any
-from versioning.deltas.checkpoints.internal import InternalStateCheckpoint
 
 
 import os
@@ -28,21 +27,12 @@ def start_generation(state: GenerationGraphState):
     print("---ENTERING: START GENERATION NODE---")
     SimulatedGameStateSingleton.begin_transaction()
 
-    manager = SimulatedGameStateSingleton.get_checkpoint_manager()
-
-
-    checkpoint_id = manager.create_checkpoint(
-        checkpoint_type=InternalStateCheckpoint,
-        checkpoint_id="initial_generation_state" # Es buena práctica darle un ID legible
-    )
-
     if state.generation_progress_tracker is not None:
         seed_tracker = state.generation_progress_tracker.subtracker(NODE_WEIGHTS["seed"])
     else:
         seed_tracker = None
     
     return {
-        "initial_state_checkpoint_id": checkpoint_id,
         "seed_progress_tracker": seed_tracker,
     }
 
@@ -156,26 +146,25 @@ def post_process(state: GenerationGraphState):
         return {"finalized_with_success": False}
 
 
-def _get_entities_for_generation(checkpoint_id: str) -> Tuple[List[ScenarioModel], List[CharacterBaseModel]]:
+def _get_entities_for_generation() -> Tuple[List[ScenarioModel], List[CharacterBaseModel]]:
     """
-    Calculates the diff from the checkpoint and returns lists of scenarios
-    and characters that require image generation.
+    Returns the scenarios and characters that require image generation: the ones
+    added or visually modified since images were last generated (consumed from the
+    visual-dirty registry of the map and characters, no diff of the world needed).
     """
-    print("  - Calculating diff from checkpoint to find new/modified entities...")
-    manager = SimulatedGameStateSingleton.get_checkpoint_manager()
-    diff_result = manager.generate_internal_diff(from_id=checkpoint_id)
+    print("  - Collecting new/visually modified entities...")
     game_state = SimulatedGameStateSingleton.get_instance()
 
     # Process scenarios
-    added_scenario_ids = diff_result.scenarios.added
+    scenario_ids = sorted(game_state.map.pop_visual_dirty_ids())
     scenarios_to_process = [
-        s.get_scenario_model() for sid in added_scenario_ids 
+        s.get_scenario_model() for sid in scenario_ids
         if (s := game_state.read_only_map.find_scenario(sid)) is not None
     ]
 
-    added_character_ids = diff_result.characters.added
+    character_ids = sorted(game_state.characters.pop_visual_dirty_ids())
     characters_to_process = [
-        c.get_model() for cid in added_character_ids
+        c.get_model() for cid in character_ids
         if (c := game_state.read_only_characters.get_character(cid)) is not None
     ]
 
@@ -327,18 +316,13 @@ def generate_images(state: GenerationGraphState):
         state.generation_progress_tracker.update(NODE_WEIGHTS["seed"] + NODE_WEIGHTS["refinement"], "Generating images")
 
     load_dotenv()
-    checkpoint_id = state.initial_state_checkpoint_id
-    if not checkpoint_id:
-        print("  - ERROR: No initial state checkpoint ID found.")
-        return {"finalized_with_success": False}
-    
     scenarios_image_api_url = os.getenv("SCENARIOS_IMAGE_API_URL")
 
     if not scenarios_image_api_url:
         print("  - ERROR: SCENARIOS_IMAGE_API_URL environment variable not set.")
         return {"finalized_with_success": False}
 
-    scenarios_to_process, characters_to_process = _get_entities_for_generation(checkpoint_id)
+    scenarios_to_process, characters_to_process = _get_entities_for_generation()
 
     if not scenarios_to_process and not characters_to_process:
         print("  - No new or visually modified entities found. Skipping image generation.")
@@ -355,8 +339,6 @@ def finalize_generation_success(state: GenerationGraphState):
     """Final node for the generation workflow."""
     print("---ENTERING: FINALIZE GENERATION SUCCESS NODE---")
     SimulatedGameStateSingleton.commit()
-    if state.initial_state_checkpoint_id:
-        SimulatedGameStateSingleton.get_checkpoint_manager().delete_checkpoint(state.initial_state_checkpoint_id)
 
     if state.generation_progress_tracker is not None:
         state.generation_progress_tracker.update(1.0, "Finalizing generation successfully")
@@ -369,8 +351,6 @@ def finalize_generation_error(state: GenerationGraphState):
     """Final node for the generation workflow."""
     print("---ENTERING: FINALIZE GENERATION ERROR NODE---")
     SimulatedGameStateSingleton.rollback()
-    if state.initial_state_checkpoint_id:
-        SimulatedGameStateSingleton.get_checkpoint_manager().delete_checkpoint(state.initial_state_checkpoint_id)
     return {
         "finalized_with_success": False
     }
@@ -11,10 +11,6 @@ from subsystems.generation.seed.schemas.graph_state import SeedGenerationGraphSt
 from utils.progress_tracker import ProgressTracker
 
 class GenerationGraphState(RefinementLoopGraphState, SeedGenerationGraphState):
-    initial_state_checkpoint_id: Optional[str] = Field(
-        default=None,
-        description="The unique ID of the checkpoint created at the start of the generation process."
-    )
     generation_progress_tracker: Optional[ProgressTracker] = Field(
         default=None,
     )
@@ -16,6 +16,7 @@ from subsystems.agents.map_handler.tools.map_tools import (
     list_scenarios_summary_per_cluster,
     find_scenarios_by_attribute,
     get_neighbors_at_distance,
+    find_path_between_scenarios,
     finalize_simulation,
 )
 
@@ -123,6 +124,12 @@ if __name__ == "__main__":
         max_distance=3,
     ))
 
+    print(call(
+        find_path_between_scenarios,
+        from_scenario_id="scene_001",
+        to_scenario_id="scene_005",
+    ))
+
 
     # === FINALIZE ===
     print_step("Finalize Simulation")
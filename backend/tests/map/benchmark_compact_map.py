@@ -0,0 +1,67 @@
+"""
+Benchmark of the compact storage of large maps (GameMap.compact()) against the regular one:
+memory taken by the scenarios and time to copy and serialize the map.
+
+    python tests/map/benchmark_compact_map.py
+"""
+import copy
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.map.domain import GameMap
+from core_game.session_context import use_session
+from simulated.world_registry import WorldRegistry
+from tests.map.benchmark_map_topology import build_grid_map
+
+SIZES = (1_000, 10_000)
+
+
+def allocated_mb(operation: Callable[[], object]) -> float:
+    """Memory (MB) still allocated by `operation` once it returns (its result included)."""
+    gc.collect()
+    tracemalloc.start()
+    result = operation()
+    allocated = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def elapsed_ms(operation: Callable[[], object]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    operation()
+    return (time.perf_counter() - start) * 1e3
+
+
+def run_compact_map_benchmark() -> None:
+    print(f"{'scenarios':>10} | {'storage':<8} | {'scen. MB':>8} | {'B/scen.':>8} | {'deepcopy ms':>11} | {'to_model ms':>11} | {'json ms':>8}")
+    print("-" * 82)
+    for size in SIZES:
+        for compact in (False, True):
+            session_id = f"compact-benchmark-{size}-{compact}"
+            with use_session(session_id):
+                game_map = build_grid_map(size, compact=compact)
+                state = game_map.get_state()
+                # Scenarios of the same map loaded from a copy of its model, in each storage.
+                model = state.to_model()
+                allocated = allocated_mb(lambda: GameMap(model.model_copy(deep=True), compact=compact)._scenarios)
+                deepcopy_ms = elapsed_ms(lambda: copy.deepcopy(game_map))
+                to_model_ms = elapsed_ms(state.to_model)
+                json_ms = elapsed_ms(lambda: state.to_model().model_dump_json())
+                label = "compact" if compact else "regular"
+                print(
+                    f"{size:>10} | {label:<8} | {allocated:>8.1f} | {allocated * 2**20 / size:>8.0f} | "
+                    f"{deepcopy_ms:>11.1f} | {to_model_ms:>11.1f} | {json_ms:>8.1f}"
+                )
+            WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_compact_map_benchmark()
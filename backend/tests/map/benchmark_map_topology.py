@@ -0,0 +1,137 @@
+"""
+Benchmarks of map topology operations on grid maps (no LLM involved).
+
+    python tests/map/benchmark_map_topology.py
+"""
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.map.domain import GameMap
+from core_game.session_context import use_session
+from simulated.components.map import SimulatedMap
+from simulated.world_registry import WorldRegistry
+
+SIZES = (1_000, 10_000)
+DELETIONS = 500
+ISLAND_CONNECTIONS = 50
+# Builds of each size, per build mode: the median is reported.
+BUILD_REPEATS = 7
+
+
+def build_grid_map(scenarios: int, bulk: bool = True, compact: bool = False) -> SimulatedMap:
+    """
+    Map of `scenarios` scenarios on a square grid, each connected to its east and south neighbours.
+    Built in a single bulk update unless `bulk` is False; with `compact`, in compact storage.
+    """
+    game_map = SimulatedMap(GameMap(compact=compact))
+    with contextlib.ExitStack() as stack:
+        builder = stack.enter_context(game_map.bulk_update()) if bulk else game_map
+        ids = [
+            builder.create_scenario(
+                name=f"Scenario {index}",
+                summary_description="A place.",
+                visual_description="A place.",
+                narrative_context="Quiet.",
+                indoor_or_outdoor="outdoor",
+                type="street",
+                zone=f"zone {index % 12}",
+            ).id
+            for index in range(scenarios)
+        ]
+        width = max(1, int(scenarios ** 0.5))
+        for index in range(scenarios):
+            if (index + 1) % width != 0 and index + 1 < scenarios:
+                builder.create_bidirectional_connection(ids[index], "east", ids[index + 1], "road")
+            if index + width < scenarios:
+                builder.create_bidirectional_connection(ids[index], "south", ids[index + width], "road")
+    return game_map
+
+
+def add_islands(game_map: SimulatedMap, islands: int) -> None:
+    """Adds `islands` pairs of connected scenarios, disconnected from the rest of the map."""
+    for index in range(islands):
+        pair = [
+            game_map.create_scenario(
+                name=f"Island {index}",
+                summary_description="A remote place.",
+                visual_description="A remote place.",
+                narrative_context="Quiet.",
+                indoor_or_outdoor="outdoor",
+                type="island",
+                zone=f"zone {index % 12}",
+            ).id
+            for _ in range(2)
+        ]
+        game_map.create_bidirectional_connection(pair[0], "east", pair[1], "road")
+
+
+def time_each(operations: List[Callable[[], object]]) -> Dict[str, float]:
+    timings = []
+    for operation in operations:
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return {"median_us": statistics.median(timings), "max_us": max(timings)}
+
+
+def run_map_topology_benchmark() -> None:
+    print(f"{'scenarios':>10} | {'operation':<19} | {'median us':>10} | {'max us':>10}")
+    print("-" * 59)
+    for size in SIZES:
+        session_id = f"map-benchmark-{size}"
+        with use_session(session_id):
+            rng = random.Random(size)
+            # Interleaved, so both build modes see the same machine load.
+            builds: Dict[bool, List[float]] = {False: [], True: []}
+            for _ in range(BUILD_REPEATS):
+                for bulk in (False, True):
+                    start = time.perf_counter()
+                    game_map = build_grid_map(size, bulk=bulk)
+                    builds[bulk].append((time.perf_counter() - start) * 1e6)
+            for label, bulk in (("build", False), ("build (bulk)", True)):
+                print(f"{size:>10} | {label:<19} | {statistics.median(builds[bulk]):>10.1f} | {max(builds[bulk]):>10.1f}")
+            scenario_ids = list(game_map.get_state()._scenarios)
+
+            sample = rng.sample(scenario_ids, DELETIONS)
+            timings = time_each([lambda scenario_id=scenario_id: game_map.get_neighbor_ids(scenario_id) for scenario_id in sample])
+            print(f"{size:>10} | {'neighbors':<19} | {timings['median_us']:>10.1f} | {timings['max_us']:>10.1f}")
+
+            # The second pass over the same origins is answered from the neighbourhood cache.
+            for label in ("k-hop 4 (cold)", "k-hop 4 (cached)"):
+                timings = time_each([
+                    lambda scenario_id=scenario_id: game_map.get_neighbors_at_distance(scenario_id, 4) for scenario_id in sample
+                ])
+                print(f"{size:>10} | {label:<19} | {timings['median_us']:>10.1f} | {timings['max_us']:>10.1f}")
+
+            pairs = list(zip(sample, sample[1:] + sample[:1]))
+            for label in ("path (cold)", "path (cached)"):
+                timings = time_each([lambda pair=pair: game_map.find_path(*pair) for pair in pairs])
+                print(f"{size:>10} | {label:<19} | {timings['median_us']:>10.1f} | {timings['max_us']:>10.1f}")
+
+            timings = time_each([lambda scenario_id=scenario_id: game_map.delete_scenario(scenario_id) for scenario_id in sample])
+            print(f"{size:>10} | {'delete_scenario':<19} | {timings['median_us']:>10.1f} | {timings['max_us']:>10.1f}")
+
+            # Islands of two scenarios, connected back to the main cluster one by one.
+            for strategy in ("random", "nearest_zone", "fewest_exits"):
+                forked = game_map.fork()
+                add_islands(forked, ISLAND_CONNECTIONS)
+                operations = [
+                    lambda: forked.connect_largest_island_to_main_cluster(strategy)
+                    for _ in range(len(forked.get_outside_clusters()))
+                ]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    timings = time_each(operations)
+                print(f"{size:>10} | {'island ' + strategy:<19} | {timings['median_us']:>10.1f} | {timings['max_us']:>10.1f}")
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_map_topology_benchmark()
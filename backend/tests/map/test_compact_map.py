@@ -0,0 +1,119 @@
+import os
+import random
+import sys
+from typing import List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.map.domain import Connection, GameMap, Scenario
+from core_game.map.schemas import ConnectionModel, ScenarioModel
+from core_game.session_context import use_session
+from simulated.components.map import SimulatedMap
+from simulated.world_registry import WorldRegistry
+from tests.map.test_map_indexes import assert_indexes_match, random_operation
+from versioning.layers.journal import UndoJournal
+
+
+def assert_same_map(compact: GameMap, regular: GameMap) -> None:
+    """Same content, in the same order, and the same indexes."""
+    assert compact.is_compact and not regular.is_compact
+    assert compact.to_model().model_dump_json() == regular.to_model().model_dump_json()
+    assert compact.get_all_clusters() == regular.get_all_clusters()
+
+
+def edit_both(maps: List[GameMap], rng: random.Random, step: int) -> None:
+    """The same edit on each map (entities created with explicit ids, so they match)."""
+    scenario_ids = list(maps[0].to_model().scenarios)
+    operation = rng.random()
+    if operation < 0.3:
+        model = ScenarioModel(
+            id=f"added_{step}", name=f"Added {step}", summary_description="A place.", visual_description="A place.",
+            narrative_context="Quiet.", indoor_or_outdoor="indoor", type="cellar", zone="Harbor",
+        )
+        for game_map in maps:
+            game_map.add_scenario(Scenario(model.model_copy(deep=True)))
+    elif operation < 0.6:
+        scenario_a, scenario_b = rng.sample(scenario_ids, 2)
+        model = ConnectionModel(
+            id=f"added_connection_{step}", scenario_a_id=scenario_a, scenario_b_id=scenario_b,
+            direction_from_a=rng.choice(("north", "south", "east", "west")), connection_type="road",
+        )
+        for game_map in maps:
+            game_map.add_connection(Connection(model.model_copy(deep=True)))
+    elif operation < 0.8:
+        scenario_id, zone = rng.choice(scenario_ids), rng.choice(("Harbor", "Woods"))
+        for game_map in maps:
+            game_map.modify_scenario(scenario_id, new_zone=zone, new_summary_description=f"Edited {step}.")
+    else:
+        scenario_id = rng.choice(scenario_ids)
+        for game_map in maps:
+            game_map.delete_scenario(scenario_id)
+
+
+def run_compact_map_test():
+    """A compact map serializes, versions, undoes and copies exactly like the same map in regular storage."""
+    session_id = "compact-map"
+    try:
+        with use_session(session_id):
+            for seed in range(4):
+                rng = random.Random(seed)
+                builder = SimulatedMap(GameMap())
+                scenario_ids: List[str] = []
+                for _ in range(200):
+                    random_operation(builder, rng, scenario_ids)
+                regular = builder.get_state()
+                compact = regular.copy()
+                compact.compact()
+                assert compact._scenarios.materialized_count == 0
+                assert compact.get_entity_versions() == regular.get_entity_versions()
+                assert_same_map(compact, regular)
+
+                # Deleting packed scenarios and undoing it puts them back in their place.
+                before, versions = regular.to_model().model_dump_json(), regular.get_entity_versions()
+                journals = [UndoJournal(), UndoJournal()]
+                for game_map, journal in zip((compact, regular), journals):
+                    game_map.attach_journal(journal)
+                for scenario_id in rng.sample(list(regular.to_model().scenarios), 10):
+                    for game_map in (compact, regular):
+                        game_map.delete_scenario(scenario_id)
+                assert_same_map(compact, regular)
+                for game_map, journal in zip((compact, regular), journals):
+                    game_map.attach_journal(None)
+                    journal.undo()
+                assert_same_map(compact, regular)
+                assert regular.to_model().model_dump_json() == before
+                assert compact.get_entity_versions() == regular.get_entity_versions() == versions
+
+                # The same edits, on packed, materialized and added scenarios alike.
+                for step in range(80):
+                    edit_both([compact, regular], rng, step)
+                assert_same_map(compact, regular)
+                assert set(compact.get_entity_versions()["scenario"]) == set(regular.get_entity_versions()["scenario"])
+                assert_indexes_match(compact, rng)
+
+                # A copy is independent both ways and leaves the source as it was.
+                ownership = (compact._scenario_tracker.owned_ids, compact._connection_tracker.owned_ids)
+                copied = compact.copy()
+                assert (compact._scenario_tracker.owned_ids, compact._connection_tracker.owned_ids) == ownership
+                assert copied.get_entity_versions() == compact.get_entity_versions()
+                assert copied.to_model().model_dump_json() == compact.to_model().model_dump_json()
+                copied_before = copied.to_model().model_dump_json()
+                for step in range(80, 120):
+                    edit_both([compact, regular], rng, step)
+                assert copied.to_model().model_dump_json() == copied_before
+                compact_before = compact.to_model().model_dump_json()
+                edit_both([copied, GameMap(copied.to_model())], rng, 120)
+                assert compact.to_model().model_dump_json() == compact_before
+
+                # Repacking keeps the content and the versions.
+                versions = compact.get_entity_versions()
+                compact.compact()
+                assert compact.get_entity_versions() == versions
+                assert_same_map(compact, regular)
+        print("Compact map test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_compact_map_test()
@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.map.domain import Connection, GameMap
+from core_game.map.schemas import ConnectionModel
+from core_game.session_context import use_session
+from simulated.components.map import SimulatedMap
+from simulated.world_registry import WorldRegistry
+from tests.map.test_map_indexes import assert_indexes_match, random_operation
+
+
+def observe(game_map: GameMap) -> tuple:
+    """Content, versions, indexes and pending dirty/visual ids of a map."""
+    scenario_ids = list(game_map.to_model().scenarios)
+    return (
+        game_map.to_model().model_dump_json(),
+        game_map.get_entity_versions(),
+        game_map.topology_version,
+        game_map.get_all_clusters(),
+        {scenario_id: {connection.id for connection in game_map.get_scenario_connections(scenario_id)} for scenario_id in scenario_ids},
+        {direction: set(ids) for direction, ids in game_map.get_free_exits(scenario_ids).items()},
+        [scenario.id for scenario in game_map.find_scenarios_by_attribute("zone", "harbor")],
+        set(game_map._scenario_tracker.dirty_ids),
+        set(game_map._connection_tracker.dirty_ids),
+        dict(game_map._scenario_tracker.visual_baseline),
+    )
+
+
+def run_map_bulk_update_test():
+    """A bulk update that raises, or whose connections do not validate, leaves the map as it was."""
+    session_id = "map-bulk-update"
+    try:
+        with use_session(session_id):
+            rng = random.Random(0)
+            game_map = SimulatedMap(GameMap())
+            scenario_ids = []
+            for _ in range(150):
+                random_operation(game_map, rng, scenario_ids)
+            state = game_map.get_state()
+            before = observe(state)
+
+            # An exception raised inside the block.
+            try:
+                with game_map.bulk_update() as staged:
+                    staged_ids = list(scenario_ids)
+                    for _ in range(60):
+                        random_operation(staged, rng, staged_ids)
+                    staged.modify_scenario(staged_ids[0], new_visual_description="Flooded.")
+                    raise RuntimeError("generation failed")
+            except RuntimeError:
+                pass
+            assert observe(state) == before
+
+            # A connection that does not validate when the block ends.
+            try:
+                with state.bulk_update() as staged:
+                    free_a = next(scenario_id for scenario_id in scenario_ids if staged.find_scenario(scenario_id).connections["north"] is None)
+                    free_b = next(scenario_id for scenario_id in scenario_ids if scenario_id != free_a and staged.find_scenario(scenario_id).connections["south"] is None)
+                    connection = staged.add_connection(Connection(ConnectionModel(
+                        scenario_a_id=free_a, scenario_b_id=free_b, direction_from_a="north", connection_type="road",
+                    )))
+                    assert connection is not None
+                    staged.delete_scenario(scenario_ids[-1])
+                    staged._scenario_for_write(free_b).connections["south"] = None
+                raise AssertionError("the broken connection must not validate")
+            except ValueError:
+                pass
+            assert observe(state) == before
+
+            # A block that ends normally applies everything, with the indexes rebuilt.
+            with game_map.bulk_update() as staged:
+                for _ in range(60):
+                    random_operation(staged, rng, scenario_ids)
+            assert observe(state) != before
+            assert_indexes_match(state, rng)
+        print("Map bulk update test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_map_bulk_update_test()
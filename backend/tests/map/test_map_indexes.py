@@ -0,0 +1,151 @@
+import os
+import random
+import sys
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.map.constants import OppositeDirections
+from core_game.map.domain import GameMap
+from core_game.map.schemas import GameMapModel
+from core_game.session_context import use_session
+from simulated.components.map import SimulatedMap
+from simulated.world_registry import WorldRegistry
+
+DIRECTIONS = list(OppositeDirections)
+TYPES = ("street", "tavern", "forest")
+ZONES = ("Harbor", "Old town", "Woods")
+
+
+def random_operation(game_map: SimulatedMap, rng: random.Random, scenario_ids: List[str]) -> None:
+    """Adds or deletes a scenario or a connection, or changes the attributes of a scenario."""
+    operation = rng.random()
+    if operation < 0.2 or len(scenario_ids) < 3:
+        scenario_ids.append(game_map.create_scenario(
+            name=f"Place {rng.randint(0, 30)}",
+            summary_description="A place.",
+            visual_description="A place.",
+            narrative_context="Quiet.",
+            indoor_or_outdoor=rng.choice(("indoor", "outdoor")),
+            type=rng.choice(TYPES),
+            zone=rng.choice(ZONES),
+        ).id)
+    elif operation < 0.75:
+        scenario_a, scenario_b = rng.sample(scenario_ids, 2)
+        try:
+            game_map.create_bidirectional_connection(scenario_a, rng.choice(DIRECTIONS), scenario_b, "road")
+        except (ValueError, KeyError):
+            pass
+    elif operation < 0.87:
+        scenario_id = rng.choice(scenario_ids)
+        directions = [direction for direction, connection_id in game_map.find_scenario(scenario_id).connections.items() if connection_id]
+        if directions:
+            game_map.delete_bidirectional_connection(scenario_id, rng.choice(directions))
+    elif operation < 0.93:
+        scenario_id = rng.choice(scenario_ids)
+        game_map.delete_scenario(scenario_id)
+        scenario_ids.remove(scenario_id)
+    else:
+        game_map.modify_scenario(rng.choice(scenario_ids), new_zone=rng.choice(ZONES), new_name=f"Place {rng.randint(0, 30)}")
+
+
+def adjacency_of(model: GameMapModel) -> Dict[str, Set[str]]:
+    adjacency: Dict[str, Set[str]] = {scenario_id: set() for scenario_id in model.scenarios}
+    for connection in model.connections.values():
+        adjacency[connection.scenario_a_id].add(connection.scenario_b_id)
+        adjacency[connection.scenario_b_id].add(connection.scenario_a_id)
+    return adjacency
+
+
+def full_traversal_clusters(model: GameMapModel) -> List[Set[str]]:
+    """Connected components, by a traversal of the whole map started from each scenario in map order."""
+    adjacency = adjacency_of(model)
+    clusters: List[Set[str]] = []
+    seen: Set[str] = set()
+    for scenario_id in model.scenarios:
+        if scenario_id in seen:
+            continue
+        cluster, pending = {scenario_id}, [scenario_id]
+        while pending:
+            for other_id in adjacency[pending.pop()] - cluster:
+                cluster.add(other_id)
+                pending.append(other_id)
+        seen |= cluster
+        clusters.append(cluster)
+    return clusters
+
+
+def shortest_distance(adjacency: Dict[str, Set[str]], from_id: str, to_id: str) -> Optional[int]:
+    distances = {from_id: 0}
+    pending = deque([from_id])
+    while pending:
+        scenario_id = pending.popleft()
+        if scenario_id == to_id:
+            return distances[scenario_id]
+        for other_id in adjacency[scenario_id]:
+            if other_id not in distances:
+                distances[other_id] = distances[scenario_id] + 1
+                pending.append(other_id)
+    return None
+
+
+def assert_indexes_match(game_map: GameMap, rng: random.Random) -> None:
+    """Every index-backed query equals the same query answered by brute force from the map model."""
+    model = game_map.to_model()
+    assert game_map.get_all_clusters() == full_traversal_clusters(model)
+
+    for scenario_id, scenario in model.scenarios.items():
+        expected = {connection.id for connection in model.connections.values() if scenario_id in (connection.scenario_a_id, connection.scenario_b_id)}
+        assert {connection.id for connection in game_map.get_scenario_connections(scenario_id)} == expected
+
+    group = rng.sample(list(model.scenarios), min(10, len(model.scenarios)))
+    free_exits = {direction: set(ids) for direction, ids in game_map.get_free_exits(group).items() if ids}
+    expected_free = {
+        direction: {scenario_id for scenario_id in group if model.scenarios[scenario_id].connections.get(direction) is None}
+        for direction in DIRECTIONS
+    }
+    assert free_exits == {direction: ids for direction, ids in expected_free.items() if ids}
+
+    for attribute, value in (("type", rng.choice(TYPES).upper()), ("zone", rng.choice(ZONES).lower()),
+                             ("indoor_or_outdoor", "indoor"), ("name_contains", str(rng.randint(0, 9)))):
+        if attribute == "name_contains":
+            expected_ids = [scenario_id for scenario_id, scenario in model.scenarios.items() if value in scenario.name.lower()]
+        else:
+            expected_ids = [scenario_id for scenario_id, scenario in model.scenarios.items() if getattr(scenario, attribute).lower() == value.lower()]
+        assert [scenario.id for scenario in game_map.find_scenarios_by_attribute(attribute, value)] == expected_ids
+
+    adjacency = adjacency_of(model)
+    for _ in range(10):
+        from_id, to_id = rng.choice(list(model.scenarios)), rng.choice(list(model.scenarios))
+        distance = shortest_distance(adjacency, from_id, to_id)
+        for use_zone_heuristic in (False, True):
+            path = game_map.find_path(from_id, to_id, use_zone_heuristic=use_zone_heuristic)
+            if distance is None:
+                assert path is None
+                continue
+            assert len(path) - 1 == distance and path[0] == from_id and path[-1] == to_id
+            assert all(second in adjacency[first] for first, second in zip(path, path[1:]))
+
+
+def run_map_indexes_test():
+    """Clusters, connections by scenario, free exits, attributes and paths match brute force after random edits."""
+    session_id = "map-indexes"
+    try:
+        with use_session(session_id):
+            for seed in range(8):
+                rng = random.Random(seed)
+                game_map = SimulatedMap(GameMap())
+                scenario_ids: List[str] = []
+                for step in range(400):
+                    random_operation(game_map, rng, scenario_ids)
+                    if step % 5 == 0:
+                        assert_indexes_match(game_map.get_state(), rng)
+                assert_indexes_match(game_map.get_state(), rng)
+        print("Map indexes test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_map_indexes_test()
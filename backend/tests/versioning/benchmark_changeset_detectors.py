@@ -0,0 +1,96 @@
+import os
+import statistics
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.character.schemas import (
+    IdentityModel,
+    PhysicalAttributesModel,
+    PsychologicalAttributesModel,
+    KnowledgeModel,
+    DynamicStateModel,
+    NarrativeWeightModel,
+    NonPlayerCharacterModel,
+)
+from core_game.map.schemas import ScenarioModel
+from versioning.deltas.detectors.changeset.characters.entity import CharacterDetector
+from versioning.deltas.detectors.changeset.map.entity import ScenarioDetector
+from versioning.deltas.detectors.changeset.compiler import compile_detector
+
+ENTITIES = 5_000
+# Timings are the median of this many runs of every entity pair.
+REPEATS = 15
+
+def build_npc(i: int) -> NonPlayerCharacterModel:
+    return NonPlayerCharacterModel(
+        identity=IdentityModel(full_name=f"npc {i}", age=20 + i % 50, gender="other", profession="farmer", species="human", alignment="neutral"),
+        physical=PhysicalAttributesModel(appearance="tall", visual_prompt="tall farmer", distinctive_features=["scar"], clothing_style=None, characteristic_items=["hoe"]),
+        psychological=PsychologicalAttributesModel(personality_summary="calm", personality_tags=["calm"], motivations=["harvest"], values=["family"], backstory="Born here.", quirks=[]),
+        knowledge=KnowledgeModel(),
+        dynamic_state=DynamicStateModel(),
+        narrative=NarrativeWeightModel(narrative_role="extra", current_narrative_importance="minor", narrative_purposes=[]),
+        present_in_scenario=f"scenario_{i % 100}",
+    )
+
+def build_scenario(i: int) -> ScenarioModel:
+    return ScenarioModel(
+        name=f"scenario {i}",
+        visual_description="A field.",
+        narrative_context="Quiet.",
+        summary_description="Field",
+        indoor_or_outdoor="outdoor",
+        type="field",
+        zone=f"zone {i % 10}",
+    )
+
+def modified_pairs(models, modify):
+    """Pairs every model with a copy where one entity out of four was modified."""
+    pairs = []
+    for i, model in enumerate(models):
+        new = model.model_copy(deep=True)
+        if i % 4 == 0:
+            modify(i, new)
+        pairs.append((model, new))
+    return pairs
+
+def modify_npc(i: int, npc: NonPlayerCharacterModel) -> None:
+    npc.identity.age += 1
+    npc.dynamic_state.current_emotion = "angry"
+    if i % 8 == 0:
+        npc.present_in_scenario = None
+
+def modify_scenario(i: int, scenario: ScenarioModel) -> None:
+    scenario.summary_description = "Burnt field"
+    if i % 8 == 0:
+        scenario.connections["north"] = f"connection_{i}"
+
+def run_changeset_detector_benchmark():
+    cases = [
+        ("character", CharacterDetector(), modified_pairs([build_npc(i) for i in range(ENTITIES)], modify_npc)),
+        ("scenario", ScenarioDetector(), modified_pairs([build_scenario(i) for i in range(ENTITIES)], modify_scenario)),
+    ]
+    print(f"Median of {REPEATS} runs over {ENTITIES} pairs (one entity out of four modified)")
+    print(f"{'detector':>10} | {'interpreted us':>15} | {'compiled us':>12} | {'speedup':>8}")
+    print("-" * 55)
+    for name, detector, pairs in cases:
+        compiled = compile_detector(detector)
+        for old, new in pairs:
+            assert detector.detect(old, new) == compiled.detect(old, new)
+
+        def interpreted_run():
+            for old, new in pairs:
+                detector.detect(old, new)
+
+        def compiled_run():
+            for old, new in pairs:
+                compiled.detect(old, new)
+
+        interpreted = statistics.median(timeit.repeat(interpreted_run, number=1, repeat=REPEATS)) / len(pairs) * 1e6
+        flat = statistics.median(timeit.repeat(compiled_run, number=1, repeat=REPEATS)) / len(pairs) * 1e6
+        print(f"{name:>10} | {interpreted:>15.2f} | {flat:>12.2f} | {interpreted / flat:>7.1f}x")
+        assert flat < interpreted, f"compiled {name} detector is not faster than the interpreted one"
+
+if __name__ == "__main__":
+    run_changeset_detector_benchmark()
@@ -0,0 +1,49 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from simulated.singleton import SimulatedGameStateSingleton
+
+ACCESSES_PER_RUN = 10_000
+DEPTHS = [1, 2, 4, 8, 16, 32, 64]
+
+def build_stack(depth: int):
+    """Opens `depth` nested transactions; only the bottom one writes to the map."""
+    SimulatedGameStateSingleton.reset_instance()
+    state = SimulatedGameStateSingleton.get_instance()
+    SimulatedGameStateSingleton.begin_transaction()
+    state.map.create_scenario(
+        name="Bench",
+        summary_description="Benchmark scenario",
+        visual_description="Plain.",
+        narrative_context="None",
+        indoor_or_outdoor="indoor",
+        type="bench",
+        zone="bench",
+    )
+    for _ in range(depth - 1):
+        SimulatedGameStateSingleton.begin_transaction()
+    return state
+
+def run_layer_depth_benchmark():
+    print(f"{'depth':>6} | {'ns / read_only_* access':>24}")
+    print("-" * 33)
+    for depth in DEPTHS:
+        state = build_stack(depth)
+
+        def access():
+            state.read_only_map
+            state.read_only_characters
+            state.read_only_events
+            state.read_only_narrative
+
+        elapsed = min(timeit.repeat(access, number=ACCESSES_PER_RUN, repeat=5))
+        print(f"{depth:>6} | {elapsed / (ACCESSES_PER_RUN * 4) * 1e9:>24.1f}")
+
+        for _ in range(depth):
+            SimulatedGameStateSingleton.rollback()
+
+if __name__ == "__main__":
+    run_layer_depth_benchmark()
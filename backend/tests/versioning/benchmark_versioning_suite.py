@@ -0,0 +1,215 @@
+"""
+Benchmark suite of the versioning and diffing machinery on synthetic worlds.
+
+Times transactions (begin/commit/rollback), checkpoint creation, changeset and internal
+diff generation and the full-state payload at several world sizes, and writes the
+results as JSON. With --baseline, operations whose median got slower than the baseline
+by more than --tolerance are reported and the script exits with status 1.
+
+    python tests/versioning/benchmark_versioning_suite.py --sizes small,medium --output results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from api.services import game_state as game_state_service
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from versioning.deltas.checkpoints.changeset import ChangesetCheckpoint
+from versioning.deltas.checkpoints.internal import InternalStateCheckpoint
+from tests.versioning.synthetic_world import SIZES, build_synthetic_world
+
+DEFAULT_REPEAT = 7
+
+
+def measure(operation: Callable[[], object], setup: Optional[Callable[[], None]] = None, repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """Runs `operation` `repeat` times (after `setup`, which is not timed) and returns timings in ms."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(timings), "median_ms": statistics.median(timings), "max_ms": max(timings)}
+
+
+def run_size(size: str, repeat: int, seed: int) -> List[Dict[str, object]]:
+    scenarios, connections, characters, events = SIZES[size]
+    session_id = f"benchmark-{size}"
+    results: List[Dict[str, object]] = []
+
+    with use_session(session_id):
+        try:
+            build_start = time.perf_counter()
+            ids = build_synthetic_world(scenarios, connections, characters, events, seed=seed)
+            build_ms = (time.perf_counter() - build_start) * 1000
+
+            state = SimulatedGameStateSingleton.get_instance()
+            manager = SimulatedGameStateSingleton.get_checkpoint_manager()
+            snapshots = SimulatedGameStateSingleton.get_snapshot_store()
+            scenario_ids = ids["scenarios"]
+            edits = iter(range(10**9))
+
+            def edit_one() -> None:
+                """Commits a one-scenario edit, so every diff below sees a new version."""
+                index = next(edits)
+                SimulatedGameStateSingleton.begin_transaction()
+                state.map.modify_scenario(scenario_ids[index % len(scenario_ids)], new_summary_description=f"Edited {index}.")
+                SimulatedGameStateSingleton.commit()
+
+            def begin_commit() -> None:
+                SimulatedGameStateSingleton.begin_transaction()
+                state.map.modify_scenario(scenario_ids[0], new_name=f"Committed {next(edits)}")
+                SimulatedGameStateSingleton.commit()
+
+            def begin_rollback() -> None:
+                SimulatedGameStateSingleton.begin_transaction()
+                state.map.modify_scenario(scenario_ids[0], new_name="Rolled back")
+                SimulatedGameStateSingleton.rollback()
+
+            def create_and_delete(checkpoint_type) -> Callable[[], None]:
+                def operation() -> None:
+                    manager.delete_checkpoint(manager.create_checkpoint(checkpoint_type))
+                return operation
+
+            # Snapshot checkpoint taken before the edit of every repetition (log-based diff).
+            snapshot_checkpoint: Dict[str, str] = {}
+
+            def prepare_snapshot_changeset() -> None:
+                if "id" in snapshot_checkpoint:
+                    manager.delete_checkpoint(snapshot_checkpoint["id"])
+                with snapshots.pinned() as snapshot:
+                    snapshot_checkpoint["id"] = manager.create_checkpoint(ChangesetCheckpoint, state=snapshot)
+                edit_one()
+
+            def snapshot_changeset() -> None:
+                with snapshots.pinned() as snapshot:
+                    manager.generate_changeset(from_id=snapshot_checkpoint["id"], state=snapshot)
+
+            # Two live-state checkpoints around an edit (full detector pass).
+            live_checkpoints: Dict[str, str] = {}
+
+            def prepare_checkpoint_changeset() -> None:
+                for checkpoint_id in live_checkpoints.values():
+                    manager.delete_checkpoint(checkpoint_id)
+                live_checkpoints["from"] = manager.create_checkpoint(ChangesetCheckpoint)
+                edit_one()
+                live_checkpoints["to"] = manager.create_checkpoint(ChangesetCheckpoint)
+
+            def checkpoint_changeset() -> None:
+                manager.generate_changeset(from_id=live_checkpoints["from"], to_id=live_checkpoints["to"])
+
+            internal_checkpoint: Dict[str, str] = {}
+
+            def prepare_internal_diff() -> None:
+                if "id" in internal_checkpoint:
+                    manager.delete_checkpoint(internal_checkpoint["id"])
+                internal_checkpoint["id"] = manager.create_checkpoint(InternalStateCheckpoint)
+                edit_one()
+
+            def internal_diff() -> None:
+                manager.generate_internal_diff(from_id=internal_checkpoint["id"])
+
+            def full_state() -> None:
+                response = game_state_service.get_full_game_state()
+                manager.delete_checkpoint(response["checkpoint_id"])
+
+            operations = [
+                ("begin_commit", begin_commit, None),
+                ("begin_rollback", begin_rollback, None),
+                ("create_changeset_checkpoint", create_and_delete(ChangesetCheckpoint), edit_one),
+                ("create_internal_checkpoint", create_and_delete(InternalStateCheckpoint), edit_one),
+                ("changeset_from_snapshot", snapshot_changeset, prepare_snapshot_changeset),
+                ("changeset_between_checkpoints", checkpoint_changeset, prepare_checkpoint_changeset),
+                ("internal_diff", internal_diff, prepare_internal_diff),
+                ("full_state", full_state, edit_one),
+            ]
+
+            results.append({"size": size, "operation": "build_world", "min_ms": build_ms, "median_ms": build_ms, "max_ms": build_ms})
+            for name, operation, setup in operations:
+                # The domain code prints progress messages; keep them out of the report.
+                with contextlib.redirect_stdout(io.StringIO()):
+                    timings = measure(operation, setup, repeat)
+                results.append({"size": size, "operation": name, **timings})
+        finally:
+            WorldRegistry.drop_world(session_id)
+
+    for result in results:
+        result.update(scenarios=scenarios, connections=connections, characters=characters, events=events)
+    return results
+
+
+def compare(results: List[Dict[str, object]], baseline_path: str, tolerance: float) -> List[str]:
+    """Returns a message for every operation slower than in the baseline by more than `tolerance`."""
+    with open(baseline_path) as baseline_file:
+        baseline = {(r["size"], r["operation"]): r for r in json.load(baseline_file)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["size"], result["operation"]))
+        if previous is None or result["operation"] == "build_world":
+            continue
+        if result["median_ms"] > previous["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result['size']}/{result['operation']}: {previous['median_ms']:.2f} ms -> {result['median_ms']:.2f} ms"
+            )
+    return regressions
+
+
+def run_versioning_benchmark_suite(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="small,medium", help=f"Comma separated, among: {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Path of the JSON results (stdout when omitted)")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown over the baseline median (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, object]] = []
+    for size in args.sizes.split(","):
+        size = size.strip()
+        if size not in SIZES:
+            parser.error(f"Unknown size '{size}'")
+        with contextlib.redirect_stdout(io.StringIO()):
+            size_results = run_size(size, args.repeat, args.seed)
+        for result in size_results:
+            print(f"{size:>7} | {result['operation']:<30} | {result['median_ms']:>10.2f} ms", file=sys.stderr)
+        results.extend(size_results)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_versioning_benchmark_suite())
@@ -0,0 +1,172 @@
+"""
+Deterministic synthetic worlds for benchmarks (no LLM involved).
+
+build_synthetic_world() fills the current world through the SimulatedGameState facade,
+inside one transaction, with scenarios laid out on a grid, connections between grid
+neighbours, a player plus NPCs spread over the scenarios and character interaction
+events. Texts have lengths similar to the generated ones. The same seed always builds
+the same world (ids included when the world starts empty).
+"""
+import os
+import random
+import sys
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.character.schemas import (
+    IdentityModel,
+    PhysicalAttributesModel,
+    PsychologicalAttributesModel,
+    KnowledgeModel,
+    NarrativeWeightModel,
+    NarrativePurposeModel,
+)
+from core_game.game_event.activation_conditions.schemas import CharacterInteractionOptionModel
+from simulated.singleton import SimulatedGameStateSingleton
+
+_WORDS = (
+    "old stone wooden narrow quiet crowded misty river market tower gate forest "
+    "lantern shadow merchant guard ancient broken golden hidden northern cold "
+    "bright smoke bridge harbor temple garden ruins wall road hill village"
+).split()
+
+# Word counts of the texts, close to what the generation agents write.
+TEXT_LENGTHS = {
+    "visual_description": 60,
+    "narrative_context": 45,
+    "summary_description": 12,
+    "appearance": 35,
+    "backstory": 80,
+    "event_description": 40,
+}
+
+# name: (scenarios, connections, characters, events)
+SIZES: Dict[str, tuple] = {
+    "small": (100, 150, 50, 20),
+    "medium": (1_000, 1_500, 500, 200),
+    "large": (5_000, 7_500, 2_500, 1_000),
+}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _grid_edges(scenarios: int, connections: int) -> List[tuple]:
+    """(from index, direction, to index) between east/south grid neighbours, row by row."""
+    width = max(1, int(scenarios ** 0.5))
+    edges = []
+    for index in range(scenarios):
+        if (index + 1) % width != 0 and index + 1 < scenarios:
+            edges.append((index, "east", index + 1))
+        if index + width < scenarios:
+            edges.append((index, "south", index + width))
+    return edges[:connections]
+
+
+def build_synthetic_world(
+    scenarios: int,
+    connections: int,
+    characters: int,
+    events: int,
+    seed: int = 0,
+) -> Dict[str, List[str]]:
+    """
+    Builds the world in the current session and commits it.
+    `connections` is capped at the number of grid neighbours (about 2 per scenario).
+    Returns the created ids by kind ('scenarios', 'connections', 'characters', 'events').
+    """
+    rng = random.Random(seed)
+    state = SimulatedGameStateSingleton.get_instance()
+    SimulatedGameStateSingleton.begin_transaction()
+
+    # The map is built in one bulk update: clusters and indexes are computed once.
+    with state.map.bulk_update() as game_map:
+        scenario_ids = []
+        for index in range(scenarios):
+            scenario = game_map.create_scenario(
+                name=f"{rng.choice(_WORDS).capitalize()} {rng.choice(_WORDS)} {index}",
+                summary_description=_text(rng, TEXT_LENGTHS["summary_description"]),
+                visual_description=_text(rng, TEXT_LENGTHS["visual_description"]),
+                narrative_context=_text(rng, TEXT_LENGTHS["narrative_context"]),
+                indoor_or_outdoor=rng.choice(["indoor", "outdoor"]),
+                type=rng.choice(["tavern", "street", "forest", "temple", "market"]),
+                zone=f"zone {index % 12}",
+            )
+            scenario_ids.append(scenario.id)
+
+        connection_ids = []
+        for origin, direction, destination in _grid_edges(scenarios, connections):
+            connection = game_map.create_bidirectional_connection(
+                scenario_ids[origin],
+                direction,
+                scenario_ids[destination],
+                rng.choice(["road", "door", "path", "bridge"]),
+                travel_description=_text(rng, 15),
+            )
+            connection_ids.append(connection.id)
+
+    character_ids = []
+    for index in range(characters):
+        identity = IdentityModel(
+            full_name=f"{rng.choice(_WORDS).capitalize()} {index}",
+            age=rng.randint(16, 80),
+            gender=rng.choice(["male", "female", "non-binary"]),
+            profession=rng.choice(["guard", "merchant", "priest", "farmer", "thief"]),
+            species="human",
+            alignment=rng.choice(["good", "neutral", "evil"]),
+        )
+        physical = PhysicalAttributesModel(
+            appearance=_text(rng, TEXT_LENGTHS["appearance"]),
+            visual_prompt=_text(rng, 20),
+            distinctive_features=[_text(rng, 4) for _ in range(3)],
+            clothing_style=_text(rng, 8),
+            characteristic_items=[_text(rng, 3) for _ in range(2)],
+        )
+        psychological = PsychologicalAttributesModel(
+            personality_summary=_text(rng, 20),
+            personality_tags=rng.sample(_WORDS, 4),
+            motivations=[_text(rng, 8) for _ in range(2)],
+            values=rng.sample(_WORDS, 3),
+            backstory=_text(rng, TEXT_LENGTHS["backstory"]),
+            quirks=[_text(rng, 6)],
+        )
+        if index == 0:
+            character = state.create_player(identity, physical, psychological, KnowledgeModel())
+        else:
+            character = state.characters.create_npc(
+                identity=identity,
+                physical=physical,
+                psychological=psychological,
+                narrative=NarrativeWeightModel(
+                    narrative_role=rng.choice(["extra", "secondary"]),
+                    current_narrative_importance=rng.choice(["minor", "secondary"]),
+                    narrative_purposes=[NarrativePurposeModel(mission=_text(rng, 10))],
+                ),
+                knowledge=KnowledgeModel(background_knowledge=[_text(rng, 12) for _ in range(3)]),
+            )
+        if scenario_ids:
+            state.place_character(character.id, scenario_ids[rng.randrange(len(scenario_ids))])
+        character_ids.append(character.id)
+
+    event_ids = []
+    npc_ids = character_ids[1:]
+    for index in range(events if npc_ids else 0):
+        npc_id = npc_ids[index % len(npc_ids)]
+        event = state.create_available_player_npc_conversation(
+            title=f"Talk {index}",
+            description=_text(rng, TEXT_LENGTHS["event_description"]),
+            npc_ids=[npc_id],
+            activation_conditions=[CharacterInteractionOptionModel(character_id=npc_id, menu_label=_text(rng, 6))],
+            source_beat_id=None,
+        )
+        event_ids.append(event.id)
+
+    SimulatedGameStateSingleton.commit()
+    return {
+        "scenarios": scenario_ids,
+        "connections": connection_ids,
+        "characters": character_ids,
+        "events": event_ids,
+    }
@@ -0,0 +1,71 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from versioning.deltas.backends.sqlite import SQLiteCheckpointBackend
+from versioning.deltas.checkpoints.changeset import ChangesetCheckpoint
+from versioning.deltas.factory import CheckpointManagerFactory
+from versioning.deltas.store import CheckpointStore
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+def _expect_not_found(call) -> None:
+    try:
+        call()
+    except RuntimeError:
+        return
+    raise AssertionError("expected the checkpoint not to be found")
+
+
+def run_checkpoint_handles_test():
+    """Clients sharing a snapshot checkpoint each release their own handle, once."""
+    WorldRegistry.checkpoint_directory = tempfile.mkdtemp()
+    session_id = "checkpoint-handles"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            build_synthetic_world(20, 30, 6, 4)
+            manager = SimulatedGameStateSingleton.get_checkpoint_manager()
+            with SimulatedGameStateSingleton.get_snapshot_store().pinned() as snapshot:
+                first = manager.create_checkpoint(ChangesetCheckpoint, state=snapshot)
+                second = manager.create_checkpoint(ChangesetCheckpoint, state=snapshot)
+            assert first != second
+            assert manager.get_store_stats().count == 1 and manager.get_store_stats().holders == 2
+
+            # The shared content id is never accepted from a client.
+            content_id = manager._checkpoints.resolve(first)
+            assert content_id != first
+            _expect_not_found(lambda: manager.get_checkpoint(content_id))
+            _expect_not_found(lambda: manager.delete_checkpoint(content_id))
+
+            manager.delete_checkpoint(first)
+            _expect_not_found(lambda: manager.delete_checkpoint(first))
+            _expect_not_found(lambda: manager.get_checkpoint(first))
+            assert manager.get_store_stats().holders == 1
+            assert manager.get_checkpoint(second) is not None
+
+            # Handles are persisted with the checkpoints: a restarted store resolves them.
+            restarted = CheckpointManagerFactory().create_manager(
+                SimulatedGameStateSingleton.get_instance(),
+                checkpoint_store=CheckpointStore(backend=SQLiteCheckpointBackend(WorldRegistry.get_world().checkpoint_db_path)),
+            )
+            assert restarted.get_checkpoint(second).model_dump(exclude={"entity_versions"}) == \
+                manager.get_checkpoint(second).model_dump(exclude={"entity_versions"})
+            _expect_not_found(lambda: restarted.get_checkpoint(first))
+            restarted.delete_checkpoint(second)
+            _expect_not_found(lambda: restarted.get_checkpoint(second))
+            restarted.close()
+        print("Checkpoint handles test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+        WorldRegistry.checkpoint_directory = None
+
+
+if __name__ == "__main__":
+    run_checkpoint_handles_test()
@@ -0,0 +1,54 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game import entity_version
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from versioning.deltas.backends import sqlite as sqlite_backend
+from versioning.deltas.backends.sqlite import SQLiteCheckpointBackend
+from versioning.deltas.checkpoints.changeset import ChangesetCheckpoint
+from versioning.deltas.factory import CheckpointManagerFactory
+from versioning.deltas.store import CheckpointStore
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+def run_checkpoint_persistence_test():
+    """Checkpoints written by one manager are loaded back by a new one, as after a restart."""
+    WorldRegistry.checkpoint_directory = tempfile.mkdtemp()
+    session_id = "checkpoint-persistence"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            ids = build_synthetic_world(40, 60, 15, 8)
+            state = SimulatedGameStateSingleton.get_instance()
+            manager = SimulatedGameStateSingleton.get_checkpoint_manager()
+            checkpoint_id = manager.create_checkpoint(ChangesetCheckpoint)
+
+            SimulatedGameStateSingleton.begin_transaction()
+            state.map.modify_scenario(ids["scenarios"][0], new_summary_description="A burnt field.")
+            SimulatedGameStateSingleton.commit()
+            expected = manager.generate_changeset(from_id=checkpoint_id)
+
+            # A restart: new process epoch, new store and manager on the same file.
+            sqlite_backend.VERSION_EPOCH = "previous-run"
+            store = CheckpointStore(backend=SQLiteCheckpointBackend(WorldRegistry.get_world().checkpoint_db_path))
+            restarted = CheckpointManagerFactory().create_manager(state, checkpoint_store=store)
+            loaded = restarted.get_checkpoint(checkpoint_id)
+            assert loaded.entity_versions == {}
+            assert loaded.model_dump(exclude={"entity_versions"}) == manager.get_checkpoint(checkpoint_id).model_dump(exclude={"entity_versions"})
+            assert restarted.generate_changeset(from_id=checkpoint_id) == expected
+            restarted.close()
+        print("Checkpoint persistence test passed.")
+    finally:
+        sqlite_backend.VERSION_EPOCH = entity_version.VERSION_EPOCH
+        WorldRegistry.drop_world(session_id)
+        WorldRegistry.checkpoint_directory = None
+
+
+if __name__ == "__main__":
+    run_checkpoint_persistence_test()
@@ -0,0 +1,64 @@
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.game_event.schemas import CharacterDialogueMessage
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from subsystems.game_events.dialog_engine.parser import parse_and_stream_messages
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+async def _llm_stream(text: str):
+    for index in range(0, len(text), 7):
+        yield text[index:index + 7]
+
+
+def _messages(snapshot, event_id: str) -> list:
+    return [message.model_dump() for message in snapshot.read_only_events.find_event(event_id).messages]
+
+
+def run_event_message_snapshots_test():
+    """Messages and player choices written to a running event are not seen by pinned snapshots."""
+    session_id = "event-message-snapshots"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            ids = build_synthetic_world(10, 12, 4, 3)
+            state = SimulatedGameStateSingleton.get_instance()
+            store = SimulatedGameStateSingleton.get_snapshot_store()
+            event_id = ids["events"][0]
+            speaker = state.read_only_characters.get_character(ids["characters"][1])
+
+            pinned = store.pin()
+            before = _messages(pinned, event_id)
+            # Outside of any transaction, as the API routes write.
+            state.events.add_message_to_event(event_id, CharacterDialogueMessage(actor_id=speaker.id, content="Hello."))
+            state.events.set_player_choice(event_id, "Ask about the road")
+
+            async def consume():
+                event = state.events.find_event(event_id)
+                return [chunk async for chunk in parse_and_stream_messages(
+                    _llm_stream("[dialogue]The road is closed.[action]Points north.[end]"), speaker, event, state
+                )]
+            asyncio.run(consume())
+
+            assert _messages(pinned, event_id) == before
+            assert pinned.read_only_events.find_event(event_id)._pending_choice is None
+            store.release(pinned)
+
+            with store.pinned() as latest:
+                contents = [message["content"] for message in _messages(latest, event_id)]
+                assert contents == ["Hello.", "The road is closed.", "Points north."]
+                assert latest.read_only_events.find_event(event_id)._pending_choice == "Ask about the road"
+        print("Event message snapshots test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_event_message_snapshots_test()
@@ -0,0 +1,38 @@
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+def run_event_status_forks_test():
+    """Disabling or enabling an event of a fork returns the fork's (cloned) event and leaves the original alone."""
+    session_id = "event-status-forks"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            ids = build_synthetic_world(10, 12, 4, 3)
+            game_events = SimulatedGameStateSingleton.get_instance().read_only_events.get_state()
+            event_id = ids["events"][0]
+            forked = game_events.fork()
+
+            disabled = forked.disable_event(event_id)
+            assert disabled is forked.find_event(event_id)
+            assert disabled.status == "DISABLED"
+            assert game_events.find_event(event_id).status == "AVAILABLE"
+
+            enabled = forked.fork().enable_event(event_id)
+            assert enabled.status == "AVAILABLE"
+            assert forked.find_event(event_id).status == "DISABLED"
+        print("Event status forks test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_event_status_forks_test()
@@ -0,0 +1,70 @@
+import contextlib
+import io
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.game_state.singleton import GameStateSingleton
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+def entity_order():
+    """Ids of the base state entities, in the order they are stored (and serialized) in."""
+    game_state = GameStateSingleton.get_instance()
+    return {
+        "scenarios": list(game_state.game_map._scenarios),
+        "connections": list(game_state.game_map._connections),
+        "characters": list(game_state.characters._registry),
+        "events": list(game_state.game_events._all_events),
+    }
+
+
+def delete_some(state, rng: random.Random) -> None:
+    """Deletes one random entity of each kind that still exists."""
+    game_map = state.read_only_map.get_state()
+    scenario_ids = list(game_map._scenarios)
+    if scenario_ids:
+        state.delete_scenario(rng.choice(scenario_ids))
+    npc_ids = [character_id for character_id in state.read_only_characters.get_state()._registry if character_id != "character_001"]
+    if npc_ids:
+        state.delete_character(rng.choice(npc_ids))
+    event_ids = list(state.read_only_events.get_state()._all_events)
+    if event_ids:
+        state.events.delete_event(rng.choice(event_ids))
+
+
+def run_journal_rollback_order_test():
+    """A journal-mode rollback restores deleted entities at their position, as copy mode does."""
+    WorldRegistry.default_transaction_mode = "journal"
+    session_id = "journal-rollback-order"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            build_synthetic_world(30, 40, 8, 6)
+            state = SimulatedGameStateSingleton.get_instance()
+            rng = random.Random(0)
+            for _ in range(10):
+                before = entity_order()
+                SimulatedGameStateSingleton.begin_transaction()
+                delete_some(state, rng)
+                SimulatedGameStateSingleton.begin_transaction()
+                delete_some(state, rng)
+                SimulatedGameStateSingleton.commit()
+                SimulatedGameStateSingleton.begin_transaction()
+                delete_some(state, rng)
+                SimulatedGameStateSingleton.rollback()
+                delete_some(state, rng)
+                SimulatedGameStateSingleton.rollback()
+                assert entity_order() == before
+        print("Journal rollback order test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+        WorldRegistry.default_transaction_mode = "copy"
+
+
+if __name__ == "__main__":
+    run_journal_rollback_order_test()
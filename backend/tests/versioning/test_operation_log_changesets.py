@@ -0,0 +1,58 @@
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.game_event.schemas import CharacterDialogueMessage, NarratorMessage
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from versioning.deltas.checkpoints.changeset import ChangesetCheckpoint
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+def run_operation_log_changesets_test():
+    """Changesets built from the operation log equal a full diff against the same snapshot."""
+    session_id = "operation-log-changesets"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            ids = build_synthetic_world(30, 45, 8, 5)
+            state = SimulatedGameStateSingleton.get_instance()
+            store = SimulatedGameStateSingleton.get_snapshot_store()
+            manager = SimulatedGameStateSingleton.get_checkpoint_manager()
+            with store.pinned() as snapshot:
+                checkpoint_id = manager.create_checkpoint(ChangesetCheckpoint, state=snapshot)
+            talk_id, narration_id = ids["events"][0], ids["events"][1]
+
+            SimulatedGameStateSingleton.begin_transaction()
+            state.map.modify_scenario(ids["scenarios"][2], new_summary_description="A flooded cellar.")
+            state.map.delete_scenario(ids["scenarios"][5])
+            state.characters.modify_character_identity(ids["characters"][1], new_full_name="Nadia Vell")
+            SimulatedGameStateSingleton.commit()
+
+            # Event writes outside of any transaction, as the API routes and the dialog parser make them.
+            state.events.add_message_to_event(talk_id, CharacterDialogueMessage(actor_id=ids["characters"][1], content="Who goes there?"))
+            state.events.add_message_to_event(narration_id, NarratorMessage(content="The lanterns flicker."))
+            state.events.set_player_choice(talk_id, "Answer honestly")
+
+            SimulatedGameStateSingleton.begin_transaction()
+            state.events.add_message_to_event(talk_id, CharacterDialogueMessage(actor_id=ids["characters"][0], content="A friend."))
+            state.events.update_event_title(narration_id, "The lanterns")
+            SimulatedGameStateSingleton.commit()
+
+            with store.pinned() as snapshot:
+                from_log = manager.generate_changeset(from_id=checkpoint_id, state=snapshot)
+                checkpoint = manager.get_checkpoint(checkpoint_id)
+                full = manager._default_changeset_detector.detect(checkpoint, ChangesetCheckpoint.create(snapshot))
+                touched = store.operation_log.compact(checkpoint.log_sequence, snapshot.log_sequence)
+            assert from_log == full
+            assert touched["events"] == {talk_id: "upsert", narration_id: "upsert"}, touched["events"]
+        print("Operation log changesets test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_operation_log_changesets_test()
@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+def run_pin_during_transaction_test():
+    """A reader pinning from another thread never publishes the writes of an open journal transaction."""
+    WorldRegistry.default_transaction_mode = "journal"
+    session_id = "pin-during-transaction"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            ids = build_synthetic_world(10, 12, 4, 0)
+            state = SimulatedGameStateSingleton.get_instance()
+            manager = SimulatedGameStateSingleton.get_version_manager()
+            store = SimulatedGameStateSingleton.get_snapshot_store()
+            scenario_id = ids["scenarios"][2]
+            original_name = state.read_only_map.find_scenario(scenario_id).name
+
+            # The reader stops inside its flush until the writer has begun its transaction and
+            # written (or for a while, if the writer cannot begin until the flush is done).
+            flushing, written = threading.Event(), threading.Event()
+            flush_changes = manager.flush_changes
+
+            def slow_flush():
+                if threading.current_thread() is not threading.main_thread():
+                    flushing.set()
+                    written.wait(timeout=0.5)
+                return flush_changes()
+            manager.flush_changes = slow_flush
+
+            pinned = []
+            reader = threading.Thread(target=lambda: pinned.append(store.pin()))
+
+            def write():
+                flushing.wait()
+                manager.begin_transaction()
+                state.map.modify_scenario(scenario_id, new_name="The uncommitted name")
+                written.set()
+            writer = threading.Thread(target=write)
+            reader.start()
+            writer.start()
+            reader.join()
+            writer.join()
+            del manager.flush_changes
+
+            assert pinned[0].read_only_map.find_scenario(scenario_id).name == original_name
+            store.release(pinned[0])
+            # Pinning during the open transaction does not publish it either.
+            with store.pinned() as snapshot:
+                assert snapshot.read_only_map.find_scenario(scenario_id).name == original_name
+                before_commit = snapshot.log_sequence
+
+            SimulatedGameStateSingleton.commit()
+            with store.pinned() as snapshot:
+                assert snapshot.read_only_map.find_scenario(scenario_id).name == "The uncommitted name"
+                touched = store.operation_log.compact(before_commit, snapshot.log_sequence)
+            assert touched["scenarios"] == {scenario_id: "upsert"}, touched["scenarios"]
+        print("Pin during transaction test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+        WorldRegistry.default_transaction_mode = "copy"
+
+
+if __name__ == "__main__":
+    run_pin_during_transaction_test()
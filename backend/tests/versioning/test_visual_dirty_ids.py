@@ -0,0 +1,55 @@
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core_game.session_context import use_session
+from simulated.singleton import SimulatedGameStateSingleton
+from simulated.world_registry import WorldRegistry
+from tests.versioning.synthetic_world import build_synthetic_world
+
+
+def run_visual_dirty_ids_test():
+    """Only edits that change a field the image depends on mark the entity for a new image."""
+    session_id = "visual-dirty-ids"
+    try:
+        with use_session(session_id), contextlib.redirect_stdout(io.StringIO()):
+            ids = build_synthetic_world(10, 12, 4, 0)
+            state = SimulatedGameStateSingleton.get_instance()
+            state.map.pop_visual_dirty_ids()
+            state.characters.pop_visual_dirty_ids()
+            scenario_id, npc_id = ids["scenarios"][3], ids["characters"][1]
+            scenario = state.map.find_scenario(scenario_id)
+            npc = state.characters.get_character(npc_id)
+
+            SimulatedGameStateSingleton.begin_transaction()
+            # Non-visual fields, and visual fields set to the value they already have.
+            state.map.modify_scenario(
+                scenario_id,
+                new_name="The quiet well",
+                new_summary_description="A well.",
+                new_visual_description=scenario.visual_description,
+                new_zone=scenario.zone,
+            )
+            state.characters.modify_character_identity(npc_id, new_full_name=npc.identity.full_name, new_age=npc.identity.age)
+            state.characters.modify_character_physical(npc_id, new_appearance=npc.physical.appearance)
+            state.characters.modify_character_psychological(npc_id, new_personality_summary="Suspicious of strangers.")
+            SimulatedGameStateSingleton.commit()
+            assert state.map.pop_visual_dirty_ids() == set()
+            assert state.characters.pop_visual_dirty_ids() == set()
+
+            SimulatedGameStateSingleton.begin_transaction()
+            state.map.modify_scenario(scenario_id, new_zone="zone flooded")
+            state.characters.modify_character_physical(npc_id, new_distinctive_features=["burn scar"], append_distinctive_features=True)
+            SimulatedGameStateSingleton.commit()
+            assert state.map.pop_visual_dirty_ids() == {scenario_id}
+            assert state.characters.pop_visual_dirty_ids() == {npc_id}
+        print("Visual dirty ids test passed.")
+    finally:
+        WorldRegistry.drop_world(session_id)
+
+
+if __name__ == "__main__":
+    run_visual_dirty_ids_test()
@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from api.services import generation_status
+from core_game.session_context import DEFAULT_SESSION_ID, use_session
+from simulated.world_registry import WorldLimitError, WorldRegistry
+
+
+def run_world_eviction_test():
+    """New sessions evict idle worlds (and their generation status) and are refused when none is idle."""
+    now = [0.0]
+    saved = (WorldRegistry.max_worlds, WorldRegistry.idle_seconds, WorldRegistry.clock)
+    WorldRegistry.max_worlds = 3
+    WorldRegistry.idle_seconds = 60.0
+    WorldRegistry.clock = lambda: now[0]
+    for session_id in WorldRegistry.session_ids():
+        WorldRegistry.drop_world(session_id)
+    try:
+        WorldRegistry.get_world(DEFAULT_SESSION_ID)
+        for session_id in ("eviction-a", "eviction-b"):
+            with use_session(session_id):
+                generation_status.reset()
+        assert generation_status._statuses.keys() == {"eviction-a", "eviction-b"}
+
+        with use_session("eviction-unknown"):
+            assert generation_status.get_status().status == "idle"
+        assert not WorldRegistry.has_world("eviction-unknown")
+
+        try:
+            WorldRegistry.get_world("eviction-c")
+            raise AssertionError("a full registry must refuse new sessions")
+        except WorldLimitError:
+            pass
+
+        now[0] = 30.0
+        WorldRegistry.get_world("eviction-b")
+        now[0] = 70.0
+        WorldRegistry.get_world("eviction-c")
+        assert set(WorldRegistry.session_ids()) == {DEFAULT_SESSION_ID, "eviction-b", "eviction-c"}
+        assert generation_status._statuses.keys() == {"eviction-b"}
+
+        # The default session is never evicted, however long it has been idle.
+        now[0] = 1000.0
+        WorldRegistry.get_world("eviction-d")
+        assert set(WorldRegistry.session_ids()) == {DEFAULT_SESSION_ID, "eviction-d"}
+        assert generation_status._statuses == {}
+        print("World eviction test passed.")
+    finally:
+        for session_id in WorldRegistry.session_ids():
+            WorldRegistry.drop_world(session_id)
+        WorldRegistry.max_worlds, WorldRegistry.idle_seconds, WorldRegistry.clock = saved
+
+
+if __name__ == "__main__":
+    run_world_eviction_test()
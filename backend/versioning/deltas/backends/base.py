@@ -0,0 +1,73 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from versioning.deltas.checkpoints.base import StateCheckpointBase
+
+
+class PersistedCheckpoint:
+    """A checkpoint read back from a backend, with the bookkeeping stored next to it."""
+
+    def __init__(self, checkpoint: StateCheckpointBase, holders: int, evictable: bool):
+        self.checkpoint = checkpoint
+        self.holders = holders
+        self.evictable = evictable
+
+
+class CheckpointBackend(ABC):
+    """
+    Persistent tier behind a CheckpointStore.
+
+    The store keeps working in memory and writes every checkpoint through to its
+    backend; a checkpoint missing from memory (dropped for the memory budget, or
+    stored by a previous run of the server) is loaded back from the backend on demand.
+    Without a backend the store is memory only, which is the default.
+    """
+
+    @abstractmethod
+    def save(self, checkpoint_id: str, checkpoint: StateCheckpointBase, holders: int, evictable: bool) -> None:
+        pass
+
+    @abstractmethod
+    def load(self, checkpoint_id: str) -> Optional[PersistedCheckpoint]:
+        """The stored checkpoint, or None if the backend does not have it."""
+        pass
+
+    @abstractmethod
+    def contains(self, checkpoint_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    def set_holders(self, checkpoint_id: str, holders: int) -> None:
+        pass
+
+    @abstractmethod
+    def touch(self, checkpoint_id: str) -> None:
+        """Records an access, which postpones the expiration of the checkpoint."""
+        pass
+
+    @abstractmethod
+    def delete(self, checkpoint_id: str) -> None:
+        """Deletes a checkpoint together with its handles."""
+        pass
+
+    @abstractmethod
+    def save_handle(self, handle: str, checkpoint_id: str) -> None:
+        """Records the handle of one holder of a shared checkpoint."""
+        pass
+
+    @abstractmethod
+    def load_handle(self, handle: str) -> Optional[str]:
+        """The checkpoint id of a handle, or None if the backend does not have it."""
+        pass
+
+    @abstractmethod
+    def delete_handle(self, handle: str) -> None:
+        pass
+
+    @abstractmethod
+    def expire(self, ttl_seconds: float) -> List[str]:
+        """Deletes the evictable checkpoints idle for longer than `ttl_seconds`; returns their ids."""
+        pass
+
+    def close(self) -> None:
+        pass
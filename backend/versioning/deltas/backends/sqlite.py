@@ -0,0 +1,320 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from weakref import WeakValueDictionary
+
+import orjson
+import zstandard
+from pydantic import BaseModel
+
+from core_game.character.schemas import NonPlayerCharacterModel, PlayerCharacterModel
+from core_game.entity_version import VERSION_EPOCH
+from core_game.game_event.activation_conditions.schemas import (
+    AreaEntryConditionModel,
+    CharacterInteractionOptionModel,
+    EventCompletionConditionModel,
+    ImmediateActivationModel,
+)
+from core_game.game_event.schemas import (
+    CutsceneEventModel,
+    NarratorInterventionEventModel,
+    NPCConversationEventModel,
+    PlayerNPCConversationEventModel,
+)
+from core_game.map.schemas import ConnectionModel, ScenarioModel
+from versioning.deltas.backends.base import CheckpointBackend, PersistedCheckpoint
+from versioning.deltas.checkpoints.base import StateCheckpointBase
+from versioning.deltas.checkpoints.changeset import ChangesetCheckpoint
+from versioning.deltas.checkpoints.internal import InternalStateCheckpoint
+
+# Collections of entity payloads: name -> (checkpoint field, field of that model).
+_COLLECTIONS: Dict[str, Tuple[str, str]] = {
+    "scenarios": ("map_snapshot", "scenarios"),
+    "connections": ("map_snapshot", "connections"),
+    "characters": ("characters_snapshot", "registry"),
+    "events": ("game_events_snapshot", "all_events"),
+}
+
+# Collections holding several entity classes, told apart by their "type" field.
+_TYPED_MODELS: Dict[str, Dict[str, Type[BaseModel]]] = {
+    "characters": {"player": PlayerCharacterModel, "npc": NonPlayerCharacterModel},
+    "events": {
+        model.model_fields["type"].default: model
+        for model in (
+            NPCConversationEventModel,
+            PlayerNPCConversationEventModel,
+            NarratorInterventionEventModel,
+            CutsceneEventModel,
+        )
+    },
+}
+_MODELS: Dict[str, Type[BaseModel]] = {"scenarios": ScenarioModel, "connections": ConnectionModel}
+# Events declare their activation conditions as the base model.
+_CONDITION_MODELS: Dict[str, Type[BaseModel]] = {
+    model.model_fields["type"].default: model
+    for model in (
+        AreaEntryConditionModel,
+        EventCompletionConditionModel,
+        ImmediateActivationModel,
+        CharacterInteractionOptionModel,
+    )
+}
+
+_CHECKPOINT_TYPES: Dict[str, Type[StateCheckpointBase]] = {
+    checkpoint_type.__name__: checkpoint_type for checkpoint_type in (ChangesetCheckpoint, InternalStateCheckpoint)
+}
+
+# Fields only meaningful in the process that wrote them (entity versions and
+# OperationLog positions start over on restart), reset when loading from another epoch.
+_PROCESS_LOCAL_FIELDS: Dict[str, Any] = {"entity_versions": {}, "log_sequence": None, "snapshot_version": None}
+
+ZSTD_LEVEL = 3
+# Bound on the variables of one "IN (...)" query.
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    epoch TEXT NOT NULL,
+    skeleton BLOB NOT NULL,
+    manifest BLOB NOT NULL,
+    holders INTEGER NOT NULL,
+    evictable INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checkpoints_last_access ON checkpoints (last_access);
+CREATE TABLE IF NOT EXISTS handles (
+    handle TEXT PRIMARY KEY,
+    checkpoint_id TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS handles_checkpoint ON handles (checkpoint_id);
+CREATE TABLE IF NOT EXISTS payloads (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    refs INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _chunks(items: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(items), _QUERY_CHUNK):
+        yield items[start:start + _QUERY_CHUNK]
+
+
+class SQLiteCheckpointBackend(CheckpointBackend):
+    """
+    Checkpoints in an SQLite file.
+
+    Every entity payload is a row keyed by the hash of its content (zstd compressed
+    JSON), reference counted by the checkpoints listing it, so an entity that did not
+    change between checkpoints is stored once. A checkpoint row holds the rest of the
+    checkpoint (the "skeleton") and its manifest, {collection: {entity id: digest}}.
+
+    The handles of the holders of shared checkpoints are rows of their own, deleted
+    with the checkpoint.
+
+    Loading a checkpoint written by another process (epoch) drops its entity versions
+    and log position: the changesets from it are then computed by comparing entities.
+    """
+
+    def __init__(self, path: str, clock=time.time) -> None:
+        self._path = path
+        # Wall clock: idle times have to survive restarts.
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+        self._stored_digests = {row[0] for row in self._connection.execute("SELECT digest FROM payloads")}
+        # id(payload) -> (weak reference, digest), so a payload shared between
+        # checkpoints is serialized and hashed once.
+        self._digests: Dict[int, Tuple[weakref.ref, str]] = {}
+        # Payloads loaded back, shared between the checkpoints that list them.
+        self._loaded: WeakValueDictionary[str, BaseModel] = WeakValueDictionary()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def save(self, checkpoint_id: str, checkpoint: StateCheckpointBase, holders: int, evictable: bool) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            # Replacing a checkpoint: release its payloads first.
+            self._delete_row(checkpoint_id)
+            manifest: Dict[str, Dict[str, str]] = {}
+            exclude: Dict[str, set] = {}
+            new_rows: Dict[str, bytes] = {}
+            for name, (field, collection_field) in _COLLECTIONS.items():
+                container = getattr(checkpoint, field, None)
+                if container is None:
+                    continue
+                exclude.setdefault(field, set()).add(collection_field)
+                digests = manifest[name] = {}
+                for entity_id, payload in getattr(container, collection_field).items():
+                    digests[entity_id] = self._digest(payload, new_rows)
+            skeleton = checkpoint.model_dump(mode="json", exclude=exclude)
+
+            listed = [digest for digests in manifest.values() for digest in digests.values()]
+            self._connection.executemany("INSERT OR IGNORE INTO payloads (digest, data, refs) VALUES (?, ?, 0)", new_rows.items())
+            self._connection.executemany("UPDATE payloads SET refs = refs + 1 WHERE digest = ?", [(digest,) for digest in listed])
+            self._connection.execute(
+                "INSERT INTO checkpoints (id, type, epoch, skeleton, manifest, holders, evictable, last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    checkpoint_id,
+                    type(checkpoint).__name__,
+                    VERSION_EPOCH,
+                    self._compressor.compress(orjson.dumps(skeleton)),
+                    self._compressor.compress(orjson.dumps(manifest)),
+                    holders,
+                    int(evictable),
+                    self._clock(),
+                ),
+            )
+            self._stored_digests.update(new_rows)
+
+    def load(self, checkpoint_id: str) -> Optional[PersistedCheckpoint]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT type, epoch, skeleton, manifest, holders, evictable FROM checkpoints WHERE id = ?", (checkpoint_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            type_name, epoch, skeleton_blob, manifest_blob, holders, evictable = row
+            checkpoint_type = _CHECKPOINT_TYPES.get(type_name)
+            if checkpoint_type is None:
+                raise RuntimeError(f"Checkpoint '{checkpoint_id}' has unknown type '{type_name}'")
+            skeleton = orjson.loads(self._decompressor.decompress(skeleton_blob))
+            manifest: Dict[str, Dict[str, str]] = orjson.loads(self._decompressor.decompress(manifest_blob))
+            payloads = self._load_payloads(manifest)
+
+        for name, digests in manifest.items():
+            field, collection_field = _COLLECTIONS[name]
+            skeleton[field][collection_field] = {entity_id: payloads[digest] for entity_id, digest in digests.items()}
+        if epoch != VERSION_EPOCH:
+            for field, empty in _PROCESS_LOCAL_FIELDS.items():
+                if field in skeleton:
+                    skeleton[field] = empty
+        # Payloads are already typed models; validation keeps them as they are.
+        return PersistedCheckpoint(checkpoint_type.model_validate(skeleton), holders, bool(evictable))
+
+    def contains(self, checkpoint_id: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM checkpoints WHERE id = ?", (checkpoint_id,)).fetchone() is not None
+
+    def set_holders(self, checkpoint_id: str, holders: int) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE checkpoints SET holders = ?, last_access = ? WHERE id = ?", (holders, self._clock(), checkpoint_id)
+            )
+
+    def touch(self, checkpoint_id: str) -> None:
+        with self._lock:
+            self._connection.execute("UPDATE checkpoints SET last_access = ? WHERE id = ?", (self._clock(), checkpoint_id))
+
+    def delete(self, checkpoint_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._delete_row(checkpoint_id)
+
+    def save_handle(self, handle: str, checkpoint_id: str) -> None:
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO handles (handle, checkpoint_id) VALUES (?, ?)", (handle, checkpoint_id))
+
+    def load_handle(self, handle: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute("SELECT checkpoint_id FROM handles WHERE handle = ?", (handle,)).fetchone()
+            return row[0] if row is not None else None
+
+    def delete_handle(self, handle: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM handles WHERE handle = ?", (handle,))
+
+    def expire(self, ttl_seconds: float) -> List[str]:
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            expired = [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT id FROM checkpoints WHERE evictable = 1 AND last_access < ?", (self._clock() - ttl_seconds,)
+                )
+            ]
+            for checkpoint_id in expired:
+                self._delete_row(checkpoint_id)
+            return expired
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+    def _digest(self, payload: BaseModel, new_rows: Dict[str, bytes]) -> str:
+        """Digest of a payload; adds its compressed row to `new_rows` if it is not stored yet."""
+        key = id(payload)
+        known = self._digests.get(key)
+        if known is not None and known[0]() is payload and (known[1] in self._stored_digests or known[1] in new_rows):
+            return known[1]
+        # serialize_as_any: fields declared as a base model keep the fields of their subclass.
+        data = payload.model_dump_json(serialize_as_any=True).encode()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        self._digests[key] = (weakref.ref(payload, lambda _, key=key: self._digests.pop(key, None)), digest)
+        if digest not in self._stored_digests and digest not in new_rows:
+            new_rows[digest] = self._compressor.compress(data)
+        return digest
+
+    def _load_payloads(self, manifest: Dict[str, Dict[str, str]]) -> Dict[str, BaseModel]:
+        payloads: Dict[str, BaseModel] = {}
+        missing: Dict[str, str] = {}
+        for name, digests in manifest.items():
+            for digest in digests.values():
+                payload = self._loaded.get(digest)
+                if payload is not None:
+                    payloads[digest] = payload
+                else:
+                    missing[digest] = name
+        for chunk in _chunks(list(missing)):
+            placeholders = ",".join("?" * len(chunk))
+            for digest, data in self._connection.execute(f"SELECT digest, data FROM payloads WHERE digest IN ({placeholders})", chunk):
+                payload = self._decode(missing[digest], orjson.loads(self._decompressor.decompress(data)))
+                self._loaded[digest] = payload
+                payloads[digest] = payload
+        return payloads
+
+    @staticmethod
+    def _decode(collection: str, data: Dict[str, Any]) -> BaseModel:
+        typed = _TYPED_MODELS.get(collection)
+        model = typed[data["type"]] if typed is not None else _MODELS[collection]
+        if collection == "events":
+            data["activation_conditions"] = [
+                _CONDITION_MODELS[condition["type"]].model_validate(condition) for condition in data["activation_conditions"]
+            ]
+        return model.model_validate(data)
+
+    def _delete_row(self, checkpoint_id: str) -> None:
+        """Deletes a checkpoint row and the payloads no other checkpoint lists. Runs in a transaction."""
+        row = self._connection.execute("SELECT manifest FROM checkpoints WHERE id = ?", (checkpoint_id,)).fetchone()
+        if row is None:
+            return
+        manifest: Dict[str, Dict[str, str]] = orjson.loads(self._decompressor.decompress(row[0]))
+        listed = [digest for digests in manifest.values() for digest in digests.values()]
+        self._connection.execute("DELETE FROM checkpoints WHERE id = ?", (checkpoint_id,))
+        self._connection.execute("DELETE FROM handles WHERE checkpoint_id = ?", (checkpoint_id,))
+        self._connection.executemany("UPDATE payloads SET refs = refs - 1 WHERE digest = ?", [(digest,) for digest in listed])
+        for chunk in _chunks(list(set(listed))):
+            placeholders = ",".join("?" * len(chunk))
+            unreferenced = [
+                row[0]
+                for row in self._connection.execute(f"SELECT digest FROM payloads WHERE refs <= 0 AND digest IN ({placeholders})", chunk)
+            ]
+            self._connection.executemany("DELETE FROM payloads WHERE digest = ?", [(digest,) for digest in unreferenced])
+            self._stored_digests.difference_update(unreferenced)
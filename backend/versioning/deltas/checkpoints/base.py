@@ -1,17 +1,24 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from copy import deepcopy
-from typing import Dict, Optional, Type
+from typing import Dict, Iterator, Optional, Type, TYPE_CHECKING
 from uuid import uuid4
 from pydantic import BaseModel
 from simulated.game_state import SimulatedGameState
 
+if TYPE_CHECKING:
+    from versioning.layers.snapshots import StateSnapshot
+
 # --- 1. Clase Base Abstracta ---
 class StateCheckpointBase(BaseModel, ABC):
     """Base class for any type of state snapshot."""
     
     @classmethod
     @abstractmethod
-    def create(cls, state: SimulatedGameState) -> StateCheckpointBase:
-        """Factory method to create a checkpoint instance."""
-        pass
\ No newline at end of file
+    def create(cls, state: SimulatedGameState | StateSnapshot) -> StateCheckpointBase:
+        """Factory method to create a checkpoint instance from the live state or a read snapshot."""
+        pass
+
+    def iter_payloads(self) -> Iterator[BaseModel]:
+        """Yields the entity models held by the checkpoint (used for memory accounting)."""
+        return iter(())
\ No newline at end of file
@@ -1,25 +1,145 @@
 from __future__ import annotations
 
 from copy import deepcopy
+from typing import Dict, Iterable, Iterator, Mapping, Optional
+
+from pydantic import BaseModel
 
 from core_game.character.schemas import CharactersModel
 from core_game.map.schemas import GameMapModel
 from core_game.game_event.schemas import GameEventsManagerModel
 from simulated.game_state import SimulatedGameState
 from versioning.deltas.checkpoints.base import StateCheckpointBase
+from versioning.deltas.checkpoints.payloads import payload_cache
+from versioning.layers.snapshots import StateSnapshot
 
 class ChangesetCheckpoint(StateCheckpointBase):
     """
     Snapshot containing the necessary data to generate a changeset
     for an external consumer.
+
+    Entity models are frozen payloads shared between checkpoints (one per entity
+    version), so creating a checkpoint only copies the entities that changed.
+    `entity_versions` maps 'scenarios', 'connections', 'characters' and 'events'
+    to {id: version}; it is empty for checkpoints not taken from a state.
+    `log_sequence` is the OperationLog position of the snapshot it was taken from
+    and `snapshot_version` its version (both None when taken from the live state).
     """
     map_snapshot: GameMapModel
     characters_snapshot: CharactersModel
     game_events_snapshot: GameEventsManagerModel
+    entity_versions: Dict[str, Dict[str, int]] = {}
+    log_sequence: Optional[int] = None
+    snapshot_version: Optional[int] = None
     
     @classmethod
-    def create(cls, state: SimulatedGameState) -> ChangesetCheckpoint:
-        map_model = deepcopy(state.read_only_map.get_state().to_model())
-        char_model = deepcopy(state.read_only_characters.get_state().to_model())
-        events_model = deepcopy(state.read_only_events.get_state().to_model())
-        return cls(map_snapshot=map_model, characters_snapshot=char_model, game_events_snapshot=events_model)
\ No newline at end of file
+    def create(cls, state: SimulatedGameState | StateSnapshot) -> ChangesetCheckpoint:
+        game_map = state.read_only_map.get_state()
+        characters = state.read_only_characters.get_state()
+        game_events = state.read_only_events.get_state()
+
+        map_versions = game_map.get_entity_versions()
+        char_versions = characters.get_entity_versions()
+        event_versions = game_events.get_entity_versions()
+
+        live_map = game_map.to_model()
+        live_chars = characters.to_model()
+        live_events = game_events.to_model()
+
+        map_model = GameMapModel.model_construct(
+            scenarios=payload_cache.freeze_all(live_map.scenarios, map_versions["scenario"]),
+            connections=payload_cache.freeze_all(live_map.connections, map_versions["connection"]),
+        )
+        char_model = CharactersModel.model_construct(
+            registry=payload_cache.freeze_all(live_chars.registry, char_versions),
+            player_character_id=live_chars.player_character_id,
+        )
+        events_model = GameEventsManagerModel.model_construct(
+            all_events=payload_cache.freeze_all(live_events.all_events, event_versions),
+            running_event_stack=deepcopy(live_events.running_event_stack),
+        )
+        return cls(
+            map_snapshot=map_model,
+            characters_snapshot=char_model,
+            game_events_snapshot=events_model,
+            entity_versions={
+                "scenarios": map_versions["scenario"],
+                "connections": map_versions["connection"],
+                "characters": char_versions,
+                "events": event_versions,
+            },
+            log_sequence=state.log_sequence if isinstance(state, StateSnapshot) else None,
+            snapshot_version=state.version if isinstance(state, StateSnapshot) else None,
+        )
+
+    def iter_payloads(self) -> Iterator[BaseModel]:
+        yield from self.map_snapshot.scenarios.values()
+        yield from self.map_snapshot.connections.values()
+        yield from self.characters_snapshot.registry.values()
+        yield from self.game_events_snapshot.all_events.values()
+
+    @classmethod
+    def create_partial(cls, state: SimulatedGameState | StateSnapshot, ids: Mapping[str, Iterable[str]]) -> ChangesetCheckpoint:
+        """
+        Creates a checkpoint holding only the entities in `ids` (keyed like
+        `entity_versions`) that exist in `state`. Used to diff just the entities
+        an operation log range touched.
+        """
+        game_map = state.read_only_map.get_state()
+        characters = state.read_only_characters.get_state()
+        game_events = state.read_only_events.get_state()
+
+        scenarios = {}
+        for scenario_id in ids.get("scenarios", ()):
+            scenario = game_map.find_scenario(scenario_id)
+            if scenario is not None:
+                scenarios[scenario_id] = payload_cache.freeze(scenario.version, scenario.get_scenario_model())
+        connections = {}
+        for connection_id in ids.get("connections", ()):
+            connection = game_map.get_connection_by_id(connection_id)
+            if connection is not None:
+                connections[connection_id] = payload_cache.freeze(connection.version, connection.get_connection_model())
+        registry = {}
+        for character_id in ids.get("characters", ()):
+            character = characters.find_character(character_id)
+            if character is not None:
+                registry[character_id] = payload_cache.freeze(character.version, character.get_model())
+        all_events = {}
+        for event_id in ids.get("events", ()):
+            event = game_events.find_event(event_id)
+            if event is not None:
+                all_events[event_id] = payload_cache.freeze(event.version, event.get_model())
+
+        player = characters.get_player()
+        return cls(
+            map_snapshot=GameMapModel.model_construct(scenarios=scenarios, connections=connections),
+            characters_snapshot=CharactersModel.model_construct(
+                registry=registry,
+                player_character_id=player.id if player else None,
+            ),
+            game_events_snapshot=GameEventsManagerModel.model_construct(all_events=all_events, running_event_stack=[]),
+            log_sequence=state.log_sequence if isinstance(state, StateSnapshot) else None,
+            snapshot_version=state.version if isinstance(state, StateSnapshot) else None,
+        )
+
+    def restricted_to(self, ids: Mapping[str, Iterable[str]]) -> ChangesetCheckpoint:
+        """Returns a checkpoint with only the entities in `ids` (payloads are shared, not copied)."""
+        def subset(items: Dict, kind: str) -> Dict:
+            return {entity_id: items[entity_id] for entity_id in ids.get(kind, ()) if entity_id in items}
+
+        return ChangesetCheckpoint(
+            map_snapshot=GameMapModel.model_construct(
+                scenarios=subset(self.map_snapshot.scenarios, "scenarios"),
+                connections=subset(self.map_snapshot.connections, "connections"),
+            ),
+            characters_snapshot=CharactersModel.model_construct(
+                registry=subset(self.characters_snapshot.registry, "characters"),
+                player_character_id=self.characters_snapshot.player_character_id,
+            ),
+            game_events_snapshot=GameEventsManagerModel.model_construct(
+                all_events=subset(self.game_events_snapshot.all_events, "events"),
+                running_event_stack=[],
+            ),
+            log_sequence=self.log_sequence,
+            snapshot_version=self.snapshot_version,
+        )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from copy import deepcopy
+from typing import Iterator, TYPE_CHECKING
 
 from pydantic import BaseModel
 from core_game.character.schemas import (
@@ -9,6 +9,10 @@ from core_game.character.schemas import (
 from core_game.map.schemas import GameMapModel
 from simulated.game_state import SimulatedGameState
 from versioning.deltas.checkpoints.base import StateCheckpointBase
+from versioning.deltas.checkpoints.payloads import payload_cache
+
+if TYPE_CHECKING:
+    from versioning.layers.snapshots import StateSnapshot
 
 class InternalStateCheckpoint(StateCheckpointBase):
     """Snapshot with specific data for internal processes (e.g., image re-rendering)."""
@@ -16,7 +20,24 @@ class InternalStateCheckpoint(StateCheckpointBase):
     characters_snapshot: CharactersModel
     
     @classmethod
-    def create(cls, state: SimulatedGameState) -> InternalStateCheckpoint:
-        map_model = deepcopy(state.read_only_map.get_state().to_model())
-        char_model = deepcopy(state.read_only_characters.get_state().to_model())
-        return cls(map_snapshot=map_model, characters_snapshot=char_model)
\ No newline at end of file
+    def create(cls, state: SimulatedGameState | StateSnapshot) -> InternalStateCheckpoint:
+        game_map = state.read_only_map.get_state()
+        characters = state.read_only_characters.get_state()
+        map_versions = game_map.get_entity_versions()
+        live_map = game_map.to_model()
+        live_chars = characters.to_model()
+
+        map_model = GameMapModel.model_construct(
+            scenarios=payload_cache.freeze_all(live_map.scenarios, map_versions["scenario"]),
+            connections=payload_cache.freeze_all(live_map.connections, map_versions["connection"]),
+        )
+        char_model = CharactersModel.model_construct(
+            registry=payload_cache.freeze_all(live_chars.registry, characters.get_entity_versions()),
+            player_character_id=live_chars.player_character_id,
+        )
+        return cls(map_snapshot=map_model, characters_snapshot=char_model)
+
+    def iter_payloads(self) -> Iterator[BaseModel]:
+        yield from self.map_snapshot.scenarios.values()
+        yield from self.map_snapshot.connections.values()
+        yield from self.characters_snapshot.registry.values()
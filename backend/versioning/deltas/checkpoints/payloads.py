@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, TypeVar
+from weakref import WeakValueDictionary
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class EntityPayloadCache:
+    """
+    Frozen copies of entity models, keyed by entity version.
+
+    Entity versions are unique process-wide (see core_game.entity_version), so a
+    version identifies one exact content. Checkpoints share the payload of every
+    entity that did not change since the previous checkpoint, and only copy the
+    ones whose version is new. A payload lives as long as a checkpoint holds it.
+    """
+
+    def __init__(self) -> None:
+        self._payloads: WeakValueDictionary[int, BaseModel] = WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def freeze(self, version: int, model: M) -> M:
+        """Returns the frozen payload of `model` at `version`, copying it only the first time."""
+        with self._lock:
+            payload = self._payloads.get(version)
+            if payload is None:
+                payload = model.model_copy(deep=True)
+                self._payloads[version] = payload
+            return payload  # type: ignore[return-value]
+
+    def freeze_all(self, models: Dict[str, M], versions: Dict[str, int]) -> Dict[str, M]:
+        """Freezes a collection of models keyed by entity id."""
+        return {entity_id: self.freeze(versions[entity_id], model) for entity_id, model in models.items()}
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+payload_cache = EntityPayloadCache()
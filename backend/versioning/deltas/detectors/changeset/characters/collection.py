@@ -34,6 +34,9 @@ class CharactersDetector(ChangeDetector[CharactersModel]):
             registry_ops.append({"op": "remove", "id": id})
             
         for id in sorted(old_ids & new_ids):
+            # Checkpoint payloads are shared per entity version: same object, same version.
+            if old_chars[id] is new_chars[id]:
+                continue
             char_changes = self.character_detector.detect(old_chars[id], new_chars[id])
             print("detecting in characters collection")
             if char_changes:
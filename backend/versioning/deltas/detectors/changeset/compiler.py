@@ -0,0 +1,177 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from core_game.character.schemas import NonPlayerCharacterModel
+from versioning.deltas.detectors.base import ChangeDetector
+from versioning.deltas.detectors.field_detector import FieldChangeDetector, _SENTINEL
+from versioning.deltas.detectors.changeset.characters.attributes import (
+    IdentityDetector,
+    PhysicalDetector,
+    PsychologicalDetector,
+    KnowledgeDetector,
+    DynamicStateDetector,
+    NarrativeWeightDetector,
+)
+from versioning.deltas.detectors.changeset.characters.entity import CharacterDetector
+from versioning.deltas.detectors.changeset.map.entity import ScenarioDetector, ConnectionInfoDetector
+from versioning.deltas.detectors.changeset.map.attributes import ScenarioConnectionsDetector
+
+# Detectors whose detect() merges the results of `leaf_detectors` in order.
+_LEAF_AGGREGATORS = (
+    IdentityDetector,
+    PhysicalDetector,
+    PsychologicalDetector,
+    KnowledgeDetector,
+    DynamicStateDetector,
+    NarrativeWeightDetector,
+)
+
+_MISSING = object()
+
+
+class CompiledDetector(ChangeDetector[Any]):
+    """
+    A detector tree flattened into one generated function.
+    detect() returns exactly what the source tree returns; every other attribute
+    (public_field_names, get_public_fields_for...) is read from the source detector.
+    """
+
+    def __init__(self, source: ChangeDetector, function: Callable[[Any, Any], Optional[Dict[str, Any]]], code: str):
+        self._source = source
+        self._function = function
+        self.code = code
+
+    def detect(self, old: Any, new: Any) -> Dict[str, Any] | None:
+        return self._function(old, new)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._source, name)
+
+
+class _CodeWriter:
+    """Emits the body of the generated comparator."""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {"_SENTINEL": _SENTINEL, "_MISSING": _MISSING}
+        self._counter = 0
+
+    def name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def constant(self, value: Any, prefix: str = "_c") -> str:
+        key = self.name(prefix)
+        self.constants[key] = value
+        return key
+
+    @staticmethod
+    def same_fields(old: str, new: str) -> str:
+        """Condition true when both objects have the same type and equal field storage,
+        in which case no field detector can report a change."""
+        return f"(type({old}) is type({new}) and getattr({old}, '__dict__', None) == getattr({new}, '__dict__', _MISSING))"
+
+    def line(self, indent: int, text: str) -> None:
+        self.lines.append("    " * indent + text)
+
+    def read_field(self, indent: int, target: str, obj: str, fields: str, field_name: str) -> None:
+        # Same lookup as FieldChangeDetector (getattr with a sentinel), reading the
+        # pydantic field storage directly when the field is there.
+        self.line(indent, f"{target} = {fields}.get({field_name!r}, _MISSING)")
+        self.line(indent, f"if {target} is _MISSING:")
+        self.line(indent + 1, f"{target} = getattr({obj}, {field_name!r}, _SENTINEL)")
+
+    def emit(self, detector: ChangeDetector, old: str, new: str, out: str, indent: int) -> None:
+        """Emits code merging the changes `detector` would report for (old, new) into `out`."""
+        if type(detector) is FieldChangeDetector:
+            old_fields, new_fields = self.name("_of"), self.name("_nf")
+            self.line(indent, f"{old_fields} = getattr({old}, '__dict__', {{}})")
+            self.line(indent, f"{new_fields} = getattr({new}, '__dict__', {{}})")
+            self._emit_field(detector.field_name, old, new, old_fields, new_fields, out, indent)
+        elif isinstance(detector, _LEAF_AGGREGATORS) or type(detector) is ConnectionInfoDetector:
+            leafs = detector.leaf_detectors if isinstance(detector, _LEAF_AGGREGATORS) else detector.field_detectors
+            self._emit_many(leafs, old, new, out, indent)
+        elif type(detector) is ScenarioDetector:
+            self._emit_many(detector.field_detectors, old, new, out, indent)
+            self._emit_connections(detector.connections_detector, old, new, out, indent)
+        elif type(detector) is CharacterDetector:
+            self._emit_character(detector, old, new, out, indent)
+        else:
+            self._emit_opaque(detector, old, new, out, indent)
+
+    def _emit_many(self, detectors: List[ChangeDetector], old: str, new: str, out: str, indent: int) -> None:
+        old_fields, new_fields = self.name("_of"), self.name("_nf")
+        self.line(indent, f"{old_fields} = getattr({old}, '__dict__', {{}})")
+        self.line(indent, f"{new_fields} = getattr({new}, '__dict__', {{}})")
+        for leaf in detectors:
+            if type(leaf) is FieldChangeDetector:
+                self._emit_field(leaf.field_name, old, new, old_fields, new_fields, out, indent)
+            else:
+                self.emit(leaf, old, new, out, indent)
+
+    def _emit_field(self, field_name: str, old: str, new: str, old_fields: str, new_fields: str, out: str, indent: int) -> None:
+        old_value, new_value = self.name("_o"), self.name("_n")
+        self.read_field(indent, old_value, old, old_fields, field_name)
+        self.read_field(indent, new_value, new, new_fields, field_name)
+        self.line(indent, f"if not ({old_value} == {new_value}):")
+        self.line(indent + 1, f"{out}[{field_name!r}] = None if {new_value} is _SENTINEL else {new_value}")
+
+    def _emit_opaque(self, detector: ChangeDetector, old: str, new: str, out: str, indent: int) -> None:
+        """Detectors the compiler does not know are called as they are."""
+        bound = self.constant(detector.detect, "_detect")
+        result = self.name("_r")
+        self.line(indent, f"{result} = {bound}({old}, {new})")
+        self.line(indent, f"if {result}:")
+        self.line(indent + 1, f"{out}.update({result})")
+
+    def _emit_connections(self, detector: ChangeDetector, old: str, new: str, out: str, indent: int) -> None:
+        """Scenario connections rarely change: the detector is only called when they differ."""
+        if type(detector) is not ScenarioConnectionsDetector:
+            self._emit_opaque(detector, old, new, out, indent)
+            return
+        self.line(indent, f"if not ({old}.connections == {new}.connections):")
+        self._emit_opaque(detector, old, new, out, indent + 1)
+
+    def _emit_nested(self, attr_name: str, detector: ChangeDetector, old: str, new: str, out: str, indent: int) -> None:
+        old_attr, new_attr, sub = self.name("_oa"), self.name("_na"), self.name("_sub")
+        self.line(indent, f"{old_attr} = getattr({old}, {attr_name!r})")
+        self.line(indent, f"{new_attr} = getattr({new}, {attr_name!r})")
+        self.line(indent, f"{sub} = {{}}")
+        self.line(indent, f"if not {self.same_fields(old_attr, new_attr)}:")
+        self.emit(detector, old_attr, new_attr, sub, indent + 1)
+        self.line(indent, f"if {sub}:")
+        self.line(indent + 1, f"{out}[{attr_name!r}] = {sub}")
+
+    def _emit_character(self, detector: CharacterDetector, old: str, new: str, out: str, indent: int) -> None:
+        for attr_name, attr_detector in detector.common_attribute_detectors.items():
+            self._emit_nested(attr_name, attr_detector, old, new, out, indent)
+        self._emit_many(detector.top_level_field_detectors, old, new, out, indent)
+        npc_type = self.constant(NonPlayerCharacterModel, "_npc")
+        self.line(indent, f"if isinstance({new}, {npc_type}) and isinstance({old}, {npc_type}):")
+        for attr_name, attr_detector in detector.npc_attribute_detectors.items():
+            self._emit_nested(attr_name, attr_detector, old, new, out, indent + 1)
+        self.line(indent + 1, "pass")
+
+
+def compile_detector(detector: ChangeDetector) -> CompiledDetector:
+    """
+    Compiles an entity detector tree (ScenarioDetector, ConnectionInfoDetector,
+    CharacterDetector or any of their attribute detectors) into a single function
+    with every field comparison inlined. Entities whose fields are all equal are
+    skipped with one comparison. Unknown detectors inside the tree are called as
+    they are, so the output is always the one of the source tree.
+    """
+    writer = _CodeWriter()
+    # Most compared entities did not change (equal copies, e.g. loaded back from a
+    # backend). Characters are made of nested models, compared one by one instead
+    # (comparing the whole character would compare every nested model twice when it changed).
+    if type(detector) is not CharacterDetector:
+        writer.line(1, f"if {writer.same_fields('old', 'new')}:")
+        writer.line(2, "return None")
+    writer.line(1, "changes = {}")
+    writer.emit(detector, "old", "new", "changes", 1)
+    writer.line(1, "return changes if changes else None")
+    function_name = f"compiled_{type(detector).__name__}"
+    code = f"def {function_name}(old, new):\n" + "\n".join(writer.lines) + "\n"
+    namespace = dict(writer.constants)
+    exec(compile(code, f"<{function_name}>", "exec"), namespace)
+    return CompiledDetector(detector, namespace[function_name], code)
@@ -48,7 +48,8 @@ def _process_scenarios(
         
     # Modified items
     for id in sorted(old_ids & new_ids):
-        if old_items[id].model_dump() == new_items[id].model_dump():
+        # Checkpoint payloads are shared per entity version: same object, same version.
+        if old_items[id] is new_items[id]:
             continue
         entity_changes = entity_detector.detect(old_items[id], new_items[id])
         if entity_changes:
@@ -85,7 +86,8 @@ def _process_connections(
         
     # Modified items
     for id in sorted(old_ids & new_ids):
-        if old_items[id].model_dump() == new_items[id].model_dump():
+        # Checkpoint payloads are shared per entity version: same object, same version.
+        if old_items[id] is new_items[id]:
             continue
         entity_changes = entity_detector.detect(old_items[id], new_items[id])
         if entity_changes:
@@ -21,28 +21,40 @@ class ChangesetDetector(ChangeDetector[ChangesetCheckpoint]):
         self.characters_detector = characters_detector
         self.game_events_detector = game_events_detector # ¡Lo asignamos!
 
+    @staticmethod
+    def _same_versions(old_cp: ChangesetCheckpoint, new_cp: ChangesetCheckpoint, *kinds: str) -> bool:
+        """True when both checkpoints recorded the same entity versions for all `kinds`."""
+        for kind in kinds:
+            old_versions = old_cp.entity_versions.get(kind)
+            if old_versions is None or old_versions != new_cp.entity_versions.get(kind):
+                return False
+        return True
+
     def detect(self, old_cp: ChangesetCheckpoint, new_cp: ChangesetCheckpoint) -> Dict[str, Any] | None:
         """
         Calls each domain detector and assembles their results into the
-        final 'changes' dictionary.
+        final 'changes' dictionary. Domains whose entity versions did not
+        change between both checkpoints are skipped.
         """
         changes: Dict[str, Any] = {}
         # 1. Detectar cambios en el mapa
-        map_changes = self.map_detector.detect(old_cp.map_snapshot, new_cp.map_snapshot)
-        if map_changes:
-            
-            changes["map"] = map_changes
+        if not self._same_versions(old_cp, new_cp, "scenarios", "connections"):
+            map_changes = self.map_detector.detect(old_cp.map_snapshot, new_cp.map_snapshot)
+            if map_changes:
+                changes["map"] = map_changes
 
-        print("Detecting changes in rooot")
         # 2. Detectar cambios en los personajes
-        char_changes = self.characters_detector.detect(old_cp.characters_snapshot, new_cp.characters_snapshot)
-        if char_changes:
-            print("Changes detected in characters")
-            changes["characters"] = char_changes
+        same_player = old_cp.characters_snapshot.player_character_id == new_cp.characters_snapshot.player_character_id
+        if not (same_player and self._same_versions(old_cp, new_cp, "characters")):
+            char_changes = self.characters_detector.detect(old_cp.characters_snapshot, new_cp.characters_snapshot)
+            if char_changes:
+                changes["characters"] = char_changes
 
         # 3. Detectar cambios en los eventos (opciones de interacción de personajes)
         # El EventsDetector ya opera sobre los modelos (GameEventsManagerModel)
-        events_changes = self.game_events_detector.detect(old_cp.game_events_snapshot, new_cp.game_events_snapshot)
+        events_changes = None
+        if not self._same_versions(old_cp, new_cp, "events"):
+            events_changes = self.game_events_detector.detect(old_cp.game_events_snapshot, new_cp.game_events_snapshot)
         if events_changes:
             changes["events"] = events_changes # La clave en el changeset será "events" o "interactions"
 
@@ -34,7 +34,7 @@ class InternalCharactersCollectionDetector(ChangeDetector[CharactersModel]):
         }
 
         for id in sorted(old_ids & new_ids):
-            if old_chars[id].model_dump() == new_chars[id].model_dump():
+            if old_chars[id] is new_chars[id] or old_chars[id].model_dump() == new_chars[id].model_dump():
                 continue
             
             diff_dict["modified"].append(id)
@@ -21,7 +21,7 @@ class InternalMapDetector(ChangeDetector[GameMapModel]):
         }
 
         for id in sorted(old_ids & new_ids):
-            if old_scenarios[id].model_dump() == new_scenarios[id].model_dump():
+            if old_scenarios[id] is new_scenarios[id] or old_scenarios[id].model_dump() == new_scenarios[id].model_dump():
                 continue
 
             diff_dict["modified"].append(id)
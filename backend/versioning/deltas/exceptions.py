@@ -0,0 +1,9 @@
+class CheckpointExpiredError(RuntimeError):
+    """
+    Raised when a checkpoint was evicted (memory budget) or expired (idle TTL).
+    The client cannot get incremental changes from it and must resync with /state/full.
+    """
+
+    def __init__(self, checkpoint_id: str):
+        super().__init__(f"Checkpoint '{checkpoint_id}' expired, resync with /state/full")
+        self.checkpoint_id = checkpoint_id
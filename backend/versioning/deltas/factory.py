@@ -1,5 +1,9 @@
+from typing import Optional
+
 from .manager import StateCheckpointManager
 from simulated.game_state import SimulatedGameState
+from versioning.layers.oplog import OperationLog
+from versioning.deltas.store import CheckpointStore
 
 # Importa todas las piezas necesarias para construir los árboles
 # --- Imports for the Changeset Detector Tree ---
@@ -10,6 +14,7 @@ from versioning.deltas.detectors.changeset.map.entity import ConnectionInfoDetec
 from versioning.deltas.detectors.changeset.characters.collection import CharactersDetector as ChangesetCharactersDetector
 from versioning.deltas.detectors.changeset.characters.entity import CharacterDetector as ChangesetCharacterDetector
 from versioning.deltas.detectors.changeset.game_events.collection import GameEventsDetector as ChangesetGameEventsDetector
+from versioning.deltas.detectors.changeset.compiler import compile_detector
 # You would also import game_events detector here if you had one
 
 # --- Imports for the Internal Diff Detector Tree ---
@@ -25,16 +30,23 @@ class CheckpointManagerFactory:
     Its only job is to create fully configured instances
     of StateCheckpointManager with default detector trees.
     """
-    def create_manager(self, state: SimulatedGameState) -> StateCheckpointManager:
+    def create_manager(
+        self,
+        state: SimulatedGameState,
+        operation_log: Optional[OperationLog] = None,
+        checkpoint_store: Optional[CheckpointStore] = None
+    ) -> StateCheckpointManager:
         # --- 1. Construct tree for changeset detectors ---
-        changeset_scenario_detector = ChangesetScenarioDetector()
-        changeset_connection_info_detector = ChangesetConnectionInfoDetector()
+        # Entity detectors run once per changed entity, so their trees are compiled
+        # into flat comparators (same output, no per-field dispatch).
+        changeset_scenario_detector = compile_detector(ChangesetScenarioDetector())
+        changeset_connection_info_detector = compile_detector(ChangesetConnectionInfoDetector())
         changeset_map_detector = ChangesetMapDetector(
             scenario_detector=changeset_scenario_detector,
             connection_detector=changeset_connection_info_detector
         )
         
-        changeset_character_detector = ChangesetCharacterDetector()
+        changeset_character_detector = compile_detector(ChangesetCharacterDetector())
         changeset_characters_collection_detector = ChangesetCharactersDetector(
             character_detector=changeset_character_detector
         )
@@ -72,6 +84,8 @@ class CheckpointManagerFactory:
         manager = StateCheckpointManager(
             state=state,
             default_changeset_detector=default_changeset_detector,
-            default_internal_diff_detector=default_internal_diff_detector
+            default_internal_diff_detector=default_internal_diff_detector,
+            operation_log=operation_log,
+            checkpoint_store=checkpoint_store
         )
         return manager
\ No newline at end of file
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from copy import deepcopy
 from simulated.components.characters import SimulatedCharacters
 from simulated.components.map import SimulatedMap
@@ -16,28 +18,55 @@ from simulated.game_state import SimulatedGameState
 from typing import Any
 from uuid import uuid4
 from versioning.deltas.checkpoints.base import StateCheckpointBase
-from typing import Dict, Optional, Type
+from typing import Dict, Iterator, Optional, Tuple, Type
 from versioning.deltas.detectors.changeset.root import ChangesetDetector
 from versioning.deltas.detectors.internal.root_internal import InternalDiffDetector
 from versioning.deltas.checkpoints.changeset import ChangesetCheckpoint
 from versioning.deltas.checkpoints.internal import InternalStateCheckpoint
-from versioning.deltas.schemas import DiffResultModel
+from versioning.deltas.schemas import DiffResultModel, CheckpointStoreStats
+from versioning.deltas.store import CheckpointStore
 from core_game.game_event.schemas import GameEventsManagerModel
+from versioning.layers.oplog import OperationLog
+from versioning.layers.snapshots import StateSnapshot
+
+# Changesets kept for repeated (from checkpoint, to snapshot version) requests.
+CHANGESET_CACHE_SIZE = 32
+
+# Order in which iter_full_changeset pages a checkpoint (keys of `entity_versions`).
+FULL_CHANGESET_SECTIONS = ("scenarios", "connections", "characters", "events")
+
+# Start of the ids of content-addressed checkpoints, which are only reached through handles.
+CONTENT_ID_PREFIX = "cp-"
 
 class StateCheckpointManager:
     """
     Manages the lifecycle of checkpoints, holding a reference 
     to the game state it operates on.
+
+    Checkpoints taken from a read snapshot (and empty ones) are content-addressed:
+    every caller at the same snapshot version shares one reference-counted checkpoint,
+    and changesets between two such versions are computed once and served from a
+    small cache. Each caller gets its own random handle to the shared checkpoint and
+    releases only that one; the content id itself is never handed out nor accepted.
     """
     
     def __init__(
         self,
         state: SimulatedGameState,
         default_changeset_detector: ChangesetDetector,
-        default_internal_diff_detector: InternalDiffDetector
+        default_internal_diff_detector: InternalDiffDetector,
+        operation_log: Optional[OperationLog] = None,
+        checkpoint_store: Optional[CheckpointStore] = None
     ):
         self._state = state
-        self._checkpoints: Dict[str, StateCheckpointBase] = {}
+        self._checkpoints = checkpoint_store if checkpoint_store is not None else CheckpointStore()
+        self._operation_log = operation_log
+
+        # Prefix of content-addressed ids; unique per manager so ids from another
+        # world (or a reset one) never resolve to a checkpoint of this one.
+        self._content_prefix = f"{CONTENT_ID_PREFIX}{uuid4().hex[:12]}-"
+        self._changeset_cache: OrderedDict[Tuple[str, int], Optional[Dict[str, Any]]] = OrderedDict()
+        self._changeset_cache_lock = threading.Lock()
         
         self._default_changeset_detector = default_changeset_detector
         self._default_internal_diff_detector = default_internal_diff_detector
@@ -45,7 +74,9 @@ class StateCheckpointManager:
     def create_checkpoint(
         self,
         checkpoint_type: Type[StateCheckpointBase],
-        checkpoint_id: Optional[str] = None
+        checkpoint_id: Optional[str] = None,
+        state: Optional[StateSnapshot] = None,
+        evictable: bool = True
     ) -> str:
         """
         Creates a checkpoint of a specific type from the stored game state.
@@ -53,66 +84,185 @@ class StateCheckpointManager:
         Args:
             checkpoint_type: The class of the checkpoint to create.
             checkpoint_id: An optional ID for the checkpoint.
+            state: A pinned read snapshot to use instead of the live state.
+            evictable: False keeps the checkpoint regardless of TTL and memory
+                budget, until it is deleted explicitly.
         
         Returns:
-            The ID of the created checkpoint.
+            The ID of the created checkpoint. Without an explicit id, checkpoints of
+            a snapshot are shared and the ID is a handle of this caller's own: release
+            it with delete_checkpoint as usual.
         """
+        if checkpoint_id is None and state is not None and evictable:
+            content_id = self._content_id(checkpoint_type, f"v{state.version}")
+            handle = self._checkpoints.acquire(content_id)
+            if handle is None:
+                handle = self._checkpoints.put(content_id, checkpoint_type.create(state), shared=True)
+            return handle
+
         if checkpoint_id is None:
             checkpoint_id = str(uuid4())
         
+        self._check_client_id(checkpoint_id)
         if checkpoint_id in self._checkpoints:
             raise RuntimeError(f"Checkpoint '{checkpoint_id}' already exists")
         
-        self._checkpoints[checkpoint_id] = checkpoint_type.create(self._state)
+        self._checkpoints.put(checkpoint_id, checkpoint_type.create(state or self._state), evictable=evictable)
         return checkpoint_id
 
+    def _content_id(self, checkpoint_type: Type[StateCheckpointBase], content: str) -> str:
+        return f"{self._content_prefix}{checkpoint_type.__name__}-{content}"
+
+    @staticmethod
+    def _check_client_id(checkpoint_id: str) -> None:
+        """Shared checkpoints are only reachable through handles, so their ids are refused."""
+        if checkpoint_id.startswith(CONTENT_ID_PREFIX):
+            raise RuntimeError(f"Checkpoint '{checkpoint_id}' not found")
+
     def get_checkpoint(self, checkpoint_id: str) -> StateCheckpointBase:
         """
         Retrieves a checkpoint by its ID.
         
         Returns the base type. You may need to check its instance type
         if you need to access specific subclass fields.
+        Raises CheckpointExpiredError if it was evicted or expired.
         """
-        if checkpoint_id not in self._checkpoints:
-            raise RuntimeError(f"Checkpoint '{checkpoint_id}' not found")
-        return self._checkpoints[checkpoint_id]
+        self._check_client_id(checkpoint_id)
+        return self._checkpoints.get(checkpoint_id)
 
     def delete_checkpoint(self, checkpoint_id: str) -> None:
-        """Removes a stored checkpoint to free up memory."""
-        if checkpoint_id in self._checkpoints:
-            del self._checkpoints[checkpoint_id]
-        else:
-            raise RuntimeError(f"Checkpoint '{checkpoint_id}' not found")
+        """
+        Removes a stored checkpoint to free up memory. For a handle, releases that
+        handle's hold on the shared checkpoint; a released handle is not found again.
+        """
+        self._check_client_id(checkpoint_id)
+        self._checkpoints.delete(checkpoint_id)
+
+    def get_store_stats(self) -> CheckpointStoreStats:
+        """Count, estimated bytes and evictions of the stored checkpoints."""
+        return self._checkpoints.stats()
+
+    def close(self) -> None:
+        """Closes the checkpoint store (and its persistent backend, if any)."""
+        self._checkpoints.close()
 
 
     def generate_changeset(
         self, 
         from_id: str, 
         to_id: Optional[str] = None,
-        detector_override: Optional[ChangesetDetector] = None
+        detector_override: Optional[ChangesetDetector] = None,
+        state: Optional[StateSnapshot] = None
     ) -> Dict[str, Any] | None:
         """
         Generates a client-facing changeset.
 
         Compares the 'from_id' checkpoint against the 'to_id' checkpoint.
-        If 'to_id' is None, it compares against the current live state.
+        If 'to_id' is None, it compares against `state` (a pinned read snapshot)
+        or, when not given, the current live state.
+
+        When comparing a snapshot-based checkpoint against a newer snapshot, only the
+        entities in the operation log range between them are diffed. Results from a
+        content-addressed checkpoint to a snapshot are cached and shared by every
+        caller: treat the returned changeset as read-only.
         """
         cp_from_base = self.get_checkpoint(from_id)
         if not isinstance(cp_from_base, ChangesetCheckpoint):
             raise TypeError("Changeset generation requires a 'ChangesetCheckpoint' as its origin ('from_id').")
         cp_from = cp_from_base
 
-        if to_id is not None:
+        cache_key: Optional[Tuple[str, int]] = None
+        content_id = self._checkpoints.resolve(from_id)
+        if to_id is None and detector_override is None and state is not None and content_id.startswith(self._content_prefix):
+            cache_key = (content_id, state.version)
+            with self._changeset_cache_lock:
+                if cache_key in self._changeset_cache:
+                    self._changeset_cache.move_to_end(cache_key)
+                    return self._changeset_cache[cache_key]
+
+        touched = self._touched_since(cp_from, state) if to_id is None else None
+        if touched is not None:
+            assert state is not None
+            cp_from = cp_from.restricted_to(touched)
+            cp_to = ChangesetCheckpoint.create_partial(state, touched)
+        elif to_id is not None:
             cp_to_base = self.get_checkpoint(to_id)
             if not isinstance(cp_to_base, ChangesetCheckpoint):
                 raise TypeError("When 'to_id' is provided, it must also be a 'ChangesetCheckpoint'.")
             cp_to = cp_to_base
         else:
-            cp_to = ChangesetCheckpoint.create(self._state)
+            cp_to = ChangesetCheckpoint.create(state or self._state)
 
         detector_to_use = detector_override if detector_override is not None else self._default_changeset_detector
                 
-        return detector_to_use.detect(cp_from, cp_to)
+        changeset = detector_to_use.detect(cp_from, cp_to)
+        if cache_key is not None:
+            with self._changeset_cache_lock:
+                self._changeset_cache[cache_key] = changeset
+                while len(self._changeset_cache) > CHANGESET_CACHE_SIZE:
+                    self._changeset_cache.popitem(last=False)
+        return changeset
+
+    def _touched_since(self, cp_from: ChangesetCheckpoint, state: Optional[StateSnapshot]) -> Optional[Dict[str, Dict[str, str]]]:
+        """Entities committed between the checkpoint and the snapshot, or None if the log cannot tell."""
+        if self._operation_log is None or state is None or cp_from.log_sequence is None:
+            return None
+        if cp_from.log_sequence > state.log_sequence:
+            return None
+        return self._operation_log.compact(cp_from.log_sequence, state.log_sequence)
+
+    def iter_full_changeset(
+        self,
+        checkpoint_id: str,
+        page_size: int,
+        section: Optional[str] = None,
+        offset: int = 0
+    ) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        """
+        Yields the full changeset of a ChangesetCheckpoint (what a changeset from an
+        empty checkpoint would contain) in pages of at most `page_size` entities:
+        scenarios, then connections, characters and events, each in id order.
+
+        Every item is (section, offset, count, changes); applying the pages in order
+        is the same as applying the whole changeset. (section, offset) resumes right
+        at that position. Only one page is materialized at a time, and pages are read
+        from the checkpoint, so they are all of the same snapshot version.
+        """
+        cp_base = self.get_checkpoint(checkpoint_id)
+        if not isinstance(cp_base, ChangesetCheckpoint):
+            raise TypeError("Full changeset streaming requires a 'ChangesetCheckpoint'.")
+        if section is not None and section not in FULL_CHANGESET_SECTIONS:
+            raise ValueError(f"Unknown changeset section '{section}'")
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        checkpoint = cp_base
+
+        entity_ids = {
+            "scenarios": sorted(checkpoint.map_snapshot.scenarios),
+            "connections": sorted(checkpoint.map_snapshot.connections),
+            "characters": sorted(checkpoint.characters_snapshot.registry),
+            "events": sorted(checkpoint.game_events_snapshot.all_events),
+        }
+        player_id = checkpoint.characters_snapshot.player_character_id
+        start_index = FULL_CHANGESET_SECTIONS.index(section) if section is not None else 0
+
+        for index in range(start_index, len(FULL_CHANGESET_SECTIONS)):
+            name = FULL_CHANGESET_SECTIONS[index]
+            ids = entity_ids[name]
+            first = offset if index == start_index else 0
+            for page_start in range(first, len(ids), page_size):
+                page_ids = ids[page_start:page_start + page_size]
+                page = checkpoint.restricted_to({name: page_ids})
+                # The player id is sent once, with the first page of characters.
+                base = ChangesetCheckpoint(
+                    map_snapshot=GameMapModel(),
+                    characters_snapshot=CharactersModel(
+                        player_character_id=None if (name == "characters" and page_start == 0) else player_id
+                    ),
+                    game_events_snapshot=GameEventsManagerModel(),
+                )
+                changeset = self._default_changeset_detector.detect(base, page)
+                yield name, page_start, len(page_ids), changeset.get("changes") if changeset else {}
 
     def generate_internal_diff(
         self, 
@@ -150,12 +300,19 @@ class StateCheckpointManager:
     ) -> str:
         """
         Crea un checkpoint vacío (sin datos), útil como base para comparar contra el estado actual.
+        Sin id explícito, todos los checkpoints vacíos de un tipo comparten uno solo,
+        y cada llamada recibe su propio handle.
         """
+        shared = checkpoint_id is None
         if checkpoint_id is None:
-            checkpoint_id = str(uuid4())
-
-        if checkpoint_id in self._checkpoints:
-            raise RuntimeError(f"Checkpoint '{checkpoint_id}' already exists")
+            checkpoint_id = self._content_id(checkpoint_type, "empty")
+            handle = self._checkpoints.acquire(checkpoint_id)
+            if handle is not None:
+                return handle
+        else:
+            self._check_client_id(checkpoint_id)
+            if checkpoint_id in self._checkpoints:
+                raise RuntimeError(f"Checkpoint '{checkpoint_id}' already exists")
 
         # Instancia manualmente un checkpoint vacío según el tipo
         if checkpoint_type is ChangesetCheckpoint:
@@ -170,5 +327,5 @@ class StateCheckpointManager:
                 characters_snapshot=CharactersModel(),
             )
 
-        self._checkpoints[checkpoint_id] = empty_cp
-        return checkpoint_id
\ No newline at end of file
+        handle = self._checkpoints.put(checkpoint_id, empty_cp, shared=shared)
+        return handle if handle is not None else checkpoint_id
\ No newline at end of file
@@ -31,3 +31,14 @@ class CharacterDiffModel(BaseModel):
 class DiffResultModel(BaseModel):
     scenarios: ScenarioDiffModel
     characters: CharacterDiffModel
+
+
+class CheckpointStoreStats(BaseModel):
+    """Monitoring counters of a CheckpointStore."""
+    count: int = Field(..., description="Checkpoints currently stored (a shared checkpoint counts once).")
+    holders: int = Field(0, description="Checkpoint ids handed out that are still alive (sum of holders).")
+    bytes: int = Field(..., description="Estimated memory held by the stored checkpoints (shared entity payloads counted once).")
+    budget_bytes: int
+    ttl_seconds: float
+    evictions: int = Field(0, description="Checkpoints dropped to stay within the memory budget.")
+    expirations: int = Field(0, description="Checkpoints dropped after being idle for longer than the TTL.")
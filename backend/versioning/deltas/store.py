@@ -0,0 +1,327 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from versioning.deltas.backends.base import CheckpointBackend
+from versioning.deltas.checkpoints.base import StateCheckpointBase
+from versioning.deltas.exceptions import CheckpointExpiredError
+from versioning.deltas.schemas import CheckpointStoreStats
+
+# Rough cost of one entity entry in a checkpoint (dict slots, id string, version int).
+ENTRY_OVERHEAD_BYTES = 160
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 30 * 60.0
+# Accesses are written to the backend at most this often per checkpoint, and idle
+# checkpoints are purged from it at most this often.
+BACKEND_SYNC_SECONDS = 60.0
+
+
+class _StoredCheckpoint:
+    def __init__(self, checkpoint: StateCheckpointBase, payload_ids: List[int], size_bytes: int, evictable: bool, last_access: float):
+        self.checkpoint = checkpoint
+        self.payload_ids = payload_ids
+        self.size_bytes = size_bytes
+        self.evictable = evictable
+        self.last_access = last_access
+        self.synced_access = last_access
+        self.holders = 1
+
+
+class CheckpointStore:
+    """
+    Memory-bounded storage of checkpoints.
+
+    - Every checkpoint is charged its entries plus the serialized size of the entity
+      payloads it is the first to reference; payloads shared between checkpoints
+      (see checkpoints.payloads) are counted once and released with their last holder.
+    - Checkpoints idle for longer than `ttl_seconds` expire; when the total goes over
+      `budget_bytes` the least recently used ones are evicted.
+    - Asking for a dropped checkpoint raises CheckpointExpiredError, so the client
+      knows it has to resync. Non-evictable checkpoints are only removed explicitly.
+    - Shared (content-addressed) checkpoints are reference counted: storing one that
+      already exists adds a holder, and delete() only drops it with its last holder.
+      Every holder gets its own random handle, which is what callers hand out and
+      pass back: deleting a handle releases that holder once, and the shared id is
+      never needed outside the store.
+    - With a `backend`, checkpoints are also written to it (see backends.base): the
+      memory budget then only unloads them, and they are loaded back when asked for,
+      by this process or the next one. Without it (the default) the store is memory only.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        max_expired_ids: int = 10_000,
+        backend: Optional[CheckpointBackend] = None,
+    ) -> None:
+        self._budget_bytes = budget_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._max_expired_ids = max_expired_ids
+        self._lock = threading.RLock()
+        self._backend = backend
+        self._backend_expired_at: Optional[float] = None
+
+        # Least recently used first.
+        self._entries: "OrderedDict[str, _StoredCheckpoint]" = OrderedDict()
+        # Ids of dropped checkpoints, remembered to tell "expired" apart from "unknown".
+        self._expired_ids: "OrderedDict[str, None]" = OrderedDict()
+        # Handles of the holders of shared checkpoints: handle -> checkpoint id, and back.
+        self._handles: Dict[str, str] = {}
+        self._handles_by_checkpoint: Dict[str, Set[str]] = {}
+        # Shared payloads: id(payload) -> [payload, holders, bytes]. Holding the payload
+        # keeps its id() stable while it is accounted.
+        self._payloads: Dict[int, list] = {}
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def put(self, checkpoint_id: str, checkpoint: StateCheckpointBase, evictable: bool = True, shared: bool = False) -> Optional[str]:
+        """Stores a checkpoint. With `shared`, returns the handle of the new holder."""
+        with self._lock:
+            if checkpoint_id in self._entries or self._load(checkpoint_id) is not None:
+                if not shared:
+                    raise RuntimeError(f"Checkpoint '{checkpoint_id}' already exists")
+                self._hold(checkpoint_id)
+                return self._new_handle(checkpoint_id)
+            self._expired_ids.pop(checkpoint_id, None)
+            self._insert(checkpoint_id, checkpoint, evictable, holders=1)
+            if self._backend is not None:
+                self._backend.save(checkpoint_id, checkpoint, 1, evictable)
+            handle = self._new_handle(checkpoint_id) if shared else None
+            self._expire()
+            self._evict(keep=checkpoint_id)
+            return handle
+
+    def get(self, checkpoint_id: str) -> StateCheckpointBase:
+        """The checkpoint of an id or of a handle."""
+        with self._lock:
+            self._expire()
+            handle = checkpoint_id
+            checkpoint_id = self.resolve(handle)
+            entry = self._lookup(checkpoint_id, shown_id=handle)
+            entry.last_access = self._clock()
+            self._entries.move_to_end(checkpoint_id)
+            if self._backend is not None and entry.last_access - entry.synced_access >= BACKEND_SYNC_SECONDS:
+                self._backend.touch(checkpoint_id)
+                entry.synced_access = entry.last_access
+            return entry.checkpoint
+
+    def acquire(self, checkpoint_id: str) -> Optional[str]:
+        """Adds a holder to a stored shared checkpoint and returns its handle; None if it is not stored."""
+        with self._lock:
+            self._expire()
+            if checkpoint_id not in self._entries and self._load(checkpoint_id) is None:
+                return None
+            self._hold(checkpoint_id)
+            return self._new_handle(checkpoint_id)
+
+    def resolve(self, checkpoint_id: str) -> str:
+        """The checkpoint id a handle stands for; other ids are returned as they are."""
+        with self._lock:
+            target = self._handles.get(checkpoint_id)
+            if target is None and self._backend is not None:
+                target = self._backend.load_handle(checkpoint_id)
+                if target is not None:
+                    self._register_handle(checkpoint_id, target)
+            return target if target is not None else checkpoint_id
+
+    def delete(self, checkpoint_id: str) -> None:
+        """
+        Releases one holder of the checkpoint and drops it when none is left.
+        A handle releases its own holder, and only once: it is forgotten afterwards.
+        """
+        with self._lock:
+            handle = checkpoint_id
+            checkpoint_id = self.resolve(handle)
+            if checkpoint_id != handle:
+                self._forget_handle(handle)
+            entry = self._lookup(checkpoint_id, shown_id=handle)
+            entry.holders -= 1
+            if entry.holders <= 0:
+                self._drop(checkpoint_id, expired=False)
+                if self._backend is not None:
+                    self._backend.delete(checkpoint_id)
+            elif self._backend is not None:
+                self._backend.set_holders(checkpoint_id, entry.holders)
+
+    def size_of(self, checkpoint_id: str) -> int:
+        """Bytes charged to a checkpoint when it was stored."""
+        with self._lock:
+            return self._entries[checkpoint_id].size_bytes
+
+    def stats(self) -> CheckpointStoreStats:
+        with self._lock:
+            return CheckpointStoreStats(
+                count=len(self._entries),
+                holders=sum(entry.holders for entry in self._entries.values()),
+                bytes=self._bytes,
+                budget_bytes=self._budget_bytes,
+                ttl_seconds=self._ttl_seconds,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def close(self) -> None:
+        """Closes the backend; the checkpoints it holds stay there."""
+        if self._backend is not None:
+            self._backend.close()
+
+    def __contains__(self, checkpoint_id: object) -> bool:
+        if checkpoint_id in self._entries:
+            return True
+        return self._backend is not None and isinstance(checkpoint_id, str) and self._backend.contains(checkpoint_id)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, checkpoint_id: str, checkpoint: StateCheckpointBase, evictable: bool, holders: int) -> _StoredCheckpoint:
+        payload_ids: List[int] = []
+        size = 0
+        for payload in checkpoint.iter_payloads():
+            size += ENTRY_OVERHEAD_BYTES + self._hold_payload(payload)
+            payload_ids.append(id(payload))
+        entry = _StoredCheckpoint(checkpoint, payload_ids, size, evictable, self._clock())
+        entry.holders = holders
+        self._entries[checkpoint_id] = entry
+        self._bytes += ENTRY_OVERHEAD_BYTES * len(payload_ids)
+        return entry
+
+    def _load(self, checkpoint_id: str) -> Optional[_StoredCheckpoint]:
+        """Loads a checkpoint missing from memory back from the backend; None if it has none."""
+        if self._backend is None:
+            return None
+        persisted = self._backend.load(checkpoint_id)
+        if persisted is None:
+            return None
+        self._expired_ids.pop(checkpoint_id, None)
+        entry = self._insert(checkpoint_id, persisted.checkpoint, persisted.evictable, persisted.holders)
+        self._evict(keep=checkpoint_id)
+        return entry
+
+    def _lookup(self, checkpoint_id: str, shown_id: Optional[str] = None) -> _StoredCheckpoint:
+        """The entry of a checkpoint; errors name `shown_id` (the handle asked for) when given."""
+        entry = self._entries.get(checkpoint_id) or self._load(checkpoint_id)
+        if entry is None:
+            shown_id = shown_id or checkpoint_id
+            if checkpoint_id in self._expired_ids or shown_id in self._expired_ids:
+                raise CheckpointExpiredError(shown_id)
+            raise RuntimeError(f"Checkpoint '{shown_id}' not found")
+        return entry
+
+    def _new_handle(self, checkpoint_id: str) -> str:
+        handle = f"h-{secrets.token_urlsafe(18)}"
+        self._register_handle(handle, checkpoint_id)
+        if self._backend is not None:
+            self._backend.save_handle(handle, checkpoint_id)
+        return handle
+
+    def _register_handle(self, handle: str, checkpoint_id: str) -> None:
+        self._handles[handle] = checkpoint_id
+        self._handles_by_checkpoint.setdefault(checkpoint_id, set()).add(handle)
+
+    def _forget_handle(self, handle: str) -> None:
+        checkpoint_id = self._handles.pop(handle)
+        handles = self._handles_by_checkpoint.get(checkpoint_id)
+        if handles is not None:
+            handles.discard(handle)
+            if not handles:
+                del self._handles_by_checkpoint[checkpoint_id]
+        if self._backend is not None:
+            self._backend.delete_handle(handle)
+
+    def _hold(self, checkpoint_id: str) -> None:
+        entry = self._entries[checkpoint_id]
+        entry.holders += 1
+        entry.last_access = self._clock()
+        self._entries.move_to_end(checkpoint_id)
+        if self._backend is not None:
+            self._backend.set_holders(checkpoint_id, entry.holders)
+            entry.synced_access = entry.last_access
+
+    def _hold_payload(self, payload: BaseModel) -> int:
+        """Adds a holder to a payload; returns the bytes this made newly accounted."""
+        held = self._payloads.get(id(payload))
+        if held is not None:
+            held[1] += 1
+            return 0
+        size = len(payload.model_dump_json())
+        self._payloads[id(payload)] = [payload, 1, size]
+        self._bytes += size
+        return size
+
+    def _release_payload(self, payload_id: int) -> None:
+        held = self._payloads[payload_id]
+        held[1] -= 1
+        if held[1] == 0:
+            del self._payloads[payload_id]
+            self._bytes -= held[2]
+
+    def _drop(self, checkpoint_id: str, expired: bool) -> None:
+        """Removes a checkpoint from memory (the backend is up to the caller)."""
+        entry = self._entries.pop(checkpoint_id)
+        for payload_id in entry.payload_ids:
+            self._release_payload(payload_id)
+        self._bytes -= ENTRY_OVERHEAD_BYTES * len(entry.payload_ids)
+        if expired:
+            self._remember_expired(checkpoint_id)
+            self._drop_handles(checkpoint_id)
+
+    def _drop_handles(self, checkpoint_id: str) -> None:
+        """Forgets the handles of a dropped checkpoint, remembering them as expired."""
+        for handle in self._handles_by_checkpoint.pop(checkpoint_id, ()):
+            del self._handles[handle]
+            self._remember_expired(handle)
+
+    def _remember_expired(self, checkpoint_id: str) -> None:
+        self._expired_ids[checkpoint_id] = None
+        while len(self._expired_ids) > self._max_expired_ids:
+            self._expired_ids.popitem(last=False)
+
+    def _expire(self) -> None:
+        deadline = self._clock() - self._ttl_seconds
+        # Entries are in access order, so the idle ones are at the front.
+        for checkpoint_id, entry in list(self._entries.items()):
+            if entry.last_access > deadline:
+                break
+            if entry.evictable:
+                self._drop(checkpoint_id, expired=True)
+                self._expirations += 1
+                if self._backend is not None:
+                    self._backend.delete(checkpoint_id)
+        self._expire_backend()
+
+    def _expire_backend(self) -> None:
+        """Purges the idle checkpoints that are only in the backend (e.g. from a previous run)."""
+        now = self._clock()
+        if self._backend is None or (self._backend_expired_at is not None and now - self._backend_expired_at < BACKEND_SYNC_SECONDS):
+            return
+        self._backend_expired_at = now
+        for checkpoint_id, entry in self._entries.items():
+            if entry.last_access != entry.synced_access:
+                self._backend.touch(checkpoint_id)
+                entry.synced_access = entry.last_access
+        for checkpoint_id in self._backend.expire(self._ttl_seconds):
+            if checkpoint_id in self._entries:
+                self._drop(checkpoint_id, expired=True)
+            else:
+                self._remember_expired(checkpoint_id)
+                self._drop_handles(checkpoint_id)
+            self._expirations += 1
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        if self._bytes <= self._budget_bytes:
+            return
+        for checkpoint_id, entry in list(self._entries.items()):
+            if self._bytes <= self._budget_bytes:
+                break
+            if entry.evictable and checkpoint_id != keep:
+                # With a backend the checkpoint is only unloaded: it can be loaded back.
+                self._drop(checkpoint_id, expired=self._backend is None)
+                self._evictions += 1
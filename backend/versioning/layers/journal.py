@@ -0,0 +1,70 @@
+from typing import Callable, Dict, Hashable, List, MutableMapping, Sequence
+
+
+class UndoJournal:
+    """
+    Undo log of a single journal-mode transaction.
+    Domain objects are mutated in place; before the first write to a key inside the
+    transaction, the writer records a closure that restores the previous value.
+    """
+
+    def __init__(self) -> None:
+        self._undo_by_key: Dict[Hashable, Callable[[], None]] = {}
+        self._finalizers: Dict[Hashable, Callable[[], None]] = {}
+
+    def is_recorded(self, key: Hashable) -> bool:
+        return key in self._undo_by_key
+
+    def record(self, key: Hashable, undo: Callable[[], None]) -> None:
+        """Registers the inverse of the first write to `key`. Later writes to the same key are ignored."""
+        if key not in self._undo_by_key:
+            self._undo_by_key[key] = undo
+
+    def has_finalizer(self, key: Hashable) -> bool:
+        return key in self._finalizers
+
+    def add_finalizer(self, key: Hashable, finalizer: Callable[[], None]) -> None:
+        """Registers a callback executed once after all inverses were replayed (e.g. rebuilding indexes)."""
+        if key not in self._finalizers:
+            self._finalizers[key] = finalizer
+
+    def merge_into(self, parent: "UndoJournal") -> None:
+        """
+        Hands this journal over to the enclosing transaction.
+        The parent keeps its own (older) inverse for keys it had already recorded.
+        """
+        for key, undo in self._undo_by_key.items():
+            parent.record(key, undo)
+        for key, finalizer in self._finalizers.items():
+            parent.add_finalizer(key, finalizer)
+
+    def undo(self) -> None:
+        """Replays the recorded inverses, newest first, and then runs the finalizers."""
+        inverses: List[Callable[[], None]] = list(self._undo_by_key.values())
+        for undo in reversed(inverses):
+            undo()
+        for finalizer in self._finalizers.values():
+            finalizer()
+        self._undo_by_key.clear()
+        self._finalizers.clear()
+
+    def __len__(self) -> int:
+        return len(self._undo_by_key)
+
+
+def restore_key_order(store: MutableMapping, order: Sequence[Hashable]) -> None:
+    """
+    Puts the keys of `store` back in `order`, an earlier order of its keys (keys missing from
+    it stay last). An entity deleted and restored by an undo comes back at the end of the
+    dict; only the keys from the first misplaced one on are moved.
+    """
+    ordered = [key for key in order if key in store]
+    listed = set(ordered)
+    ordered += [key for key in store if key not in listed]
+    current = list(store)
+    first = next((index for index, (key, expected) in enumerate(zip(current, ordered)) if key != expected), None)
+    if first is None:
+        return
+    values = {key: store.pop(key) for key in current[first:]}
+    for key in ordered[first:]:
+        store[key] = values[key]
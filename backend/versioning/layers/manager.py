@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import Set, List, TYPE_CHECKING
+import threading
+from typing import Set, List, Literal, Any, Callable, TYPE_CHECKING
+from copy import deepcopy
 
 
 if TYPE_CHECKING:
-    from core_game.game_state.singleton import GameStateSingleton
     from core_game.game_state.domain import GameState
 
 from simulated.components.map import SimulatedMap
@@ -13,13 +14,28 @@ from simulated.components.relationships import SimulatedRelationships
 from simulated.components.narrative import SimulatedNarrative
 from simulated.components.game_events import SimulatedGameEvents
 from versioning.layers.state import SimulationLayer # Importamos la clase SimulationLayer
+from versioning.layers.journal import UndoJournal
+from versioning.layers.schemas import DirtyEntitySet
+
+TransactionMode = Literal["copy", "journal"]
 
 class GameStateVersionManager:
     """
     Manages the versioning of the game state through layers (transactions).
     Its sole responsibility is to handle begin, commit, and rollback operations.
+
+    Two transaction modes are available:
+    - "copy": each transaction is a SimulationLayer holding copy-on-write forks of
+      the components it writes to (default).
+    - "journal": the live domain objects are mutated in place and each transaction
+      keeps an UndoJournal with the inverse of its writes. Commit hands the journal
+      to the parent (or drops it at the root) and rollback replays it.
     """
-    def __init__(self, game_state: GameState):
+    def __init__(self, game_state: GameState, transaction_mode: TransactionMode = "copy"):
+        if transaction_mode not in ("copy", "journal"):
+            raise ValueError(f"Unknown transaction mode '{transaction_mode}'.")
+        self._transaction_mode: TransactionMode = transaction_mode
+        self._game_state = game_state
         self._base_map = SimulatedMap(game_state.game_map)
         self._base_characters = SimulatedCharacters(game_state.characters)
         self._base_relationships = SimulatedRelationships(game_state.relationships)
@@ -27,6 +43,20 @@ class GameStateVersionManager:
         self._base_narrative = SimulatedNarrative(game_state.narrative_state)
         self._base_game_events = SimulatedGameEvents(game_state.game_events)
         self._layers: List[SimulationLayer] = []
+        self._journals: List[UndoJournal] = []
+        self._dirty_components: Set[str] = set()
+        self._commit_listeners: List[Callable[[DirtyEntitySet], None]] = []
+        # Serializes the operations that write the base state (root commit, journal
+        # rollback, flush) against readers that need a consistent base, e.g. snapshot publishing.
+        self._lock = threading.RLock()
+
+    @property
+    def transaction_mode(self) -> TransactionMode:
+        return self._transaction_mode
+
+    @property
+    def transaction_depth(self) -> int:
+        return len(self._journals) if self._transaction_mode == "journal" else len(self._layers)
 
     @property
     def base_map(self) -> SimulatedMap:
@@ -54,36 +84,57 @@ class GameStateVersionManager:
 
     def begin_transaction(self):
         """Starts a new transaction layer."""
-        parent = self._layers[-1] if self._layers else None
-        self._layers.append(SimulationLayer(parent=parent, version_manager=self))
+        # Under the lock: readers that flush base writes (see SnapshotStore.pin) must not
+        # see a depth of 0 while a journal transaction starts writing the base in place.
+        with self._lock:
+            if self._transaction_mode == "journal":
+                self._journals.append(UndoJournal())
+                self._attach_journal(self._journals[-1])
+                return
+            parent = self._layers[-1] if self._layers else None
+            self._layers.append(SimulationLayer(parent=parent, version_manager=self))
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
 
     def commit(self):
         """Commits the changes from the current layer to its parent or the base state."""
+        with self._lock:
+            if self._transaction_mode == "journal":
+                self._commit_journal()
+            else:
+                self._commit_layer()
+
+    def _commit_layer(self) -> None:
         if not self._layers:
             raise RuntimeError("No simulation layer to commit.")
         
         layer = self._layers.pop()
         parent = self._layers[-1] if self._layers else None
 
+        # Map, characters and events are forks: only their dirty entities are applied
+        # to the parent fork or, at the root, in place to the base domain objects.
         if layer.has_modified_map():
-            if parent:
+            if parent and not parent.has_modified_map():
                 parent.set_modified_map(layer.get_modified_map())
             else:
-                self._base_map = layer.get_modified_map()
-                self._sync_map_to_domain()
+                target = parent.get_modified_map() if parent else self._base_map
+                target.get_state().apply_changes_from(layer.get_modified_map().get_state())
 
         if layer.has_modified_characters():
-            if parent:
+            if parent and not parent.has_modified_characters():
                 parent.set_modified_characters(layer.get_modified_characters())
             else:
-                self._base_characters = layer.get_modified_characters()
-                self._sync_characters_to_domain()
+                target_characters = parent.get_modified_characters() if parent else self._base_characters
+                target_characters.get_state().apply_changes_from(layer.get_modified_characters().get_state())
 
         if layer.has_modified_relationships():
             if parent:
                 parent.set_modified_relationships(layer.get_modified_relationships())
             else:
                 self._base_relationships = layer.get_modified_relationships()
+                self._dirty_components.add("relationships")
                 self._sync_relationships_to_domain()
 
         if layer.has_modified_narrative():
@@ -91,27 +142,118 @@ class GameStateVersionManager:
                 parent.set_modified_narrative(layer.get_modified_narrative())
             else:
                 self._base_narrative = layer.get_modified_narrative()
+                self._dirty_components.add("narrative")
                 self._sync_narrative_to_domain()
 
         if layer.has_modified_game_events():
-            if parent:
+            if parent and not parent.has_modified_game_events():
                 parent.set_modified_game_events(layer.get_modified_game_events())
             else:
-                self._base_game_events = layer.get_modified_game_events()
-                self._sync_game_events_to_domain()
+                target_events = parent.get_modified_game_events() if parent else self._base_game_events
+                target_events.get_state().apply_changes_from(layer.get_modified_game_events().get_state())
 
         if layer.has_modified_session():
             if parent:
                 parent.set_modified_session(layer.get_modified_session())
             else:
                 self._base_session = layer.get_modified_session()
+                self._dirty_components.add("session")
                 self._sync_session_to_domain()
 
+        if parent is None:
+            self.flush_changes()
+
     def rollback(self):
         """Discards all changes in the current transaction layer."""
-        if not self._layers:
+        with self._lock:
+            if self._transaction_mode == "journal":
+                self._rollback_journal()
+                return
+            if not self._layers:
+                raise RuntimeError("No active simulation layers to rollback.")
+            self._layers.pop()
+
+    # --- JOURNAL MODE ---
+
+    def _attach_journal(self, journal: UndoJournal | None) -> None:
+        self._base_map.get_state().attach_journal(journal)
+        self._base_characters.get_state().attach_journal(journal)
+        self._base_game_events.get_state().attach_journal(journal)
+
+    def _commit_journal(self) -> None:
+        if not self._journals:
+            raise RuntimeError("No simulation layer to commit.")
+        journal = self._journals.pop()
+        if self._journals:
+            journal.merge_into(self._journals[-1])
+            self._attach_journal(self._journals[-1])
+        else:
+            self._attach_journal(None)
+            self.flush_changes()
+
+    def _rollback_journal(self) -> None:
+        if not self._journals:
             raise RuntimeError("No active simulation layers to rollback.")
-        self._layers.pop()
+        journal = self._journals.pop()
+        # Detach first so that restoring entities is not journaled again.
+        self._attach_journal(None)
+        journal.undo()
+        self._attach_journal(self._journals[-1] if self._journals else None)
+
+    def _journal_component_for_writing(self, component_name: str) -> Any:
+        """
+        Session, relationships and narrative have no entity-level write paths, so in
+        journal mode the whole component is snapshotted on its first write per transaction.
+        """
+        journal = self._journals[-1]
+        attribute = f"_base_{component_name}"
+        key = (id(self), component_name)
+        if not journal.is_recorded(key):
+            snapshot = deepcopy(getattr(self, attribute))
+            sync = getattr(self, f"_sync_{component_name}_to_domain")
+
+            was_dirty = component_name in self._dirty_components
+
+            def undo() -> None:
+                setattr(self, attribute, snapshot)
+                sync()
+                if not was_dirty:
+                    self._dirty_components.discard(component_name)
+
+            journal.record(key, undo)
+            self._dirty_components.add(component_name)
+        return getattr(self, attribute)
+
+    # --- CHANGE NOTIFICATION ---
+
+    def add_commit_listener(self, listener: Callable[[DirtyEntitySet], None]) -> None:
+        """Registers a callback that receives the entities changed by every root commit."""
+        self._commit_listeners.append(listener)
+
+    def remove_commit_listener(self, listener: Callable[[DirtyEntitySet], None]) -> None:
+        if listener in self._commit_listeners:
+            self._commit_listeners.remove(listener)
+
+    def flush_changes(self) -> DirtyEntitySet:
+        """
+        Collects the entities changed in the base state since the last flush and
+        notifies the commit listeners. Called on every root commit; call it after
+        writing the base state directly (outside any transaction) as well.
+        """
+        with self._lock:
+            map_dirty = self._base_map.get_state().pop_dirty_ids()
+            dirty = DirtyEntitySet(
+                scenario_ids=map_dirty["scenario"],
+                connection_ids=map_dirty["connection"],
+                character_ids=self._base_characters.get_state().pop_dirty_ids(),
+                event_ids=self._base_game_events.get_state().pop_dirty_ids(),
+                components=self._dirty_components,
+            )
+            self._dirty_components = set()
+            if not dirty.is_empty():
+                for listener in list(self._commit_listeners):
+                    listener(dirty)
+            return dirty
 
 
     def get_current_map(self, for_writing: bool = False) -> SimulatedMap:
@@ -132,6 +274,8 @@ class GameStateVersionManager:
 
     def get_current_session(self, for_writing: bool = False) -> SimulatedGameSession:
         """Gets the current session state. If for_writing, ensures it's a mutable copy."""
+        if self._journals:
+            return self._journal_component_for_writing("session") if for_writing else self._base_session
         layer = self._layers[-1] if self._layers else None
         if not layer:
             return self._base_session
@@ -140,6 +284,8 @@ class GameStateVersionManager:
 
     def get_current_relationships(self, for_writing: bool = False) -> SimulatedRelationships:
         """Gets the current relationships state. If for_writing, ensures it's a mutable copy."""
+        if self._journals:
+            return self._journal_component_for_writing("relationships") if for_writing else self._base_relationships
         layer = self._layers[-1] if self._layers else None
         if not layer:
             return self._base_relationships
@@ -147,6 +293,8 @@ class GameStateVersionManager:
         return layer.modify_relationships() if for_writing else layer.relationships
 
     def get_current_narrative(self, for_writing: bool = False) -> SimulatedNarrative:
+        if self._journals:
+            return self._journal_component_for_writing("narrative") if for_writing else self._base_narrative
         layer = self._layers[-1] if self._layers else None
         if not layer:
             return self._base_narrative
@@ -160,32 +308,11 @@ class GameStateVersionManager:
 
         return layer.modify_game_events() if for_writing else layer.game_events
 
-    def _sync_map_to_domain(self):
-        from core_game.game_state.singleton import GameStateSingleton
-        game_state = GameStateSingleton.get_instance()
-        game_state.update_map(self._base_map.get_state())
-
-    def _sync_characters_to_domain(self):
-        from core_game.game_state.singleton import GameStateSingleton
-        game_state = GameStateSingleton.get_instance()
-        game_state.update_characters(self._base_characters.get_state())
-
     def _sync_session_to_domain(self):
-        from core_game.game_state.singleton import GameStateSingleton
-        game_state = GameStateSingleton.get_instance()
-        game_state.update_session(self._base_session.get_state())
+        self._game_state.update_session(self._base_session.get_state())
 
     def _sync_relationships_to_domain(self):
-        from core_game.game_state.singleton import GameStateSingleton
-        game_state = GameStateSingleton.get_instance()
-        game_state.update_relationships(self._base_relationships.get_state())
+        self._game_state.update_relationships(self._base_relationships.get_state())
 
     def _sync_narrative_to_domain(self):
-        from core_game.game_state.singleton import GameStateSingleton
-        game_state = GameStateSingleton.get_instance()
-        game_state.update_narrative_state(self._base_narrative.get_state())
-
-    def _sync_game_events_to_domain(self):
-        from core_game.game_state.singleton import GameStateSingleton
-        game_state = GameStateSingleton.get_instance()
-        game_state.update_game_events(self._base_game_events.get_state())
\ No newline at end of file
+        self._game_state.update_narrative_state(self._base_narrative.get_state())
@@ -0,0 +1,70 @@
+import threading
+from typing import Dict, List, Literal, Optional
+
+from versioning.layers.schemas import OperationLogEntry, OperationLogKind
+
+
+class OperationLog:
+    """
+    Append-only log of the entity mutations committed to the base state.
+    Every entry gets a sequence number; a reader remembers the last sequence it saw
+    and later reads the range after it, compacted to one operation per entity.
+    Only the newest `max_entries` entries are kept.
+    """
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self._entries: List[OperationLogEntry] = []
+        self._first_sequence = 1
+        self._last_sequence = 0
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the newest entry (0 when nothing was ever logged)."""
+        return self._last_sequence
+
+    def append(self, kind: OperationLogKind, entity_id: str, op: Literal["upsert", "remove"]) -> int:
+        with self._lock:
+            self._last_sequence += 1
+            self._entries.append(OperationLogEntry(sequence=self._last_sequence, kind=kind, entity_id=entity_id, op=op))
+            overflow = len(self._entries) - self._max_entries
+            # Trim in batches so appends stay amortized O(1).
+            if overflow > self._max_entries // 4:
+                del self._entries[:overflow]
+                self._first_sequence = self._entries[0].sequence
+            return self._last_sequence
+
+    def _slice(self, since: int, until: Optional[int]) -> Optional[List[OperationLogEntry]]:
+        with self._lock:
+            if since + 1 < self._first_sequence:
+                return None
+            until = self._last_sequence if until is None else until
+            start = max(0, since + 1 - self._first_sequence)
+            stop = max(start, until + 1 - self._first_sequence)
+            return self._entries[start:stop]
+
+    def read(self, since: int, until: Optional[int] = None) -> List[OperationLogEntry]:
+        """Returns the entries with since < sequence <= until (until defaults to the newest)."""
+        entries = self._slice(since, until)
+        if entries is None:
+            raise RuntimeError(f"Operation log no longer holds the entries after sequence {since}")
+        return entries
+
+    def compact(self, since: int, until: Optional[int] = None) -> Optional[Dict[OperationLogKind, Dict[str, Literal["upsert", "remove"]]]]:
+        """
+        Returns the entities touched in (since, until], keyed by kind and id, with
+        the last operation applied to each of them; None if the range was trimmed.
+        """
+        entries = self._slice(since, until)
+        if entries is None:
+            return None
+        compacted: Dict[OperationLogKind, Dict[str, Literal["upsert", "remove"]]] = {
+            "scenarios": {}, "connections": {}, "characters": {}, "events": {},
+        }
+        for entry in entries:
+            compacted[entry.kind][entry.entity_id] = entry.op
+        return compacted
+
+    def __len__(self) -> int:
+        return len(self._entries)
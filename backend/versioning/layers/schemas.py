@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Set
+
+
+class DirtyEntitySet(BaseModel):
+    """
+    Entities added, modified or removed in the base state by a root commit (or by
+    direct base writes, see GameStateVersionManager.flush_changes).
+    An id may refer to an entity that no longer exists if it was removed.
+    """
+    scenario_ids: Set[str] = Field(default_factory=set)
+    connection_ids: Set[str] = Field(default_factory=set)
+    character_ids: Set[str] = Field(default_factory=set)
+    event_ids: Set[str] = Field(default_factory=set)
+    components: Set[str] = Field(default_factory=set, description="Whole components replaced: session, relationships or narrative.")
+
+    def is_empty(self) -> bool:
+        return not (
+            self.scenario_ids or self.connection_ids or self.character_ids
+            or self.event_ids or self.components
+        )
+
+
+OperationLogKind = Literal["scenarios", "connections", "characters", "events"]
+
+
+class OperationLogEntry(BaseModel):
+    """One committed mutation of an entity, as recorded in the OperationLog."""
+    sequence: int = Field(..., description="Position in the log; strictly increasing.")
+    kind: OperationLogKind
+    entity_id: str
+    op: Literal["upsert", "remove"] = Field(..., description="'upsert' if the entity exists after the commit, 'remove' otherwise.")
@@ -0,0 +1,214 @@
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from copy import deepcopy
+from typing import Dict, Iterator, Optional, TYPE_CHECKING
+
+from simulated.components.map import SimulatedMap
+from simulated.components.characters import SimulatedCharacters
+from simulated.components.game_session import SimulatedGameSession
+from simulated.components.relationships import SimulatedRelationships
+from simulated.components.narrative import SimulatedNarrative
+from simulated.components.game_events import SimulatedGameEvents
+from versioning.layers.schemas import DirtyEntitySet
+from versioning.layers.oplog import OperationLog
+
+if TYPE_CHECKING:
+    from versioning.layers.manager import GameStateVersionManager
+
+
+class StateSnapshot:
+    """
+    Immutable, committed version of a world.
+    Exposes the same read_only_* accessors as SimulatedGameState, so checkpoints and
+    detectors can read from it while writers keep working on the live state.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        game_map: SimulatedMap,
+        characters: SimulatedCharacters,
+        game_events: SimulatedGameEvents,
+        session: SimulatedGameSession,
+        relationships: SimulatedRelationships,
+        narrative: SimulatedNarrative,
+        log_sequence: int = 0,
+    ) -> None:
+        self._version = version
+        self._log_sequence = log_sequence
+        self._map = game_map
+        self._characters = characters
+        self._game_events = game_events
+        self._session = session
+        self._relationships = relationships
+        self._narrative = narrative
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def log_sequence(self) -> int:
+        """Last OperationLog sequence included in this version."""
+        return self._log_sequence
+
+    @property
+    def read_only_map(self) -> SimulatedMap:
+        return self._map
+
+    @property
+    def read_only_characters(self) -> SimulatedCharacters:
+        return self._characters
+
+    @property
+    def read_only_events(self) -> SimulatedGameEvents:
+        return self._game_events
+
+    @property
+    def read_only_session(self) -> SimulatedGameSession:
+        return self._session
+
+    @property
+    def read_only_relationships(self) -> SimulatedRelationships:
+        return self._relationships
+
+    @property
+    def read_only_narrative(self) -> SimulatedNarrative:
+        return self._narrative
+
+
+class SnapshotStore:
+    """
+    Multi-version store of committed snapshots (MVCC).
+    A new version is published after every root commit of the version manager.
+    Readers pin a version and read it without locks; versions that are neither the
+    latest nor pinned are dropped.
+    Every commit is also appended, entity by entity, to an OperationLog, and each
+    version records the last log sequence it contains.
+    """
+
+    def __init__(self, version_manager: GameStateVersionManager) -> None:
+        self._version_manager = version_manager
+        self._lock = threading.Lock()
+        self._versions: Dict[int, StateSnapshot] = {}
+        self._pins: Dict[int, int] = {}
+        self._latest: Optional[StateSnapshot] = None
+        self._operation_log = OperationLog()
+        self._publish(components=None)
+        version_manager.add_commit_listener(self._on_commit)
+
+    @property
+    def latest_version(self) -> int:
+        assert self._latest is not None
+        return self._latest.version
+
+    @property
+    def operation_log(self) -> OperationLog:
+        return self._operation_log
+
+    def _on_commit(self, dirty: DirtyEntitySet) -> None:
+        self._record(dirty)
+        self._publish(components=dirty.components)
+
+    def _record(self, dirty: DirtyEntitySet) -> None:
+        """Appends the entities of a commit to the operation log (runs under the manager lock)."""
+        manager = self._version_manager
+        game_map = manager.base_map.get_state()
+        characters = manager.base_characters.get_state()
+        game_events = manager.base_game_events.get_state()
+        log = self._operation_log
+        for scenario_id in sorted(dirty.scenario_ids):
+            log.append("scenarios", scenario_id, "upsert" if game_map.find_scenario(scenario_id) else "remove")
+        for connection_id in sorted(dirty.connection_ids):
+            log.append("connections", connection_id, "upsert" if game_map.get_connection_by_id(connection_id) else "remove")
+        for character_id in sorted(dirty.character_ids):
+            log.append("characters", character_id, "upsert" if characters.find_character(character_id) else "remove")
+        for event_id in sorted(dirty.event_ids):
+            log.append("events", event_id, "upsert" if game_events.find_event(event_id) else "remove")
+
+    def _publish(self, components: Optional[set]) -> StateSnapshot:
+        """
+        Builds the next version from the base state. Map, characters and events are
+        forked (entities are shared, not copied) and the base gives up ownership of
+        them, so its next write to any shared entity clones it first.
+        Session, relationships and narrative are copied only when they changed.
+        """
+        manager = self._version_manager
+        previous = self._latest
+
+        def frozen(name: str, current):
+            if previous is None or components is None or name in components:
+                return deepcopy(current)
+            return getattr(previous, f"read_only_{name}")
+
+        with manager.lock:
+            base_map = manager.base_map.get_state()
+            base_characters = manager.base_characters.get_state()
+            base_events = manager.base_game_events.get_state()
+            snapshot = StateSnapshot(
+                version=(previous.version + 1) if previous else 1,
+                game_map=SimulatedMap(base_map.fork()),
+                characters=SimulatedCharacters(base_characters.fork()),
+                game_events=SimulatedGameEvents(base_events.fork()),
+                session=frozen("session", manager.base_session),
+                relationships=frozen("relationships", manager.base_relationships),
+                narrative=frozen("narrative", manager.base_narrative),
+                log_sequence=self._operation_log.last_sequence,
+            )
+            base_map.release_ownership()
+            base_characters.release_ownership()
+            base_events.release_ownership()
+
+        with self._lock:
+            self._versions[snapshot.version] = snapshot
+            self._latest = snapshot
+            self._collect()
+        return snapshot
+
+    def _collect(self) -> None:
+        """Drops the versions no reader holds any more (the latest one is always kept)."""
+        assert self._latest is not None
+        for version in list(self._versions):
+            if version != self._latest.version and self._pins.get(version, 0) == 0:
+                del self._versions[version]
+                self._pins.pop(version, None)
+
+    def pin(self) -> StateSnapshot:
+        """
+        Pins and returns the latest committed version. Base writes made outside of any
+        transaction are flushed first, so they become visible to the reader.
+        """
+        manager = self._version_manager
+        # Checked and flushed under the manager lock, so no transaction can begin (and write
+        # the base in place, in journal mode) in between and have its writes published.
+        with manager.lock:
+            if manager.transaction_depth == 0:
+                manager.flush_changes()
+        with self._lock:
+            assert self._latest is not None
+            snapshot = self._latest
+            self._pins[snapshot.version] = self._pins.get(snapshot.version, 0) + 1
+            return snapshot
+
+    def release(self, snapshot: StateSnapshot) -> None:
+        with self._lock:
+            count = self._pins.get(snapshot.version, 0) - 1
+            if count > 0:
+                self._pins[snapshot.version] = count
+            else:
+                self._pins.pop(snapshot.version, None)
+            self._collect()
+
+    @contextmanager
+    def pinned(self) -> Iterator[StateSnapshot]:
+        """Context manager that pins the latest version for the duration of the block."""
+        snapshot = self.pin()
+        try:
+            yield snapshot
+        finally:
+            self.release(snapshot)
+
+    def get_live_version_count(self) -> int:
+        with self._lock:
+            return len(self._versions)
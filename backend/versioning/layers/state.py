@@ -1,4 +1,4 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from simulated.components.map import SimulatedMap
 from simulated.components.characters import SimulatedCharacters
 from simulated.components.game_session import SimulatedGameSession
@@ -24,89 +24,94 @@ class SimulationLayer:
         self._session: Optional[SimulatedGameSession] = None
         self._narrative: Optional[SimulatedNarrative] = None
         self._game_events: Optional[SimulatedGameEvents] = None
+        # Components this layer does not own, resolved once through the parent chain.
+        # The chain below the top layer does not change while this layer is alive, so
+        # entries only need to be dropped when this layer starts owning the component.
+        self._resolved: Dict[str, Any] = {}
+
+    def _resolve(self, component_name: str) -> Any:
+        """Returns the component inherited from the parent layer (or the base state), cached."""
+        component = self._resolved.get(component_name)
+        if component is None:
+            if self.parent:
+                component = getattr(self.parent, component_name)
+            else:
+                component = getattr(self._version_manager, f"base_{component_name}")
+            self._resolved[component_name] = component
+        return component
 
     @property
     def map(self) -> SimulatedMap:
-        if self._map:
+        if self._map is not None:
             return self._map
-        elif self.parent:
-            return self.parent.map
-        else:
-            return self._version_manager.base_map
+        return self._resolve("map")
 
     @property
     def characters(self) -> SimulatedCharacters:
-        if self._characters:
+        if self._characters is not None:
             return self._characters
-        elif self.parent:
-            return self.parent.characters
-        else:
-            return self._version_manager.base_characters
+        return self._resolve("characters")
 
     @property
     def session(self) -> SimulatedGameSession:
-        if self._session:
+        if self._session is not None:
             return self._session
-        elif self.parent:
-            return self.parent.session
-        else:
-            return self._version_manager.base_session
+        return self._resolve("session")
 
     @property
     def relationships(self) -> SimulatedRelationships:
-        if self._relationships:
+        if self._relationships is not None:
             return self._relationships
-        elif self.parent:
-            return self.parent.relationships
-        else:
-            return self._version_manager.base_relationships
+        return self._resolve("relationships")
 
     @property
     def narrative(self) -> SimulatedNarrative:
-        if self._narrative:
+        if self._narrative is not None:
             return self._narrative
-        elif self.parent:
-            return self.parent.narrative
-        else:
-            return self._version_manager.base_narrative
+        return self._resolve("narrative")
         
     @property
     def game_events(self) -> SimulatedGameEvents:
-        if self._game_events:
+        if self._game_events is not None:
             return self._game_events
-        elif self.parent:
-            return self.parent.game_events
-        else:
-            return self._version_manager.base_game_events
+        return self._resolve("game_events")
         
+    # Map, characters and events are forked copy-on-write: only the entities this layer
+    # writes to are cloned, every other read falls through to the parent objects.
     def modify_map(self) -> SimulatedMap:
         if self._map is None:
-            self._map = deepcopy(self.map)
+            self._map = self.map.fork()
+            self._resolved.pop("map", None)
         return self._map
 
     def modify_characters(self) -> SimulatedCharacters:
         if self._characters is None:
-            self._characters = deepcopy(self.characters)
+            self._characters = self.characters.fork()
+            self._resolved.pop("characters", None)
         return self._characters
 
     def modify_session(self) -> SimulatedGameSession:
         if self._session is None:
             self._session = deepcopy(self.session)
+            self._resolved.pop("session", None)
         return self._session
 
     def modify_relationships(self) -> SimulatedRelationships:
         if self._relationships is None:
             self._relationships = deepcopy(self.relationships)
+            self._resolved.pop("relationships", None)
         return self._relationships
 
     def modify_narrative(self) -> SimulatedNarrative:
         if self._narrative is None:
             self._narrative = deepcopy(self.narrative)
+            self._resolved.pop("narrative", None)
         return self._narrative
     
     def modify_game_events(self) -> SimulatedGameEvents:
         if self._game_events is None:
-            self._game_events = deepcopy(self.game_events)
+            self._game_events = self.game_events.fork()
+            self._resolved.pop("game_events", None)
         return self._game_events
 
     def has_modified_map(self) -> bool:
@@ -116,6 +121,7 @@ class SimulationLayer:
         return self._map or self.map
 
     def set_modified_map(self, new_map: SimulatedMap):
+        self._resolved.pop("map", None)
         self._map = new_map
 
     def has_modified_characters(self) -> bool:
@@ -149,16 +155,21 @@ class SimulationLayer:
         return self._game_events or self.game_events
 
     def set_modified_characters(self, new_characters: SimulatedCharacters):
+        self._resolved.pop("characters", None)
         self._characters = new_characters
 
     def set_modified_session(self, new_session: SimulatedGameSession):
+        self._resolved.pop("session", None)
         self._session = new_session
 
     def set_modified_relationships(self, new_relationships: SimulatedRelationships):
+        self._resolved.pop("relationships", None)
         self._relationships = new_relationships
 
     def set_modified_narrative(self, new_narrative: SimulatedNarrative):
+        self._resolved.pop("narrative", None)
         self._narrative = new_narrative
 
     def set_modified_game_events(self, new_events: SimulatedGameEvents):
+        self._resolved.pop("game_events", None)
         self._game_events = new_events